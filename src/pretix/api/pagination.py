@@ -19,15 +19,102 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
 from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from pretix.helpers import get_deterministic_ordering
 
 
 class Pagination(PageNumberPagination):
+    """
+    Page-based pagination with an opt-in keyset mode for efficiently iterating over large lists.
+
+    If the request contains ``pagination=cursor`` or a ``cursor`` parameter, results are ordered by ``id``, or by
+    ``(last_modified, id)`` if ``ordering=last_modified`` is requested and the model has this field. Instead of a
+    page number, the ``next`` link then contains an opaque cursor encoding the sort key of the last result. This
+    avoids counting all results and skipping over the previous pages, so every page is equally cheap to compute.
+    """
     page_size_query_param = 'page_size'
     max_page_size = 50
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    cursor_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = (
+            self.cursor_query_param in request.query_params or
+            request.query_params.get('pagination') == 'cursor'
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.cursor_fields = self._get_cursor_fields(queryset, request)
+        queryset = queryset.order_by(*self.cursor_fields)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self._decode_cursor(cursor))
+
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page_results = results[:page_size]
+        return self.page_results
+
+    def _get_cursor_fields(self, queryset, request):
+        ordering = request.query_params.get(OrderingFilter.ordering_param)
+        if ordering == 'last_modified' and any(f.name == 'last_modified' for f in queryset.model._meta.fields):
+            return 'last_modified', 'pk'
+        return 'pk',
+
+    def _decode_cursor(self, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self.cursor_fields):
+                raise ValueError
+            if self.cursor_fields == ('last_modified', 'pk'):
+                lm, pk = parse_datetime(values[0]), int(values[1])
+                if not lm:
+                    raise ValueError
+                return Q(last_modified__gt=lm) | Q(last_modified=lm, pk__gt=pk)
+            return Q(pk__gt=int(values[0]))
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _encode_cursor(self, obj):
+        values = []
+        for f in self.cursor_fields:
+            v = getattr(obj, f)
+            values.append(v.isoformat() if f == 'last_modified' else v)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), 'pagination')
+        return replace_query_param(url, self.cursor_query_param, self._encode_cursor(self.page_results[-1]))
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', None),
+            ('results', data),
+        ]))
 
 
 class TotalOrderingFilter(OrderingFilter):
@@ -402,58 +402,76 @@ class FailedCheckinSerializer(I18nAwareModelSerializer):
             self.fields['raw_subevent'].queryset = event.subevents.all()
 
 
-class OrderDownloadsField(serializers.Field):
+class DownloadsFieldMixin:
+    # Field instances are shared by all rows of a list response. We cache the relevant settings and enabled ticket
+    # outputs per event on the field since looking them up for every row is the most expensive part of serializing a
+    # list of orders, as every row might carry its own Event instance with an empty settings cache.
+
+    def _get_download_pending(self, event):
+        if not hasattr(self, '_download_pending'):
+            self._download_pending = {}
+        if event.pk not in self._download_pending:
+            self._download_pending[event.pk] = event.settings.ticket_download_pending
+        return self._download_pending[event.pk]
+
+    def _get_outputs(self, event):
+        if not hasattr(self, '_outputs'):
+            self._outputs = {}
+        if event.pk not in self._outputs:
+            self._outputs[event.pk] = []
+            for receiver, response in register_ticket_outputs.send(event):
+                provider = response(event)
+                if provider.is_enabled:
+                    self._outputs[event.pk].append(provider.identifier)
+        return self._outputs[event.pk]
+
+
+class OrderDownloadsField(DownloadsFieldMixin, serializers.Field):
     def to_representation(self, instance: Order):
         if instance.status != Order.STATUS_PAID:
             if instance.status != Order.STATUS_PENDING or instance.require_approval or (
-                not instance.valid_if_pending and not instance.event.settings.ticket_download_pending
+                not instance.valid_if_pending and not self._get_download_pending(instance.event)
             ):
                 return []
 
         request = self.context['request']
-        res = []
-        responses = register_ticket_outputs.send(instance.event)
-        for receiver, response in responses:
-            provider = response(instance.event)
-            if provider.is_enabled:
-                res.append({
-                    'output': provider.identifier,
-                    'url': reverse('api-v1:order-download', kwargs={
-                        'organizer': instance.event.organizer.slug,
-                        'event': instance.event.slug,
-                        'code': instance.code,
-                        'output': provider.identifier,
-                    }, request=request)
-                })
-        return res
-
-
-class PositionDownloadsField(serializers.Field):
+        return [
+            {
+                'output': identifier,
+                'url': reverse('api-v1:order-download', kwargs={
+                    'organizer': instance.event.organizer.slug,
+                    'event': instance.event.slug,
+                    'code': instance.code,
+                    'output': identifier,
+                }, request=request)
+            }
+            for identifier in self._get_outputs(instance.event)
+        ]
+
+
+class PositionDownloadsField(DownloadsFieldMixin, serializers.Field):
     def to_representation(self, instance: OrderPosition):
         if instance.order.status != Order.STATUS_PAID:
             if instance.order.status != Order.STATUS_PENDING or instance.order.require_approval or (
-                not instance.order.valid_if_pending and not instance.order.event.settings.ticket_download_pending
+                not instance.order.valid_if_pending and not self._get_download_pending(instance.order.event)
             ):
                 return []
         if not instance.generate_ticket:
             return []
 
         request = self.context['request']
-        res = []
-        responses = register_ticket_outputs.send(instance.order.event)
-        for receiver, response in responses:
-            provider = response(instance.order.event)
-            if provider.is_enabled:
-                res.append({
-                    'output': provider.identifier,
-                    'url': reverse('api-v1:orderposition-download', kwargs={
-                        'organizer': instance.order.event.organizer.slug,
-                        'event': instance.order.event.slug,
-                        'pk': instance.pk,
-                        'output': provider.identifier,
-                    }, request=request)
-                })
-        return res
+        return [
+            {
+                'output': identifier,
+                'url': reverse('api-v1:orderposition-download', kwargs={
+                    'organizer': instance.order.event.organizer.slug,
+                    'event': instance.order.event.slug,
+                    'pk': instance.pk,
+                    'output': identifier,
+                }, request=request)
+            }
+            for identifier in self._get_outputs(instance.order.event)
+        ]
 
 
 class PdfDataSerializer(serializers.Field):
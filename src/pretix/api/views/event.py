@@ -32,6 +32,8 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations under the License.
 
+import base64
+
 import django_filters
 from django.conf import settings
 from django.db import transaction
@@ -62,6 +64,9 @@ from pretix.base.models import (
 )
 from pretix.base.models.event import SubEvent
 from pretix.base.services.quotas import QuotaAvailability
+from pretix.base.services.seating import (
+    get_seat_states, invalidate_seat_states,
+)
 from pretix.helpers.dicts import merge_dicts
 from pretix.helpers.i18n import i18ncomp
 from pretix.presale.views.organizer import filter_qs_by_attr
@@ -718,12 +723,21 @@ class SeatViewSet(ConditionalListView, viewsets.ModelViewSet):
     filter_backends = (DjangoFilterBackend, )
     filterset_class = SeatFilter
 
-    def get_queryset(self):
+    def get_subevent(self):
         if self.request.event.has_subevents and 'subevent' in self.request.resolver_match.kwargs:
             try:
-                subevent = self.request.event.subevents.get(pk=self.request.resolver_match.kwargs['subevent'])
+                return self.request.event.subevents.get(pk=self.request.resolver_match.kwargs['subevent'])
             except SubEvent.DoesNotExist:
                 raise NotFound('Subevent not found')
+        elif not self.request.event.has_subevents and 'subevent' not in self.request.resolver_match.kwargs:
+            return None
+        else:
+            raise NotFound('Please use the subevent-specific endpoint' if self.request.event.has_subevents
+                           else 'This event has no subevents')
+
+    def get_queryset(self):
+        subevent = self.get_subevent()
+        if subevent:
             qs = Seat.annotated(
                 event_id=self.request.event.id,
                 subevent=subevent,
@@ -732,7 +746,7 @@ class SeatViewSet(ConditionalListView, viewsets.ModelViewSet):
                 minimal_distance=self.request.event.settings.seating_minimal_distance,
                 distance_only_within_row=self.request.event.settings.seating_distance_only_within_row,
             )
-        elif not self.request.event.has_subevents and 'subevent' not in self.request.resolver_match.kwargs:
+        else:
             qs = Seat.annotated(
                 event_id=self.request.event.id,
                 subevent=None,
@@ -741,10 +755,6 @@ class SeatViewSet(ConditionalListView, viewsets.ModelViewSet):
                 minimal_distance=self.request.event.settings.seating_minimal_distance,
                 distance_only_within_row=self.request.event.settings.seating_distance_only_within_row,
             )
-        else:
-            raise NotFound('Please use the subevent-specific endpoint' if self.request.event.has_subevents
-                           else 'This event has no subevents')
-
         return qs
 
     def get_serializer_context(self):
@@ -758,6 +768,7 @@ class SeatViewSet(ConditionalListView, viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         super().perform_update(serializer)
+        invalidate_seat_states(serializer.instance.event, serializer.instance.subevent)
         serializer.instance.event.log_action(
             "pretix.event.seats.blocks.changed",
             user=self.request.user,
@@ -776,8 +787,15 @@ class SeatViewSet(ConditionalListView, viewsets.ModelViewSet):
         for seat in seats:
             seat.blocked = blocked
         Seat.objects.bulk_update(seats, ["blocked"], batch_size=1000)
+        invalidate_seat_states(self.request.event, self.get_subevent())
         return Response({})
 
+    @action(methods=["GET"], detail=False)
+    def states(self, request, *args, **kwargs):
+        return Response({
+            "states": base64.b64encode(get_seat_states(request.event, self.get_subevent())).decode(),
+        })
+
     @action(methods=["POST"], detail=False)
     def bulk_block(self, request, *args, **kwargs):
         return self.bulk_change_blocked(True)
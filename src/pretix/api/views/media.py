@@ -19,12 +19,9 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
-from decimal import Decimal
-
 import django_filters
 from django.db import transaction
-from django.db.models import OuterRef, Prefetch, Subquery, Sum
-from django.db.models.functions import Coalesce
+from django.db.models import F, Prefetch
 from django.utils.timezone import now
 from django_filters.rest_framework import DjangoFilterBackend, FilterSet
 from django_scopes import scopes_disabled
@@ -39,8 +36,7 @@ from pretix.api.serializers.media import (
 )
 from pretix.base.media import MEDIA_TYPES
 from pretix.base.models import (
-    Checkin, GiftCard, GiftCardAcceptance, GiftCardTransaction, OrderPosition,
-    ReusableMedium,
+    Checkin, GiftCard, GiftCardAcceptance, OrderPosition, ReusableMedium,
 )
 from pretix.base.models.orders import PrintLog
 from pretix.helpers import OF_SELF
@@ -72,9 +68,6 @@ class ReusableMediaViewSet(viewsets.ModelViewSet):
     filterset_class = ReusableMediumFilter
 
     def get_queryset(self):
-        s = GiftCardTransaction.objects.filter(
-            card=OuterRef('pk')
-        ).order_by().values('card').annotate(s=Sum('value')).values('s')
         return self.request.organizer.reusable_media.prefetch_related(
             Prefetch(
                 'linked_orderpositions',
@@ -89,7 +82,7 @@ class ReusableMediaViewSet(viewsets.ModelViewSet):
             Prefetch(
                 'linked_giftcard',
                 queryset=GiftCard.objects.annotate(
-                    cached_value=Coalesce(Subquery(s), Decimal('0.00'))
+                    cached_value=F('balance')
                 )
             )
         )
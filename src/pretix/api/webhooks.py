@@ -21,8 +21,9 @@
 #
 import json
 import logging
+import os
 import time
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from datetime import timedelta
 
 import requests
@@ -33,6 +34,7 @@ from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _, pgettext_lazy
 from django_scopes import scope, scopes_disabled
 from requests import RequestException
+from requests.adapters import HTTPAdapter
 
 from pretix.api.models import (
     WebHook, WebHookCall, WebHookCallRetry, WebHookEventListener,
@@ -47,6 +49,12 @@ from pretix.helpers.celery import get_task_priority
 
 logger = logging.getLogger(__name__)
 _ALL_EVENTS = None
+_SESSION = (None, None)
+
+# Maximum number of log entries delivered to one webhook by a single ``send_webhooks`` task
+WEBHOOK_BATCH_SIZE = 25
+# Seconds after which a ``send_webhooks`` task hands its remaining log entries over to a new task
+WEBHOOK_BATCH_TIME_BUDGET = 300
 
 
 class WebhookEvent:
@@ -496,6 +504,8 @@ def notify_webhooks(logentry_ids: list):
         'action_type', 'organizer_id', 'event_id',
     ).filter(id__in=logentry_ids)
     _org, _at, _ev, webhooks = None, None, None, None
+    deliveries = defaultdict(list)
+    priorities = {}
     for logentry in qs:
         if not logentry.organizer:
             break  # We need to know the organizer
@@ -525,12 +535,35 @@ def notify_webhooks(logentry_ids: list):
                 )
 
         for wh in webhooks:
-            send_webhook.apply_async(
-                args=(logentry.id, notification_type.action_type, wh.pk),
-                priority=get_task_priority("notifications", logentry.organizer_id),
+            deliveries[wh.pk].append((logentry.id, notification_type.action_type))
+            priorities[wh.pk] = logentry.organizer_id
+
+    # Deliveries are grouped by webhook, so e.g. a bulk operation on thousands of orders results in a few tasks per
+    # webhook that deliver sequentially over a keep-alive connection instead of one task per log entry and webhook.
+    for webhook_id, items in deliveries.items():
+        items.sort()  # deliver in the order the log entries have been created
+        for i in range(0, len(items), WEBHOOK_BATCH_SIZE):
+            send_webhooks.apply_async(
+                args=(webhook_id, items[i:i + WEBHOOK_BATCH_SIZE]),
+                priority=get_task_priority("notifications", priorities[webhook_id]),
             )
 
 
+def get_webhook_session() -> requests.Session:
+    """
+    Returns a HTTP session that is shared by all webhook deliveries of the current process, such that connections
+    to the same target host are kept alive and reused.
+    """
+    global _SESSION
+    pid, session = _SESSION
+    if session is None or pid != os.getpid():  # never share connections with a forked worker process
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=4))
+        session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=4))
+        _SESSION = (os.getpid(), session)
+    return session
+
+
 @app.task(base=ProfiledTask, bind=True, max_retries=5, default_retry_delay=60, acks_late=True, autoretry_for=(DatabaseError,),)
 def send_webhook(self, logentry_id: int, action_type: str, webhook_id: int, retry_count: int = 0):
     """
@@ -599,7 +632,7 @@ def send_webhook(self, logentry_id: int, action_type: str, webhook_id: int, retr
         t = time.time()
 
         try:
-            resp = requests.post(
+            resp = get_webhook_session().post(
                 webhook.target_url,
                 json=payload,
                 allow_redirects=False,
@@ -671,6 +704,108 @@ def send_webhook(self, logentry_id: int, action_type: str, webhook_id: int, retr
                 return 'retry-via-db'
 
 
+@app.task(base=ProfiledTask, bind=True, max_retries=5, default_retry_delay=60, acks_late=True)
+def send_webhooks(self, webhook_id: int, items: list):
+    """
+    Sends out a webhook for multiple log entries, one request per log entry in the given order. The results are
+    recorded with a single query. Failed deliveries are handed over to ``send_webhook`` with its usual retry logic.
+
+    Since this task uses ``acks_late``, it must finish well within the broker's visibility timeout (see
+    ``send_webhook``), otherwise the whole batch would be delivered again. Once ``WEBHOOK_BATCH_TIME_BUDGET`` is used
+    up, the remaining log entries are therefore handed over to a new task. For the same reason, nothing is retried
+    as a whole once the first request has been sent.
+    """
+    try:
+        with scopes_disabled():
+            webhook = WebHook.objects.get(id=webhook_id)
+            logentries = LogEntry.all.in_bulk([logentry_id for logentry_id, action_type in items])
+    except DatabaseError as e:
+        raise self.retry(exc=e)
+    if not webhook.enabled:
+        return 'obsolete-webhook'
+
+    types = get_all_webhook_events()
+    calls = []
+    retries = []
+    deadline = time.monotonic() + WEBHOOK_BATCH_TIME_BUDGET
+    with scope(organizer=webhook.organizer):
+        try:
+            for i, (logentry_id, action_type) in enumerate(items):
+                if i > 0 and time.monotonic() > deadline:
+                    send_webhooks.apply_async(
+                        args=(webhook_id, items[i:]),
+                        priority=get_task_priority("notifications", webhook.organizer_id),
+                    )
+                    break
+
+                event_type = types.get(action_type)
+                logentry = logentries.get(logentry_id)
+                if not event_type or not logentry:
+                    continue  # Ignore, e.g. plugin not installed
+
+                t = time.time()
+                try:
+                    payload = event_type.build_payload(logentry)
+                    if payload is None:
+                        continue  # Content object deleted?
+
+                    resp = get_webhook_session().post(
+                        webhook.target_url,
+                        json=payload,
+                        allow_redirects=False,
+                        timeout=30,
+                    )
+                except RequestException as e:
+                    calls.append(WebHookCall(
+                        webhook=webhook,
+                        action_type=logentry.action_type,
+                        target_url=webhook.target_url,
+                        execution_time=time.time() - t,
+                        return_code=0,
+                        payload=json.dumps(payload),
+                        response_body=str(e)[:1024 * 1024]
+                    ))
+                    retries.append((logentry_id, action_type))
+                    continue
+                except Exception:
+                    # Do not let one broken payload hold up the other deliveries, send_webhook will try again and
+                    # report the error.
+                    logger.exception('Could not deliver webhook for log entry %s', logentry_id)
+                    retries.append((logentry_id, action_type))
+                    continue
+
+                calls.append(WebHookCall(
+                    webhook=webhook,
+                    action_type=logentry.action_type,
+                    target_url=webhook.target_url,
+                    execution_time=time.time() - t,
+                    return_code=resp.status_code,
+                    payload=json.dumps(payload),
+                    response_body=resp.text[:1024 * 1024],
+                    success=200 <= resp.status_code <= 299
+                ))
+                if resp.status_code == 410:
+                    webhook.enabled = False
+                    webhook.save()
+                    return 'gone'
+                elif resp.status_code > 299:
+                    retries.append((logentry_id, action_type))
+        finally:
+            try:
+                WebHookCall.objects.bulk_create(calls)
+            except DatabaseError:
+                # The requests have been sent already, so retrying the task would deliver them a second time
+                logger.exception('Could not record webhook calls')
+
+            for logentry_id, action_type in retries:
+                # Continue with the second attempt of send_webhook's retry schedule
+                send_webhook.apply_async(
+                    args=(logentry_id, action_type, webhook_id, 1),
+                    countdown=5,
+                )
+    return 'ok'
+
+
 @app.task(base=TransactionAwareTask)
 def manually_retry_all_calls(webhook_id: int):
     with scopes_disabled():
@@ -23,27 +23,57 @@ import hashlib
 import time
 from typing import Callable, Dict, List
 
+from celery.signals import task_prerun
 from django.core.cache import caches
+from django.core.signals import request_started
 from django.db.models import Model
+from django.dispatch import receiver
+
+# Process-local copy of namespace prefixes, maps (cache alias, prefix key) to (prefix, expiry timestamp). Without it,
+# every cache access would require an additional round-trip to the cache backend to look up the current prefix.
+# A clear() in a different process, e.g. a celery worker, only changes the prefix in the shared cache. The local copy
+# is therefore dropped at the beginning of every request and every task, so a clear() is visible to everything that
+# starts after it. Within a running request or task, it becomes visible after at most PREFIX_LOCAL_TTL seconds.
+_local_prefixes = {}
+PREFIX_LOCAL_TTL = 2
+
+
+@receiver(request_started, dispatch_uid='pretix_cache_reset_local_prefixes')
+def reset_local_prefixes(*args, **kwargs):
+    _local_prefixes.clear()
+
+
+task_prerun.connect(reset_local_prefixes, dispatch_uid='pretix_cache_reset_local_prefixes', weak=False)
 
 
 class NamespacedCache:
 
     def __init__(self, prefixkey: str, cache: str='default'):
+        self.cache_alias = cache
         self.cache = caches[cache]
         self.prefixkey = prefixkey
         self._last_prefix = None
 
-    def _prefix_key(self, original_key: str, known_prefix=None) -> str:
+    def _get_prefix(self) -> int:
+        local_key = (self.cache_alias, self.prefixkey)
+        prefix, expires = _local_prefixes.get(local_key, (None, 0))
+        if prefix is not None and expires > time.monotonic():
+            return prefix
+
         # Race conditions can happen here, but should be very very rare.
         # We could only handle this by going _really_ lowlevel using
         # memcached's `add` keyword instead of `set`.
         # See also:
         # https://code.google.com/p/memcached/wiki/NewProgrammingTricks#Namespacing
-        prefix = known_prefix or self.cache.get(self.prefixkey)
+        prefix = self.cache.get(self.prefixkey)
         if prefix is None:
             prefix = int(time.time())
             self.cache.set(self.prefixkey, prefix)
+        _local_prefixes[local_key] = (prefix, time.monotonic() + PREFIX_LOCAL_TTL)
+        return prefix
+
+    def _prefix_key(self, original_key: str, known_prefix=None) -> str:
+        prefix = known_prefix or self._get_prefix()
         self._last_prefix = prefix
         key = '%s:%d:%s' % (self.prefixkey, prefix, original_key)
         if len(key) > 200:  # Hash long keys, as memcached has a length limit
@@ -56,11 +86,17 @@ class NamespacedCache:
 
     def clear(self) -> None:
         self._last_prefix = None
+        local_key = (self.cache_alias, self.prefixkey)
         try:
             prefix = self.cache.incr(self.prefixkey, 1)
         except ValueError:
             prefix = int(time.time())
+            known_prefix = _local_prefixes.get(local_key, (None, 0))[0]
+            if known_prefix is not None and known_prefix >= prefix:
+                # Make sure we do not re-use a prefix that is still known locally
+                prefix = known_prefix + 1
             self.cache.set(self.prefixkey, prefix)
+        _local_prefixes[local_key] = (prefix, time.monotonic() + PREFIX_LOCAL_TTL)
 
     def set(self, key: str, value: any, timeout: int=300):
         return self.cache.set(self._prefix_key(key), value, timeout)
@@ -76,23 +112,26 @@ class NamespacedCache:
         )
 
     def get_many(self, keys: List[str]) -> Dict[str, any]:
-        values = self.cache.get_many([self._prefix_key(key) for key in keys])
+        prefix = self._get_prefix()
+        values = self.cache.get_many([self._prefix_key(key, known_prefix=prefix) for key in keys])
         newvalues = {}
         for k, v in values.items():
             newvalues[self._strip_prefix(k)] = v
         return newvalues
 
     def set_many(self, values: Dict[str, any], timeout=300):
+        prefix = self._get_prefix()
         newvalues = {}
         for k, v in values.items():
-            newvalues[self._prefix_key(k)] = v
+            newvalues[self._prefix_key(k, known_prefix=prefix)] = v
         return self.cache.set_many(newvalues, timeout)
 
     def delete(self, key: str):  # NOQA
         return self.cache.delete(self._prefix_key(key))
 
     def delete_many(self, keys: List[str]):  # NOQA
-        return self.cache.delete_many([self._prefix_key(key) for key in keys])
+        prefix = self._get_prefix()
+        return self.cache.delete_many([self._prefix_key(key, known_prefix=prefix) for key in keys])
 
     def incr(self, key: str, by: int=1):  # NOQA
         return self.cache.incr(self._prefix_key(key), by)
@@ -48,6 +48,7 @@ from django.utils.translation import gettext, gettext_lazy as _
 
 from pretix.base.models import Event
 from pretix.base.models.auth import PermissionHolder
+from pretix.helpers.arrow import ColumnarWriter
 from pretix.helpers.safe_openpyxl import (  # NOQA: backwards compatibility for plugins using excel_safe
     SafeWorkbook, remove_invalid_excel_chars as excel_safe,
 )
@@ -215,22 +216,61 @@ class OrganizerLevelExportMixin:
         raise NotImplementedError()
 
 
+COLUMNAR_FORMATS = {
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('.arrow', 'application/vnd.apache.arrow.file'),
+}
+
+
 class ListExporter(BaseExporter):
     ProgressSetTotal = namedtuple('ProgressSetTotal', 'total')
 
+    @property
+    def columnar_formats(self) -> bool:
+        """
+        If ``True``, the export is additionally offered as Apache Parquet and Apache Arrow files with typed columns,
+        which are much faster to load into data analysis tools than CSV or Excel files. Recommended for exporters
+        that produce very large files. Defaults to ``False``.
+        """
+        return False
+
+    @property
+    def partitionable(self) -> bool:
+        """
+        If ``True``, a CSV export for a large number of events may be split up into groups of events that are
+        exported in parallel and merged afterwards. Only set this if the header row does not depend on the selected
+        events, every row only depends on its own event and ``partition_sort_columns`` is set. Defaults to ``False``.
+        """
+        return False
+
+    @property
+    def partition_sort_columns(self) -> tuple:
+        """
+        Indexes of the columns that define the order of the rows of a partitionable exporter. The partial results are
+        merged by comparing the text of these columns, so their values need to sort correctly as strings (e.g. ISO
+        dates) and the rows of the export need to be sorted by them.
+        """
+        return ()
+
     @property
     def export_form_fields(self) -> dict:
+        choices = [
+            ('xlsx', _('Excel (.xlsx)')),
+            ('default', _('CSV (with commas)')),
+            ('csv-excel', _('CSV (Excel-style)')),
+            ('semicolon', _('CSV (with semicolons)')),
+        ]
+        if self.columnar_formats:
+            choices += [
+                ('parquet', _('Apache Parquet (.parquet)')),
+                ('arrow', _('Apache Arrow (.arrow)')),
+            ]
         ff = OrderedDict(
             [
                 ('_format',
                  forms.ChoiceField(
                      label=_('Export format'),
-                     choices=(
-                         ('xlsx', _('Excel (.xlsx)')),
-                         ('default', _('CSV (with commas)')),
-                         ('csv-excel', _('CSV (Excel-style)')),
-                         ('semicolon', _('CSV (with semicolons)')),
-                     ),
+                     choices=choices,
                  )),
             ]
         )
@@ -250,47 +290,66 @@ class ListExporter(BaseExporter):
     def get_csv_encoding(self):
         return 'utf-8'
 
+    def _write_csv(self, lines, output_file, **kwargs):
+        writer = csv.writer(output_file, **kwargs)
+        total = 0
+        counter = 0
+        for line in lines:
+            if isinstance(line, self.ProgressSetTotal):
+                total = line.total
+                continue
+            line = [
+                localize(f) if isinstance(f, Decimal) else f
+                for f in line
+            ]
+            if total:
+                counter += 1
+                if counter % max(10, total // 100) == 0:
+                    self.progress_callback(counter / total * 100)
+            writer.writerow(line)
+
     def _render_csv(self, form_data, output_file=None, **kwargs):
         if output_file:
             if 'b' in output_file.mode:
-                output_file = io.TextIOWrapper(output_file, encoding=self.get_csv_encoding(), errors='replace', newline='')
-            writer = csv.writer(output_file, **kwargs)
-            total = 0
-            counter = 0
-            for line in self.iterate_list(form_data):
-                if isinstance(line, self.ProgressSetTotal):
-                    total = line.total
-                    continue
-                line = [
-                    localize(f) if isinstance(f, Decimal) else f
-                    for f in line
-                ]
-                if total:
-                    counter += 1
-                    if counter % max(10, total // 100) == 0:
-                        self.progress_callback(counter / total * 100)
-                writer.writerow(line)
+                # Rows are encoded and written to the file as they are generated, the file content is never held in
+                # memory as a whole. We detach the wrapper afterwards, since it would otherwise close the underlying
+                # file as soon as it is garbage collected.
+                wrapper = io.TextIOWrapper(output_file, encoding=self.get_csv_encoding(), errors='replace', newline='')
+                self._write_csv(self.iterate_list(form_data), wrapper, **kwargs)
+                wrapper.detach()
+            else:
+                self._write_csv(self.iterate_list(form_data), output_file, **kwargs)
             return self.get_filename() + '.csv', 'text/csv', None
         else:
             output = io.StringIO()
-            writer = csv.writer(output, **kwargs)
-            total = 0
-            counter = 0
-            for line in self.iterate_list(form_data):
-                if isinstance(line, self.ProgressSetTotal):
-                    total = line.total
-                    continue
-                line = [
-                    localize(f) if isinstance(f, Decimal) else f
-                    for f in line
-                ]
-                if total:
-                    counter += 1
-                    if counter % max(10, total // 100) == 0:
-                        self.progress_callback(counter / total * 100)
-                writer.writerow(line)
+            self._write_csv(self.iterate_list(form_data), output, **kwargs)
             return self.get_filename() + '.csv', 'text/csv', output.getvalue().encode(self.get_csv_encoding(), errors='replace')
 
+    def _write_columnar(self, lines, output_file, file_format):
+        writer = ColumnarWriter(output_file, file_format)
+        total = 0
+        counter = 0
+        for line in lines:
+            if isinstance(line, self.ProgressSetTotal):
+                total = line.total
+                continue
+            if total:
+                counter += 1
+                if counter % max(10, total // 100) == 0:
+                    self.progress_callback(counter / total * 100)
+            writer.append(line)
+        writer.close()
+
+    def _render_columnar(self, lines, file_format, output_file=None):
+        extension, content_type = COLUMNAR_FORMATS[file_format]
+        if output_file:
+            self._write_columnar(lines, output_file, file_format)
+            return self.get_filename() + extension, content_type, None
+        else:
+            output = io.BytesIO()
+            self._write_columnar(lines, output, file_format)
+            return self.get_filename() + extension, content_type, output.getvalue()
+
     def prepare_xlsx_sheet(self, ws):
         pass
 
@@ -334,6 +393,8 @@ class ListExporter(BaseExporter):
             return self._render_csv(form_data, dialect='excel', output_file=output_file)
         elif form_data.get('_format') == 'semicolon':
             return self._render_csv(form_data, dialect='excel', delimiter=';', output_file=output_file)
+        elif form_data.get('_format') in COLUMNAR_FORMATS and self.columnar_formats:
+            return self._render_columnar(self.iterate_list(form_data), form_data['_format'], output_file=output_file)
 
 
 class MultiSheetListExporter(ListExporter):
@@ -353,6 +414,11 @@ class MultiSheetListExporter(ListExporter):
                 (s + ':excel', str(l) + ' – ' + gettext('CSV (Excel-style)')),
                 (s + ':semicolon', str(l) + ' – ' + gettext('CSV (with semicolons)')),
             ]
+            if self.columnar_formats:
+                choices += [
+                    (s + ':parquet', str(l) + ' – ' + gettext('Apache Parquet (.parquet)')),
+                    (s + ':arrow', str(l) + ' – ' + gettext('Apache Arrow (.arrow)')),
+                ]
         ff = OrderedDict(
             [
                 ('_format',
@@ -375,42 +441,17 @@ class MultiSheetListExporter(ListExporter):
             raise NotImplementedError()  # noqa
 
     def _render_sheet_csv(self, form_data, sheet, output_file=None, **kwargs):
-        total = 0
-        counter = 0
         if output_file:
             if 'b' in output_file.mode:
-                output_file = io.TextIOWrapper(output_file, encoding='utf-8', newline='')
-            writer = csv.writer(output_file, **kwargs)
-            for line in self.iterate_sheet(form_data, sheet):
-                if isinstance(line, self.ProgressSetTotal):
-                    total = line.total
-                    continue
-                line = [
-                    localize(f) if isinstance(f, Decimal) else f
-                    for f in line
-                ]
-                writer.writerow(line)
-                if total:
-                    counter += 1
-                    if counter % max(10, total // 100) == 0:
-                        self.progress_callback(counter / total * 100)
+                wrapper = io.TextIOWrapper(output_file, encoding='utf-8', newline='')
+                self._write_csv(self.iterate_sheet(form_data, sheet), wrapper, **kwargs)
+                wrapper.detach()
+            else:
+                self._write_csv(self.iterate_sheet(form_data, sheet), output_file, **kwargs)
             return self.get_filename() + '.csv', 'text/csv', None
         else:
             output = io.StringIO()
-            writer = csv.writer(output, **kwargs)
-            for line in self.iterate_sheet(form_data, sheet):
-                if isinstance(line, self.ProgressSetTotal):
-                    total = line.total
-                    continue
-                line = [
-                    localize(f) if isinstance(f, Decimal) else f
-                    for f in line
-                ]
-                writer.writerow(line)
-                if total:
-                    counter += 1
-                    if counter % max(10, total // 100) == 0:
-                        self.progress_callback(counter / total * 100)
+            self._write_csv(self.iterate_sheet(form_data, sheet), output, **kwargs)
             return self.get_filename() + '.csv', 'text/csv', output.getvalue().encode("utf-8")
 
     def _render_xlsx(self, form_data, output_file=None):
@@ -456,3 +497,5 @@ class MultiSheetListExporter(ListExporter):
                 return self._render_sheet_csv(form_data, sheet, dialect='excel', output_file=output_file)
             elif f == 'semicolon':
                 return self._render_sheet_csv(form_data, sheet, dialect='excel', delimiter=';', output_file=output_file)
+            elif f in COLUMNAR_FORMATS and self.columnar_formats:
+                return self._render_columnar(self.iterate_sheet(form_data, sheet), f, output_file=output_file)
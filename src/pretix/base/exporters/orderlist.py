@@ -91,6 +91,7 @@ class OrderListExporter(MultiSheetListExporter):
                                'a line for every additional fee charged in an order.')
     featured = True
     repeatable_read = False
+    columnar_formats = True
 
     @cached_property
     def providers(self):
@@ -716,10 +717,13 @@ class OrderListExporter(MultiSheetListExporter):
             headers += meta_data_labels
         yield headers
 
-        all_ids = list(base_qs.order_by('order__datetime', 'positionid').values_list('pk', flat=True))
-        yield self.ProgressSetTotal(total=len(all_ids))
+        yield self.ProgressSetTotal(total=base_qs.count())
+        # The list of IDs is streamed from the database (using a server-side cursor where supported) instead of being
+        # loaded completely, so memory usage does not grow with the number of positions.
+        all_ids = base_qs.order_by('order__datetime', 'positionid').values_list('pk', flat=True).iterator(chunk_size=1000)
         for ids in chunked_iterable(all_ids, 1000):
-            ops = sorted(qs.filter(id__in=ids), key=lambda k: ids.index(k.pk))
+            id_order = {pk: i for i, pk in enumerate(ids)}
+            ops = sorted(qs.filter(id__in=ids), key=lambda k: id_order[k.pk])
 
             for op in ops:
                 order = op.order
@@ -884,6 +888,9 @@ class TransactionListExporter(ListExporter):
                                'products, prices or tax rates. The information is only accurate for changes made with '
                                'pretix versions released after October 2021.')
     repeatable_read = False
+    columnar_formats = True
+    partitionable = True
+    partition_sort_columns = (6, 7)  # transaction date and time
 
     @cached_property
     def providers(self):
@@ -1063,6 +1070,7 @@ class PaymentListExporter(ListExporter):
     description = gettext_lazy('Download a spreadsheet of all payments or refunds of every order.')
     featured = True
     repeatable_read = False
+    columnar_formats = True
 
     @property
     def additional_form_fields(self):
@@ -1408,14 +1416,19 @@ class GiftcardListExporter(OrganizerLevelExportMixin, ListExporter):
 
     def iterate_list(self, form_data):
         d = form_data.get('date') or now()
-        s = GiftCardTransaction.objects.filter(
-            card=OuterRef('pk'),
-            datetime__lte=d
-        ).order_by().values('card').annotate(s=Sum('value')).values('s')
+        if form_data.get('date'):
+            s = GiftCardTransaction.objects.filter(
+                card=OuterRef('pk'),
+                datetime__lte=d
+            ).order_by().values('card').annotate(s=Sum('value')).values('s')
+            value = Coalesce(Subquery(s), Decimal('0.00'))
+        else:
+            # Without a reference date in the past, the stored balance is the current value
+            value = F('balance')
         qs = self.organizer.issued_gift_cards.filter(
             issuance__lte=d
         ).annotate(
-            cached_value=Coalesce(Subquery(s), Decimal('0.00')),
+            cached_value=value,
         ).order_by('issuance').prefetch_related(
             'transactions', 'transactions__order', 'transactions__order__event', 'transactions__order__invoices'
         )
@@ -0,0 +1,78 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django_scopes import scopes_disabled
+
+from pretix.base.models import GiftCard, GiftCardTransaction
+
+
+class Command(BaseCommand):
+    help = "Check the stored balance of gift cards for consistency with their transactions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true', dest='fix',
+            help='Reset inconsistent balances to the sum of their transactions.',
+        )
+
+    @scopes_disabled()
+    def handle(self, *args, **options):
+        qs = GiftCard.objects.annotate(
+            tx_total=Coalesce(
+                Subquery(
+                    GiftCardTransaction.objects.filter(
+                        card=OuterRef('pk')
+                    ).order_by().values('card').annotate(s=Sum('value')).values('s'),
+                    output_field=models.DecimalField(decimal_places=2, max_digits=13)
+                ), Value(0), output_field=models.DecimalField(decimal_places=2, max_digits=13)
+            ),
+        ).exclude(
+            balance=F('tx_total')
+        ).select_related('issuer')
+
+        errors = 0
+        for gc in qs.iterator():
+            if abs(gc.balance - gc.tx_total) < Decimal('0.00001'):
+                # Ignore SQLite which treats Decimals like floats…
+                continue
+            errors += 1
+            self.stdout.write(f"Error in gift card {gc.secret} of {gc.issuer.slug}: balance={gc.balance}, "
+                              f"sum(transactions)={gc.tx_total}")
+            if options['fix']:
+                with transaction.atomic():
+                    # Lock the card and re-compute within the lock to not lose concurrent transactions
+                    GiftCard.objects.select_for_update().filter(pk=gc.pk).first()
+                    GiftCard.objects.filter(pk=gc.pk).update(
+                        balance=gc.transactions.aggregate(s=Sum('value'))['s'] or Decimal('0.00')
+                    )
+
+        if errors and options['fix']:
+            self.stderr.write(self.style.SUCCESS(f'Check completed, fixed {errors} gift cards.'))
+        elif errors:
+            self.stderr.write(self.style.ERROR(f'Check completed, found {errors} inconsistent gift cards.'))
+        else:
+            self.stderr.write(self.style.SUCCESS('Check completed.'))
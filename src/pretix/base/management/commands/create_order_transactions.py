@@ -28,6 +28,7 @@ from django_scopes import scopes_disabled
 from tqdm import tqdm
 
 from pretix.base.models import Order
+from pretix.base.services.ledger import reset_ledger
 
 
 class Command(BaseCommand):
@@ -92,4 +93,7 @@ class Command(BaseCommand):
                     pbar.update(1)
                 last_pk = batch[-1].pk
 
+        if t:
+            # Transactions have been created with past dates, so the closed days of the ledger are no longer valid.
+            reset_ledger()
         self.stderr.write(self.style.SUCCESS(f'Created transactions for {t} orders.'))
@@ -0,0 +1,90 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+import os
+import sys
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from pretix.helpers.profile.sampling import profile_dir
+
+
+class Command(BaseCommand):
+    help = "Merge the stack samples recorded in the sampling profiling mode into a collapsed stack file that can be " \
+           "rendered as a flamegraph, e.g. with flamegraph.pl or speedscope."
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', type=str,
+                            help='URL name or task name. If omitted, all recorded names are listed.')
+        parser.add_argument('--since', action='store', type=float,
+                            help='Only include samples recorded during the last given number of hours')
+        parser.add_argument('--output', action='store', type=str, help='Output file, defaults to stdout')
+
+    def _files(self, name, since):
+        directory = profile_dir(name)
+        try:
+            files = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(directory, f) for f in files
+            if f.endswith('.collapsed') and (not since or int(f.split('_', 1)[0]) >= since)
+        ]
+
+    def _read(self, filename, stacks):
+        with open(filename, 'r') as f:
+            for line in f:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                if stack:
+                    stacks[stack] += int(count)
+
+    def handle(self, *args, **options):
+        since = time.time() - options['since'] * 3600 if options['since'] else None
+
+        if not options['name']:
+            try:
+                names = [n.name for n in os.scandir(profile_dir()) if n.is_dir()]
+            except FileNotFoundError:
+                names = []
+            for name in sorted(names):
+                stacks = Counter()
+                for f in self._files(name, since):
+                    self._read(f, stacks)
+                if stacks:
+                    self.stdout.write('{}\t{} samples'.format(name, sum(stacks.values())))
+            return
+
+        stacks = Counter()
+        for f in self._files(options['name'], since):
+            self._read(f, stacks)
+        if not stacks:
+            self.stderr.write(self.style.ERROR('No samples found.'))
+            sys.exit(1)
+
+        out = open(options['output'], 'w') if options['output'] else self.stdout
+        try:
+            for stack, count in sorted(stacks.items()):
+                out.write('{} {}\n'.format(stack, count))
+        finally:
+            if options['output']:
+                out.close()
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pretixbase', '0301_reusablemedium_remove_orderposition'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['content_type', 'object_id', 'datetime', 'id'], name='pretixbase__content_f8e1c7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['event', 'datetime', 'id'], name='pretixbase__event_i_447a99_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pretixbase', '0302_logentry_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seat',
+            index=models.Index(fields=['event', 'x', 'y'], name='pretixbase__event_i_4c7665_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seat',
+            index=models.Index(fields=['subevent', 'x', 'y'], name='pretixbase__subeven_25c586_idx'),
+        ),
+    ]
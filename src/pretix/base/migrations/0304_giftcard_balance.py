@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:12
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_balance(apps, schema_editor):
+    GiftCard = apps.get_model('pretixbase', 'GiftCard')
+    GiftCardTransaction = apps.get_model('pretixbase', 'GiftCardTransaction')
+
+    s = GiftCardTransaction.objects.filter(
+        card=OuterRef('pk')
+    ).order_by().values('card').annotate(s=Sum('value')).values('s')
+    GiftCard.objects.update(
+        balance=Coalesce(Subquery(s), Decimal('0.00'), output_field=models.DecimalField(decimal_places=2, max_digits=13))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pretixbase', '0303_seat_coordinate_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='giftcard',
+            name='balance',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=13),
+        ),
+        migrations.RunPython(populate_balance, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pretixbase', '0304_giftcard_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GiftCardLedgerDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('currency', models.CharField(max_length=10)),
+                ('day', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, max_digits=13)),
+                ('issuer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pretixbase.organizer')),
+            ],
+            options={
+                'unique_together': {('issuer', 'currency', 'day')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TransactionLedgerDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, max_digits=13)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pretixbase.event')),
+            ],
+            options={
+                'unique_together': {('event', 'day')},
+            },
+        ),
+    ]
@@ -40,6 +40,7 @@ from .items import (
     QuestionOption, Quota, SubEventItem, SubEventItemVariation,
     itempicture_upload_to,
 )
+from .ledger import GiftCardLedgerDay, TransactionLedgerDay
 from .log import LogEntry
 from .mail import OutgoingMail
 from .media import ReusableMedium
@@ -19,11 +19,13 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
+import contextvars
 import json
 import uuid
+from contextlib import contextmanager
 
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import models, transaction
 from django.db.models.constants import LOOKUP_SEP
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
@@ -98,6 +100,73 @@ def cached_file_delete(sender, instance, **kwargs):
         instance.file.delete(False)
 
 
+log_buffer_var = contextvars.ContextVar('log_buffer', default=None)
+
+
+class LogBuffer:
+    """
+    Collects log entries created by ``log_action`` while being active, see ``buffered_logging``.
+    """
+
+    def __init__(self, using=None):
+        self.using = using
+        self.connection = transaction.get_connection(using)
+        self.depth = len(self.connection.savepoint_ids)
+        self.entries = []
+
+    def accepts(self):
+        return self.connection.in_atomic_block and len(self.connection.savepoint_ids) >= self.depth
+
+    def add(self, logentry):
+        if len(self.connection.savepoint_ids) > self.depth:
+            # The entry is created in a nested atomic block, which might be rolled back without affecting the
+            # surrounding transaction. Django discards on_commit callbacks registered within a savepoint that is
+            # rolled back, so a no-op callback tells us at flush time whether the entry still needs to be saved.
+            def marker():
+                pass
+
+            transaction.on_commit(marker, using=self.using)
+        else:
+            marker = None
+        self.entries.append((logentry, marker))
+
+    def flush(self):
+        from .log import LogEntry
+
+        if self.entries:
+            registered = {c[1] for c in self.connection.run_on_commit}
+            LogEntry.bulk_create_and_postprocess([
+                logentry for logentry, marker in self.entries
+                if marker is None or marker in registered
+            ])
+            self.entries = []
+
+
+@contextmanager
+def buffered_logging(using=None):
+    """
+    Buffers all log entries created through ``log_action`` in the current atomic block and writes them with a
+    single query when the context manager is left, followed by one notification task and one webhook task for all
+    of them. Log entries created within the block are not saved and have no primary key before that. Entries of
+    nested atomic blocks are buffered as well, so all entries keep the order they have been created in, and are
+    dropped if their block is rolled back.
+
+    If an exception is raised, the buffered entries are discarded together with the rest of the transaction.
+    Outside of an atomic block, this does nothing.
+    """
+    if not transaction.get_connection(using).in_atomic_block:
+        yield
+        return
+
+    buffer = LogBuffer(using)
+    token = log_buffer_var.set(buffer)
+    try:
+        yield buffer
+    finally:
+        log_buffer_var.reset(token)
+    buffer.flush()
+
+
 class LoggingMixin:
 
     def log_action(self, action, data=None, user=None, api_token=None, auth=None, save=True):
@@ -108,6 +177,9 @@ class LoggingMixin:
         :param action: The namespaced action code
         :param data: Any JSON-serializable object
         :param user: The user performing the action (optional)
+        :param save: Whether to save the entry. If ``False``, the unsaved entry is returned, e.g. for use with
+                     ``LogEntry.bulk_create_and_postprocess``. Within ``buffered_logging``, the entry is saved when
+                     the buffer is flushed.
         """
         from pretix.api.models import OAuthAccessToken, OAuthApplication
         from pretix.api.webhooks import notify_webhooks
@@ -162,6 +234,11 @@ class LoggingMixin:
         elif data:
             raise TypeError("You should only supply dictionaries as log data.")
         if save:
+            buffer = log_buffer_var.get()
+            if buffer is not None and buffer.accepts():
+                buffer.add(logentry)
+                return logentry
+
             logentry.save()
 
             if logentry.notification_type:
@@ -215,7 +292,7 @@ class LoggedModel(models.Model, LoggingMixin):
         return qs
 
     def top_logentries_has_more(self):
-        return self.all_logentries().count() > 25
+        return self.all_logentries()[:26].count() > 25
 
     def all_logentries(self):
         """
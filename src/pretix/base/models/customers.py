@@ -19,8 +19,6 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
-from decimal import Decimal
-
 import pycountry
 from django.conf import settings
 from django.contrib.auth.hashers import (
@@ -29,9 +27,6 @@ from django.contrib.auth.hashers import (
 from django.core.validators import RegexValidator, URLValidator
 from django.db import models
 from django.db.models import F, Q
-from django.db.models.aggregates import Sum
-from django.db.models.expressions import OuterRef, Subquery
-from django.db.models.functions.comparison import Coalesce
 from django.utils.crypto import get_random_string, salted_hmac
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _, pgettext_lazy
@@ -43,7 +38,6 @@ from pretix.base.banlist import banned
 from pretix.base.i18n import language
 from pretix.base.models.base import LoggedModel
 from pretix.base.models.fields import MultiStringField
-from pretix.base.models.giftcards import GiftCardTransaction
 from pretix.base.models.organizer import Organizer
 from pretix.base.settings import PERSON_NAME_SCHEMES
 from pretix.helpers.countries import FastCountryField
@@ -320,11 +314,8 @@ class Customer(LoggedModel):
         )
 
     def usable_gift_cards(self, used_cards=[]):
-        s = GiftCardTransaction.objects.filter(
-            card=OuterRef('pk')
-        ).order_by().values('card').annotate(s=Sum('value')).values('s')
         qs = self.customer_gift_cards.annotate(
-            cached_value=Coalesce(Subquery(s), Decimal('0.00')),
+            cached_value=F('balance'),
         )
         ne_qs = qs.filter(
             Q(expires__isnull=True) | Q(expires__gte=now()),
@@ -23,8 +23,8 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.core.validators import RegexValidator
-from django.db import models
-from django.db.models import Sum
+from django.db import models, transaction
+from django.db.models import F
 from django.urls import reverse
 from django.utils.crypto import get_random_string
 from django.utils.html import format_html
@@ -113,6 +113,12 @@ class GiftCard(LoggedModel):
     )
     CURRENCY_CHOICES = [(c.alpha_3, c.alpha_3 + " - " + c.name) for c in settings.CURRENCIES]
     currency = models.CharField(max_length=10, choices=CURRENCY_CHOICES)
+    balance = models.DecimalField(
+        decimal_places=2,
+        max_digits=13,
+        default=Decimal('0.00'),
+        editable=False,
+    )
 
     def __str__(self):
         return self.secret
@@ -125,7 +131,11 @@ class GiftCard(LoggedModel):
     def value(self):
         if hasattr(self, 'cached_value'):
             return self.cached_value or Decimal('0.00')
-        return self.transactions.aggregate(s=Sum('value'))['s'] or Decimal('0.00')
+        if self.pk:
+            # Transactions might have been created through a different instance of this card, so we read the
+            # stored balance instead of relying on the value this instance has been loaded with.
+            self.balance = GiftCard.objects.filter(pk=self.pk).values_list('balance', flat=True).first()
+        return self.balance
 
     def accepted_by(self, organizer):
         return self.issuer == organizer or GiftCardAcceptance.objects.filter(issuer=self.issuer, acceptor=organizer, active=True).exists()
@@ -134,6 +144,12 @@ class GiftCard(LoggedModel):
         if not self.secret:
             self.secret = gen_giftcard_secret(self.issuer.settings.giftcard_length)
 
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # The balance is only ever changed by GiftCardTransaction.save(), we never want to overwrite it with a
+            # value that might have become stale since this instance was loaded.
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields if not f.primary_key and f.name != 'balance'
+            ]
         super().save(*args, **kwargs)
 
     class Meta:
@@ -192,7 +208,15 @@ class GiftCardTransaction(models.Model):
     def save(self, *args, **kwargs):
         if not self.pk and not self.acceptor:
             raise ValueError("`acceptor` should be set on all new gift card transactions.")
-        super().save(*args, **kwargs)
+        if self.pk:
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # The UPDATE locks the gift card row until the end of the transaction, so concurrent transactions on the
+            # same card are serialized and the stored balance always equals the sum of all transactions.
+            GiftCard.objects.filter(pk=self.card_id).update(balance=F('balance') + self.value)
 
     def display(self, customer_facing=True):
         from ..signals import gift_card_transaction_display
@@ -52,7 +52,7 @@ from django.core.exceptions import ValidationError
 from django.core.validators import (
     MaxLengthValidator, MinValueValidator, RegexValidator,
 )
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
 from django.utils import formats
 from django.utils.crypto import get_random_string
@@ -800,6 +800,17 @@ class Item(LoggedModel):
         verbose_name_plural = _("Products")
         ordering = ("category__position", "category", "position", "pk")
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__initial_picture = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'picture' not in instance.get_deferred_fields():
+            instance.__initial_picture = instance.picture.name
+        return instance
+
     def __str__(self):
         return str(self.internal_name or self.name)
 
@@ -809,6 +820,23 @@ class Item(LoggedModel):
         super().save(*args, **kwargs)
         if self.event:
             self.event.cache.clear()
+        picture_saved = (
+            'picture' in (kwargs.get('update_fields') or ['picture']) and
+            'picture' not in self.get_deferred_fields()
+        )
+        if picture_saved and self.picture.name != self.__initial_picture:
+            self.__initial_picture = self.picture.name
+            if self.picture:
+                from ..services.thumbnails import (
+                    PRODUCT_PICTURE_SIZES, create_thumbnails,
+                )
+
+                # Thumbnails are created in the background, so they are usually available before the picture is
+                # first shown
+                picture = self.picture.name
+                transaction.on_commit(
+                    lambda: create_thumbnails.apply_async(args=(picture, list(PRODUCT_PICTURE_SIZES)))
+                )
 
     def delete(self, *args, **kwargs):
         self.vouchers.update(item=None, variation=None, quota=None)
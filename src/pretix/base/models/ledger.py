@@ -0,0 +1,56 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+from django.db import models
+
+
+class TransactionLedgerDay(models.Model):
+    """
+    Sum of all ``Transaction`` objects of non-test orders of an event on a day (in UTC). Rows are only created by
+    ``pretix.base.services.ledger`` for days that are closed and are never changed afterwards.
+    """
+    event = models.ForeignKey(
+        'Event',
+        related_name='+',
+        on_delete=models.CASCADE,
+    )
+    day = models.DateField()
+    total = models.DecimalField(decimal_places=2, max_digits=13)
+
+    class Meta:
+        unique_together = (('event', 'day'),)
+
+
+class GiftCardLedgerDay(models.Model):
+    """
+    Sum of all ``GiftCardTransaction`` objects of non-test gift cards of an issuer in a currency on a day (in UTC).
+    """
+    issuer = models.ForeignKey(
+        'Organizer',
+        related_name='+',
+        on_delete=models.CASCADE,
+    )
+    currency = models.CharField(max_length=10)
+    day = models.DateField()
+    total = models.DecimalField(decimal_places=2, max_digits=13)
+
+    class Meta:
+        unique_together = (('issuer', 'currency', 'day'),)
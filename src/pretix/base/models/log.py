@@ -88,7 +88,13 @@ class LogEntry(models.Model):
 
     class Meta:
         ordering = ('-datetime', '-id')
-        indexes = [models.Index(fields=["datetime", "id"], name="pretixbase__datetim_b1fe5a_idx")]
+        indexes = [
+            models.Index(fields=["datetime", "id"], name="pretixbase__datetim_b1fe5a_idx"),
+            # Log entries are almost always read as "the most recent entries of X", these allow to retrieve them
+            # without scanning and sorting all entries of X.
+            models.Index(fields=["content_type", "object_id", "datetime", "id"], name="pretixbase__content_f8e1c7_idx"),
+            models.Index(fields=["event", "datetime", "id"], name="pretixbase__event_i_447a99_idx"),
+        ]
 
     def display(self):
         from pretix.base.logentrytype_registry import log_entry_types
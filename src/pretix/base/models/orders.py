@@ -761,6 +761,7 @@ class Order(LockModel, LoggedModel):
         Returns whether or not this order can be canceled by the user.
         """
         from .checkin import Checkin
+        from .memberships import Membership
 
         if self.cancellation_requests.exists() or not self.cancel_allowed():
             return False
@@ -776,8 +777,8 @@ class Order(LockModel, LoggedModel):
             for gc in op.issued_gift_cards.all():
                 if gc.value != op.price:
                     return False
-            if op.granted_memberships.with_usages().filter(usages__gt=0):
-                return False
+        if Membership.objects.with_usages().filter(granted_in__in=positions, usages__gt=0).exists():
+            return False
         if self.user_cancel_deadline and time_machine_now() > self.user_cancel_deadline:
             return False
 
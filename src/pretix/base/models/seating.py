@@ -184,6 +184,10 @@ class Seat(models.Model):
 
     class Meta:
         ordering = ['sorting_rank', 'seat_guid']
+        indexes = [
+            models.Index(fields=['event', 'x', 'y']),
+            models.Index(fields=['subevent', 'x', 'y']),
+        ]
 
     @property
     def name(self):
@@ -259,9 +263,15 @@ class Seat(models.Model):
             )
 
         if minimal_distance > 0:
-            # TODO: Is there a more performant implementation on PostgreSQL using
-            # https://www.postgresql.org/docs/8.2/functions-geometry.html ?
-            sq_closeby = qs_annotated.annotate(
+            # Only seats within the bounding box around a seat can be closer than the minimal distance. Filtering on
+            # the bounding box first allows the database to use the index on the coordinates instead of computing the
+            # distance to every other seat, which would take quadratic time for large plans.
+            sq_closeby = qs_annotated.filter(
+                x__gt=OuterRef('x') - minimal_distance,
+                x__lt=OuterRef('x') + minimal_distance,
+                y__gt=OuterRef('y') - minimal_distance,
+                y__lt=OuterRef('y') + minimal_distance,
+            ).annotate(
                 distance=(
                     Power(F('x') - OuterRef('x'), Value(2), output_field=models.FloatField()) +
                     Power(F('y') - OuterRef('y'), Value(2), output_field=models.FloatField())
@@ -337,14 +347,20 @@ class Seat(models.Model):
             self_x = Subquery(Seat.objects.filter(pk=self.pk).values('x'))
             self_y = Subquery(Seat.objects.filter(pk=self.pk).values('y'))
 
-            qs_closeby_taken = qs_annotated.annotate(
+            minimal_distance = self.event.settings.seating_minimal_distance
+            qs_closeby_taken = qs_annotated.filter(
+                x__gt=self_x - minimal_distance,
+                x__lt=self_x + minimal_distance,
+                y__gt=self_y - minimal_distance,
+                y__lt=self_y + minimal_distance,
+            ).annotate(
                 distance=(
                     Power(F('x') - self_x, Value(2), output_field=models.FloatField()) +
                     Power(F('y') - self_y, Value(2), output_field=models.FloatField())
                 )
             ).exclude(pk=self.pk).filter(
                 q,
-                distance__lt=self.event.settings.seating_minimal_distance ** 2
+                distance__lt=minimal_distance ** 2
             )
             if self.event.settings.seating_distance_within_row:
                 qs_closeby_taken = qs_closeby_taken.filter(row_name=self.row_name)
@@ -19,13 +19,21 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
+import csv
+import heapq
+import inspect
+import io
 import logging
+import tempfile
+from contextlib import ExitStack
 from datetime import timedelta
 from typing import Any, Dict, Union
 
+from celery import chord
 from celery.exceptions import MaxRetriesExceededError
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.cache import cache
+from django.core.files.base import ContentFile, File
 from django.db import close_old_connections, connection, transaction
 from django.dispatch import receiver
 from django.utils.timezone import now, override
@@ -45,6 +53,7 @@ from pretix.base.models.exports import ScheduledOrganizerExport
 from pretix.base.services.mail import mail
 from pretix.base.services.tasks import (
     EventTask, OrganizerTask, ProfiledEventTask, ProfiledOrganizerUserTask,
+    ProfiledTask,
 )
 from pretix.base.signals import (
     periodic_task, register_data_exporters, register_multievent_data_exporters,
@@ -55,6 +64,9 @@ from pretix.helpers.urls import build_absolute_uri
 
 logger = logging.getLogger(__name__)
 
+# Number of events exported by one task if a multi-event export is split up
+MULTIEXPORT_PARTITION_SIZE = 25
+
 
 class ExportError(LazyLocaleException):
     pass
@@ -64,6 +76,39 @@ class ExportEmptyError(ExportError):
     pass
 
 
+def _render_to_cachedfile(ex: BaseExporter, form_data: dict, file: CachedFile):
+    """
+    Renders the export and stores the result in ``file``. If the exporter supports writing to a file handle, the
+    output is written to a temporary file on disk and copied to the storage in chunks, so the export never needs to
+    fit into memory as a whole.
+    """
+    with tempfile.NamedTemporaryFile() as tmpfile:
+        kwargs = {}
+        if 'output_file' in inspect.signature(ex.render).parameters:
+            kwargs['output_file'] = tmpfile
+
+        if ex.repeatable_read:
+            with repeatable_reads_transaction():
+                d = ex.render(form_data, **kwargs)
+        else:
+            d = ex.render(form_data, **kwargs)
+
+        if d is None:
+            raise ExportError(
+                gettext('Your export did not contain any data.')
+            )
+        file.filename, file.type, data = d
+
+        close_old_connections()  # This task can run very long, we might need a new DB connection
+
+        if data is not None:
+            file.file.save(cachedfile_name(file, file.filename), ContentFile(data))
+        else:
+            tmpfile.flush()
+            tmpfile.seek(0)
+            file.file.save(cachedfile_name(file, file.filename), File(tmpfile))
+
+
 @app.task(base=ProfiledEventTask, throws=(ExportError, ExportEmptyError), bind=True)
 def export(self, event: Event, user: User, device: int, token: int, fileid: str, provider: str,
            form_data: Dict[str, Any], staff_session=False) -> None:
@@ -97,22 +142,7 @@ def export(self, event: Event, user: User, device: int, token: int, fileid: str,
 
     file = CachedFile.objects.get(id=fileid)
     with language(event.settings.locale, event.settings.region), override(event.settings.timezone):
-        if ex.repeatable_read:
-            with repeatable_reads_transaction():
-                d = ex.render(form_data)
-        else:
-            d = ex.render(form_data)
-
-        if d is None:
-            raise ExportError(
-                gettext('Your export did not contain any data.')
-            )
-        file.filename, file.type, data = d
-
-        close_old_connections()  # This task can run very long, we might need a new DB connection
-
-        f = ContentFile(data)
-        file.file.save(cachedfile_name(file, file.filename), f)
+        _render_to_cachedfile(ex, form_data, file)
     return str(file.pk)
 
 
@@ -169,22 +199,137 @@ def multiexport(self, organizer: Organizer, user: User, device: int, token: int,
             locale = organizer.settings.locale or settings.LANGUAGE_CODE
             timezone = organizer.settings.timezone or settings.TIME_ZONE
             region = organizer.settings.region
+
+    partitions = _get_partitions(ex, form_data)
+    if partitions:
+        # Large exports are split up into groups of events that are rendered in parallel by multiple workers. This
+        # task is replaced by a chord that concatenates the partial results into our file.
+        return self.replace(chord(
+            [
+                multiexport_partition.s(
+                    organizer=organizer.pk, user=user.pk if user else None, device=device.pk if device else None,
+                    token=token.pk if token else None, provider=provider, form_data=form_data, events=events,
+                    locale=locale, timezone=timezone, region=region, parent_id=self.request.id,
+                    partition_index=i, partition_count=len(partitions), staff_session=staff_session,
+                )
+                for i, events in enumerate(partitions)
+            ],
+            multiexport_merge.s(
+                fileid=fileid, sort_columns=list(ex.partition_sort_columns), encoding=ex.get_csv_encoding(),
+                delimiter=';' if form_data['_format'] == 'semicolon' else ',',
+            ),
+        ))
+
     with language(locale, region), override(timezone):
-        if ex.repeatable_read:
-            with repeatable_reads_transaction():
-                d = ex.render(form_data)
-        else:
-            d = ex.render(form_data)
-        if d is None:
-            raise ExportError(
-                gettext('Your export did not contain any data.')
+        _render_to_cachedfile(ex, form_data, file)
+    return str(file.pk)
+
+
+def _get_partitions(ex: BaseExporter, form_data: dict):
+    if not getattr(ex, 'partitionable', False) or not getattr(ex, 'partition_sort_columns', None) or \
+            form_data.get('_format') not in ('default', 'csv-excel', 'semicolon'):
+        return None
+    event_ids = list(ex.events.order_by('pk').values_list('pk', flat=True))
+    if len(event_ids) <= MULTIEXPORT_PARTITION_SIZE:
+        return None
+    return [event_ids[i:i + MULTIEXPORT_PARTITION_SIZE] for i in range(0, len(event_ids), MULTIEXPORT_PARTITION_SIZE)]
+
+
+@app.task(base=ProfiledOrganizerUserTask, throws=(ExportError,), bind=True)
+def multiexport_partition(self, organizer: Organizer, user: User, device: int, token: int, provider: str,
+                          form_data: Dict[str, Any], events: list, locale: str, timezone: str, region: str,
+                          parent_id: str, partition_index: int, partition_count: int, staff_session=False) -> str:
+    if device:
+        device = Device.objects.get(pk=device)
+    if token:
+        token = TeamAPIToken.objects.get(pk=token)
+
+    progress_keys = [f'pretix_multiexport_progress_{parent_id}_{i}' for i in range(partition_count)]
+
+    def set_progress(val):
+        # Progress is reported on the original task, which is what the user is waiting for, as the average progress
+        # of all partitions.
+        cache.set(progress_keys[partition_index], val, 3600)
+        if not self.request.called_directly:
+            self.update_state(
+                task_id=parent_id,
+                state='PROGRESS',
+                meta={'value': sum(cache.get_many(progress_keys).values()) / partition_count}
             )
-        file.filename, file.type, data = d
 
-        close_old_connections()  # This task can run very long, we might need a new DB connection
+    ex = init_organizer_exporter(
+        identifier=provider,
+        organizer=organizer,
+        user=user,
+        token=token,
+        device=device,
+        staff_session=staff_session,
+        progress_callback=set_progress,
+        event_qs=organizer.events.filter(pk__in=events),
+    )
+    if not ex:
+        raise ExportError(
+            gettext('Export not found or you do not have sufficient permission to perform this export.')
+        )
 
-        f = ContentFile(data)
-        file.file.save(cachedfile_name(file, file.filename), f)
+    file = CachedFile.objects.create(date=now(), expires=now() + timedelta(hours=24), web_download=False)
+    with language(locale, region), override(timezone):
+        _render_to_cachedfile(ex, form_data, file)
+    set_progress(100)
+    return str(file.pk)
+
+
+class _CSVRecords:
+    """
+    Iterates over the records of a CSV file as tuples of the parsed fields and the raw text of the record, so
+    records can be ordered by their fields and copied without changing their formatting.
+    """
+
+    def __init__(self, f, delimiter):
+        self.lines = []
+        self.reader = csv.reader(self._lines(f), delimiter=delimiter)
+
+    def _lines(self, f):
+        for line in f:
+            self.lines.append(line)
+            yield line
+
+    def __iter__(self):
+        for fields in self.reader:
+            raw = ''.join(self.lines)
+            self.lines.clear()
+            yield fields, raw
+
+
+@app.task(base=ProfiledTask, throws=(ExportError,))
+def multiexport_merge(partitions: list, fileid: str, sort_columns: list, delimiter: str, encoding: str) -> str:
+    file = CachedFile.objects.get(id=fileid)
+    partition_files = [CachedFile.objects.get(id=p) for p in partitions]
+
+    with tempfile.NamedTemporaryFile() as tmpfile, ExitStack() as stack:
+        output = io.TextIOWrapper(tmpfile, encoding=encoding, errors='replace', newline='')
+        iterators = []
+        for cf in partition_files:
+            f = stack.enter_context(io.TextIOWrapper(cf.file.open('rb'), encoding=encoding, newline=''))
+            records = iter(_CSVRecords(f, delimiter))
+            header = next(records, None)  # every partition starts with the same header row
+            if header and not iterators:
+                output.write(header[1])
+            iterators.append(records)
+
+        # Every partition is sorted, so merging them keeps the order of the rows across all events. Rows with equal
+        # keys stay in the order of the partitions.
+        for fields, raw in heapq.merge(*iterators, key=lambda r: [r[0][i] for i in sort_columns]):
+            output.write(raw)
+        output.flush()
+        output.detach()
+
+        tmpfile.seek(0)
+        file.filename, file.type = partition_files[0].filename, partition_files[0].type
+        file.file.save(cachedfile_name(file, file.filename), File(tmpfile))
+
+    for cf in partition_files:
+        cf.delete()
     return str(file.pk)
 
 
@@ -0,0 +1,134 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+"""
+Keeps daily totals of order transactions and gift card transactions, such that reports do not need to aggregate
+the complete history of an organizer to compute balances at a point in time.
+
+A day (in UTC) is closed once it ended more than ``LEDGER_CLOSE_DELAY`` ago. Closed days are aggregated by a
+periodic task and never change afterwards, since transactions are only ever created with the current time. Test
+mode orders and gift cards are not included, since their data may be deleted later.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+
+from django.db import transaction
+from django.db.models import F, Min, Sum
+from django.db.models.functions import TruncDate
+from django.dispatch import receiver
+from django.utils.timezone import now
+from django_scopes import scopes_disabled
+
+from pretix.base.models import (
+    GiftCardLedgerDay, GiftCardTransaction, Transaction, TransactionLedgerDay,
+)
+from pretix.base.settings import GlobalSettingsObject
+from pretix.base.signals import periodic_task
+
+LEDGER_CLOSE_DELAY = timedelta(hours=1)
+# Number of days aggregated within one database transaction
+LEDGER_BATCH_DAYS = 31
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time(0, 0), tzinfo=timezone.utc)
+
+
+def ledger_closed_until():
+    """
+    Returns the first day that is not yet contained in the ledger, or ``None`` if the ledger has not been filled yet.
+    """
+    return GlobalSettingsObject().settings.ledger_closed_until
+
+
+def ledger_boundary(until: datetime):
+    """
+    Returns the latest point in time before ``until`` up to which the ledger can be used, i.e. the sum of all
+    transactions before ``until`` equals the sum of all ledger days before the returned date plus the sum of all
+    transactions between the returned datetime and ``until``. Returns ``None`` if the ledger can not be used.
+    """
+    closed_until = ledger_closed_until()
+    if not closed_until:
+        return None
+    return _day_start(min(closed_until, until.astimezone(timezone.utc).date()))
+
+
+def _fill(start: date, end: date):
+    tx = Transaction.objects.filter(
+        datetime__gte=_day_start(start),
+        datetime__lt=_day_start(end),
+        order__testmode=False,
+    ).annotate(
+        day=TruncDate('datetime', tzinfo=timezone.utc)
+    ).order_by().values('order__event_id', 'day').annotate(
+        total=Sum(F('count') * F('price'))
+    )
+    TransactionLedgerDay.objects.bulk_create([
+        TransactionLedgerDay(event_id=r['order__event_id'], day=r['day'], total=r['total'])
+        for r in tx
+    ])
+
+    gctx = GiftCardTransaction.objects.filter(
+        datetime__gte=_day_start(start),
+        datetime__lt=_day_start(end),
+        card__testmode=False,
+    ).annotate(
+        day=TruncDate('datetime', tzinfo=timezone.utc)
+    ).order_by().values('card__issuer_id', 'card__currency', 'day').annotate(
+        total=Sum('value')
+    )
+    GiftCardLedgerDay.objects.bulk_create([
+        GiftCardLedgerDay(issuer_id=r['card__issuer_id'], currency=r['card__currency'], day=r['day'], total=r['total'])
+        for r in gctx
+    ])
+
+
+@receiver(signal=periodic_task)
+@scopes_disabled()
+def update_ledger(sender, **kwargs):
+    gs = GlobalSettingsObject()
+    end = (now() - LEDGER_CLOSE_DELAY).astimezone(timezone.utc).date()
+    start = ledger_closed_until()
+    if not start:
+        first = [
+            d for d in (
+                Transaction.objects.aggregate(m=Min('datetime'))['m'],
+                GiftCardTransaction.objects.aggregate(m=Min('datetime'))['m'],
+            ) if d
+        ]
+        start = min(first).astimezone(timezone.utc).date() if first else end
+
+    while start < end:
+        batch_end = min(start + timedelta(days=LEDGER_BATCH_DAYS), end)
+        with transaction.atomic():
+            _fill(start, batch_end)
+            gs.settings.set('ledger_closed_until', batch_end)
+        start = batch_end
+
+
+def reset_ledger():
+    """
+    Drops all ledger data. Needs to be called whenever transactions are created for days that are already closed,
+    the ledger will be filled again by the next run of the periodic task.
+    """
+    with transaction.atomic():
+        TransactionLedgerDay.objects.all().delete()
+        GiftCardLedgerDay.objects.all().delete()
+        GlobalSettingsObject().settings.delete('ledger_closed_until')
@@ -75,7 +75,9 @@ from pretix.base.models import (
 from pretix.base.models.mail import OutgoingMail
 from pretix.base.services.invoices import invoice_pdf_task
 from pretix.base.services.tasks import TransactionAwareTask
-from pretix.base.services.tickets import get_tickets_for_order
+from pretix.base.services.tickets import (
+    get_tickets_for_order, prerender_pending,
+)
 from pretix.base.signals import (
     email_filter, global_email_filter, periodic_task,
 )
@@ -90,6 +92,8 @@ from pretix.presale.ical import get_private_icals
 
 logger = logging.getLogger('pretix.base.mail')
 INVALID_ADDRESS = 'invalid-pretix-mail-address'
+PRERENDER_RETRY_AFTER = 5
+PRERENDER_MAX_RETRIES = 3
 
 
 class TolerantDict(dict):
@@ -461,6 +465,18 @@ def mail_send_task(self, **kwargs) -> bool:
     with outgoing_mail.scope_manager():
         # Attach tickets
         if outgoing_mail.should_attach_tickets and outgoing_mail.order:
+            if self.request.retries < PRERENDER_MAX_RETRIES and prerender_pending(outgoing_mail.order):
+                # The tickets are being rendered in the background, rendering them here as well would replace the
+                # files of the other worker. Check again shortly and render them ourselves if it takes too long.
+                outgoing_mail.error = "Tickets not ready"
+                outgoing_mail.error_detail = None
+                outgoing_mail.sent = now()
+                outgoing_mail.status = OutgoingMail.STATUS_AWAITING_RETRY
+                outgoing_mail.retry_after = now() + timedelta(seconds=PRERENDER_RETRY_AFTER)
+                outgoing_mail.save(update_fields=["status", "error", "error_detail", "sent", "retry_after",
+                                                  "actual_attachments"])
+                self.retry(max_retries=5, countdown=PRERENDER_RETRY_AFTER)  # throws RetryException, ends function flow
+
             with language(outgoing_mail.order.locale, outgoing_mail.event.settings.region):
                 args = []
                 attach_size = 0
@@ -41,6 +41,7 @@ from pretix.base.models.orders import Transaction
 from pretix.base.services.invoices import generate_invoice, invoice_qualified
 from pretix.base.services.locking import lock_objects
 from pretix.base.services.tasks import ProfiledEventTask
+from pretix.base.services.tickets import schedule_prerender
 from pretix.base.signals import order_paid, order_placed
 from pretix.celery_app import app
 
@@ -225,6 +226,11 @@ def import_orders(event: Event, fileid: str, settings: dict, locale: str, user,
                 Transaction.objects.bulk_create(save_transactions)
                 LogEntry.bulk_create_and_postprocess(save_logentries)
 
+            prerender = [o.pk for o in orders if o.ticket_download_available]
+            if prerender:
+                # Scheduled before the signals are sent, so the order_paid receiver skips these orders
+                transaction.on_commit(lambda: schedule_prerender(event, prerender))
+
             for o in orders:
                 with language(o.locale, event.settings.region):
                     order_placed.send(event, order=o, bulk=True)
@@ -71,6 +71,7 @@ from pretix.base.models import (
     Membership, Order, OrderPayment, OrderPosition, Quota, Seat,
     SeatCategoryMapping, User, Voucher,
 )
+from pretix.base.models.base import buffered_logging
 from pretix.base.models.event import SubEvent
 from pretix.base.models.orders import (
     BlockedTicketSecret, InvoiceAddress, OrderFee, OrderRefund,
@@ -1227,7 +1228,7 @@ def _perform_order(event: Event, payment_requests: List[dict], position_ids: Lis
     real_now_dt = now()
     time_machine_now_dt = time_machine_now(real_now_dt)
     err_out = None
-    with transaction.atomic(durable=True):
+    with transaction.atomic(durable=True), buffered_logging():
         positions = list(
             positions.select_related('item', 'variation', 'subevent', 'seat', 'addon_to').prefetch_related('addons')
         )
@@ -3058,7 +3059,7 @@ class OrderChangeManager:
 
         self._check_order_size()
 
-        with transaction.atomic():
+        with transaction.atomic(), buffered_logging():
             locked_instance = Order.objects.select_for_update(of=OF_SELF).get(pk=self.order.pk)
             if locked_instance.last_modified != self.order.last_modified:
                 raise OrderError(error_messages['race_condition'])
@@ -3488,6 +3489,14 @@ def signal_listener_issue_giftcards(sender: Event, order: Order, **kwargs):
         tickets.invalidate_cache.apply_async(kwargs={'event': sender.pk, 'order': order.pk})
 
 
+@receiver(order_placed, dispatch_uid="pretixbase_order_placed_prerender_tickets")
+@receiver(order_paid, dispatch_uid="pretixbase_order_paid_prerender_tickets")
+def signal_listener_prerender_tickets(sender: Event, order: Order, **kwargs):
+    # Bulk operations schedule one task for all their orders themselves
+    if not kwargs.get('bulk') and order.ticket_download_available:
+        transaction.on_commit(lambda: tickets.schedule_prerender(sender, [order.pk]))
+
+
 @receiver(order_paid, dispatch_uid="pretixbase_order_paid_memberships")
 @receiver(order_changed, dispatch_uid="pretixbase_order_changed_memberships")
 @transaction.atomic()
@@ -19,11 +19,32 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
-from django.db.models import Count, Exists, OuterRef, Q
+import math
+from collections import defaultdict
+
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 
 from pretix.base.i18n import LazyLocaleException
-from pretix.base.models import CartPosition, Order, OrderPosition, Seat
+from pretix.base.models import (
+    CartPosition, Order, OrderPosition, Seat, Voucher,
+)
+from pretix.helpers.iter import chunked_iterable
+
+SEAT_STATE_FREE = 0
+SEAT_STATE_SOLD = 1
+SEAT_STATE_CART = 2
+SEAT_STATE_VOUCHER = 3
+SEAT_STATE_BLOCKED = 4
+SEAT_STATE_DISTANCE = 5
+
+SEAT_STATES_CACHE_TTL = 5
+
+SEAT_BATCH_SIZE = 1000
+SEAT_UPDATE_FIELDS = [
+    'product', 'row_name', 'seat_number', 'zone_name', 'sorting_rank', 'row_label', 'seat_label', 'x', 'y', 'blocked'
+]
 
 
 class SeatProtected(LazyLocaleException):
@@ -64,17 +85,10 @@ def validate_plan_change(event, subevent, plan):
 
 def generate_seats(event, subevent, plan, mapping, blocked_guids=None):
     current_seats = {}
-    for s in event.seats.select_related('product').annotate(
-        has_op=Exists(OrderPosition.all.filter(
-            seat=OuterRef('pk'),
-            canceled=False,
-        ).exclude(
-            order__status__in=(Order.STATUS_CANCELED, Order.STATUS_EXPIRED)
-        )),
-        has_v=Count('vouchers')
-    ).filter(subevent=subevent).order_by():
+    duplicate_seats = []
+    for s in event.seats.filter(subevent=subevent).order_by():
         if s.seat_guid in current_seats:
-            s.delete()  # Duplicates should not exist
+            duplicate_seats.append(s.pk)  # Duplicates should not exist
         else:
             current_seats[s.seat_guid] = s
 
@@ -84,6 +98,7 @@ def generate_seats(event, subevent, plan, mapping, blocked_guids=None):
             return True
         return False
 
+    update_seats = []
     create_seats = []
     if plan:
         for ss in plan.iter_all_seats():
@@ -91,7 +106,7 @@ def generate_seats(event, subevent, plan, mapping, blocked_guids=None):
             if ss.guid in current_seats:
                 seat = current_seats.pop(ss.guid)
                 updated = any([
-                    update(seat, 'product', p),
+                    update(seat, 'product_id', p.pk if p else None),
                     update(seat, 'row_name', ss.row),
                     update(seat, 'seat_number', ss.number),
                     update(seat, 'zone_name', ss.zone),
@@ -105,7 +120,7 @@ def generate_seats(event, subevent, plan, mapping, blocked_guids=None):
                     if blocked_guids else []
                 ))
                 if updated:
-                    seat.save()
+                    update_seats.append(seat)
             else:
                 create_seats.append(Seat(
                     event=event,
@@ -123,19 +138,118 @@ def generate_seats(event, subevent, plan, mapping, blocked_guids=None):
                     product=p,
                 ))
 
-    for s in current_seats.values():
-        if s.has_op:
+    removed_seats = {s.pk: s for s in current_seats.values()}
+    for chunk in chunked_iterable(removed_seats.keys(), SEAT_BATCH_SIZE):
+        sold_seat = OrderPosition.all.filter(
+            seat__in=chunk,
+            canceled=False,
+        ).exclude(
+            order__status__in=(Order.STATUS_CANCELED, Order.STATUS_EXPIRED)
+        ).values_list('seat_id', flat=True).first()
+        if sold_seat:
             raise SeatProtected(_('You can not change the plan since seat "%s" is not present in the new plan and is '
-                                  'already sold.', s.name))
-        if s.has_v:
+                                  'already sold.', removed_seats[sold_seat].name))
+    for chunk in chunked_iterable(removed_seats.keys(), SEAT_BATCH_SIZE):
+        voucher_seat = Voucher.objects.filter(seat__in=chunk).values_list('seat_id', flat=True).first()
+        if voucher_seat:
             raise SeatProtected(_('You can not change the plan since seat "%s" is not present in the new plan and is '
-                                  'already used in a voucher.', s.name))
-
-    Seat.objects.bulk_create(create_seats)
-    CartPosition.objects.filter(addon_to__seat__in=[s.pk for s in current_seats.values()]).delete()
-    CartPosition.objects.filter(seat__in=[s.pk for s in current_seats.values()]).delete()
-    OrderPosition.all.filter(
-        Q(canceled=True) | Q(order__status__in=(Order.STATUS_CANCELED, Order.STATUS_EXPIRED)),
-        seat__in=[s.pk for s in current_seats.values()],
-    ).update(seat=None)
-    Seat.objects.filter(pk__in=[s.pk for s in current_seats.values()]).delete()
+                                  'already used in a voucher.', removed_seats[voucher_seat].name))
+
+    Seat.objects.bulk_update(update_seats, SEAT_UPDATE_FIELDS, batch_size=SEAT_BATCH_SIZE)
+    Seat.objects.bulk_create(create_seats, batch_size=SEAT_BATCH_SIZE)
+    for chunk in chunked_iterable(list(removed_seats.keys()) + duplicate_seats, SEAT_BATCH_SIZE):
+        CartPosition.objects.filter(addon_to__seat__in=chunk).delete()
+        CartPosition.objects.filter(seat__in=chunk).delete()
+        OrderPosition.all.filter(
+            Q(canceled=True) | Q(order__status__in=(Order.STATUS_CANCELED, Order.STATUS_EXPIRED)),
+            seat__in=chunk,
+        ).update(seat=None)
+        Seat.objects.filter(pk__in=chunk).delete()
+    invalidate_seat_states(event, subevent)
+
+
+def _distance_blocked(seats, taken_ids, minimal_distance, only_within_row):
+    # Grid index with cells as large as the minimal distance, such that all seats that are too close to a seat are
+    # located in the same or one of the eight neighbouring cells.
+    grid = defaultdict(list)
+    for pk, blocked, x, y, row_name in seats:
+        if pk in taken_ids and x is not None and y is not None:
+            grid[math.floor(x / minimal_distance), math.floor(y / minimal_distance)].append((x, y, row_name))
+
+    result = set()
+    for pk, blocked, x, y, row_name in seats:
+        if pk in taken_ids or x is None or y is None:
+            continue
+        cx, cy = math.floor(x / minimal_distance), math.floor(y / minimal_distance)
+        if any(
+            (ox - x) ** 2 + (oy - y) ** 2 < minimal_distance ** 2 and (not only_within_row or orow == row_name)
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+            for ox, oy, orow in grid.get((cx + dx, cy + dy), ())
+        ):
+            result.add(pk)
+    return result
+
+
+def invalidate_seat_states(event, subevent=None):
+    event.cache.delete('seat_states:{}'.format(subevent.pk if subevent else 'none'))
+
+
+def get_seat_states(event, subevent=None):
+    """
+    Returns the state of all seats of an event or subevent as a byte string with one byte per seat. The seats are
+    in their default order (by ``sorting_rank`` and ``seat_guid``) and every byte is one of the ``SEAT_STATE_*``
+    constants. Seats that are sold, in a cart or reserved by a voucher are reported as such even if they are also
+    blocked.
+
+    The result is computed with one query per kind of reservation instead of annotating every seat with subqueries
+    and is cached for a few seconds, so it is meant for displaying seating plans, not for validating a purchase.
+    """
+    cache_key = 'seat_states:{}'.format(subevent.pk if subevent else 'none')
+    states = event.cache.get(cache_key)
+    if states is not None:
+        return states
+
+    seats = list((subevent or event).seats.values_list('id', 'blocked', 'x', 'y', 'row_name'))
+    sold = set(OrderPosition.objects.filter(
+        order__event=event,
+        subevent=subevent,
+        seat__isnull=False,
+        order__status__in=[Order.STATUS_PENDING, Order.STATUS_PAID],
+    ).values_list('seat_id', flat=True))
+    in_cart = set(CartPosition.objects.filter(
+        event=event,
+        subevent=subevent,
+        seat__isnull=False,
+        expires__gte=now(),
+    ).values_list('seat_id', flat=True))
+    in_voucher = set(Voucher.objects.filter(
+        Q(valid_until__isnull=True) | Q(valid_until__gte=now()),
+        event=event,
+        subevent=subevent,
+        seat__isnull=False,
+        redeemed__lt=F('max_usages'),
+    ).values_list('seat_id', flat=True))
+
+    distance_blocked = set()
+    if event.settings.seating_minimal_distance > 0:
+        distance_blocked = _distance_blocked(
+            seats, sold | in_cart | in_voucher, event.settings.seating_minimal_distance,
+            event.settings.seating_distance_within_row
+        )
+
+    states = bytearray(len(seats))
+    for i, (pk, blocked, x, y, row_name) in enumerate(seats):
+        if pk in sold:
+            states[i] = SEAT_STATE_SOLD
+        elif pk in in_cart:
+            states[i] = SEAT_STATE_CART
+        elif pk in in_voucher:
+            states[i] = SEAT_STATE_VOUCHER
+        elif blocked:
+            states[i] = SEAT_STATE_BLOCKED
+        elif pk in distance_blocked:
+            states[i] = SEAT_STATE_DISTANCE
+    states = bytes(states)
+
+    event.cache.set(cache_key, states, SEAT_STATES_CACHE_TTL)
+    return states
@@ -137,7 +137,7 @@ def shred(self, event: Event, fileid: str, confirm_code: str, user: int=None, lo
     if confirm_code is not True and any(shredder.require_download_confirmation for shredder in shredders):
         if indexdata['confirm_code'] != confirm_code:
             raise ShredError(_("The confirm code you entered was incorrect."))
-    if event.logentry_set.filter(datetime__gte=parse(indexdata['time'])):
+    if event.logentry_set.filter(datetime__gte=parse(indexdata['time'])).exists():
         raise ShredError(_("Something happened in your event after the export, please try again."))
 
     event.log_action(
@@ -36,10 +36,15 @@ from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 from typing import Any, Dict, Iterable, List, Tuple
 
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import (
     Case, Count, DateTimeField, F, Max, OuterRef, QuerySet, Subquery, Sum,
     Value, When,
 )
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.crypto import get_random_string
 from django.utils.timezone import make_aware
 from django.utils.translation import gettext_lazy as _
 
@@ -110,6 +115,45 @@ def dictsum(*dicts) -> dict:
     return res
 
 
+ORDER_OVERVIEW_CACHE_TTL = 3600
+
+
+def _order_version_key(event_id):
+    return 'pretix_order_overview_version_{}'.format(event_id)
+
+
+def _order_version(event):
+    key = _order_version_key(event.pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, get_random_string(12), None)
+        version = cache.get(key)
+    return version
+
+
+@receiver(post_save, sender=Order, dispatch_uid="pretixbase_stats_order_saved")
+@receiver(post_delete, sender=Order, dispatch_uid="pretixbase_stats_order_deleted")
+def _bump_order_version(sender, instance, using=None, **kwargs):
+    # Positions and fees touch their order when they are saved. The version only changes once the transaction is
+    # committed, so an overview computed in between cannot be stored under the new version.
+    event_id = instance.event_id
+    transaction.on_commit(
+        lambda: cache.set(_order_version_key(event_id), get_random_string(12), None),
+        using=using,
+    )
+
+
+def _cached_counters(event, key, version, compute):
+    if version is None:
+        return list(compute())
+    cached = event.cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    counters = list(compute())
+    event.cache.set(key, (version, counters), ORDER_OVERVIEW_CACHE_TTL)
+    return counters
+
+
 def order_overview(
         event: Event, subevent: SubEvent=None, date_filter='', date_from=None, date_until=None, fees=False,
         admission_only=False, base_qs=None, base_fees_qs=None, subevent_date_from=None, subevent_date_until=None,
@@ -166,7 +210,16 @@ def order_overview(
         if date_until:
             qs = qs.filter(payment_date__lt=date_until)
 
-    counters = qs.filter(
+    # Without custom filters, the result only depends on the subevent and can be reused as long as no order has
+    # been changed, see _cached_counters
+    cacheable = (
+        base_qs is None and not subevent_date_from and not subevent_date_until and
+        not isinstance(subevent, (list, QuerySet)) and not (date_filter and (date_from or date_until))
+    )
+    version = _order_version(event) if cacheable else None
+    cache_key = 'order_overview:{}:{}'.format(subevent.pk if subevent else 'all', admission_only)
+
+    counters = _cached_counters(event, cache_key + ':positions', version, lambda: qs.filter(
         order__event=event
     ).annotate(
         status=Case(
@@ -176,7 +229,7 @@ def order_overview(
         )
     ).values(
         'item', 'variation', 'status'
-    ).annotate(cnt=Count('id'), price=Sum('price'), tax_value=Sum('tax_value')).order_by()
+    ).annotate(cnt=Count('id'), price=Sum('price'), tax_value=Sum('tax_value')).order_by())
 
     states = {
         'unapproved': 'unapproved',
@@ -269,9 +322,9 @@ def order_overview(
                 qs = qs.filter(payment_date__gte=date_from)
             if date_until:
                 qs = qs.filter(payment_date__lt=date_until)
-        counters = qs.values(
+        counters = _cached_counters(event, cache_key + ':fees', version, lambda: qs.values(
             'fee_type', 'internal_type', 'status'
-        ).annotate(cnt=Count('id'), value=Sum('value'), tax_value=Sum('tax_value')).order_by()
+        ).annotate(cnt=Count('id'), value=Sum('value'), tax_value=Sum('tax_value')).order_by())
 
         for l, s in states.items():
             num[l] = {
@@ -42,12 +42,20 @@ from pretix.base.metrics import (
 )
 from pretix.base.models import Event, Organizer, User
 from pretix.celery_app import app
+from pretix.helpers.profile.sampling import StackSampler
 
 
 class ProfiledTask(app.Task):
     def __call__(self, *args, **kwargs):
 
-        if settings.PROFILING_RATE > 0 and random.random() < settings.PROFILING_RATE / 100:
+        if settings.PROFILING_RATE > 0 and settings.PROFILING_MODE == 'sampling' and \
+                random.random() < settings.PROFILING_RATE / 100:
+            t0 = time.perf_counter()
+            with StackSampler('celery.' + self.name):
+                ret = super().__call__(*args, **kwargs)
+            tottime = time.perf_counter() - t0
+        elif settings.PROFILING_RATE > 0 and settings.PROFILING_MODE == 'cprofile' and \
+                random.random() < settings.PROFILING_RATE / 100:
             profiler = cProfile.Profile()
             profiler.enable()
             t0 = time.perf_counter()
@@ -0,0 +1,51 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+import logging
+
+from django.db import IntegrityError
+
+from pretix.celery_app import app
+from pretix.helpers.thumb import (
+    ThumbnailError, create_thumbnail, lookup_thumbnail, thumbnail_formats,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sizes in which product pictures are shown in the shop and widget
+PRODUCT_PICTURE_SIZES = ('60x60^',)
+
+
+@app.task(acks_late=True)
+def create_thumbnails(source: str, sizes: list):
+    """
+    Creates all missing thumbnails of ``source`` in the given sizes.
+    """
+    for size in sizes:
+        if lookup_thumbnail(source, size) is not None:
+            continue
+        try:
+            create_thumbnail(source, size, formats=thumbnail_formats())
+        except IntegrityError:
+            # Created concurrently by a different worker
+            pass
+        except (ThumbnailError, OSError):
+            logger.exception(f'Failed to create thumbnail of {source}')
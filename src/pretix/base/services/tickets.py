@@ -23,6 +23,7 @@ import logging
 import os
 from decimal import Decimal
 
+from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.utils.timezone import now
 from django.utils.translation import gettext as _
@@ -41,6 +42,8 @@ from pretix.helpers.database import rolledback_transaction
 
 logger = logging.getLogger(__name__)
 
+PRERENDER_LOCK_TIMEOUT = 600
+
 
 def generate_orderposition(order_position: int, provider: str):
     order_position = OrderPosition.objects.select_related('order', 'order__event').get(id=order_position)
@@ -226,3 +229,47 @@ def invalidate_cache(event: Event, item: int=None, provider: str=None, order: in
         ct.delete()
     for ct in qsc:
         ct.delete()
+
+
+def _prerender_lock_key(order: int):
+    return 'pretix_prerender_tickets_{}'.format(order)
+
+
+def schedule_prerender(event: Event, orders: list):
+    """
+    Queues a single ``prerender_tickets`` task for all given orders that have no ticket files yet and are not already
+    queued for prerendering. Needs to be called after the orders have been committed to the database.
+    """
+    rendered = set(
+        CachedTicket.objects.filter(order_position__order_id__in=orders).values_list(
+            'order_position__order_id', flat=True
+        )
+    )
+    orders = [
+        o for o in orders
+        if o not in rendered and cache.add(_prerender_lock_key(o), True, PRERENDER_LOCK_TIMEOUT)
+    ]
+    if orders:
+        prerender_tickets.apply_async(kwargs={'event': event.pk, 'orders': orders})
+
+
+def prerender_pending(order: Order) -> bool:
+    """
+    Returns whether the tickets of ``order`` are currently queued for prerendering. Rendering the same tickets
+    concurrently replaces the files of the other process, so anyone about to read the tickets of a new order should
+    check this first and come back later.
+    """
+    return bool(cache.get(_prerender_lock_key(order.pk)))
+
+
+@app.task(base=EventTask, acks_late=True)
+def prerender_tickets(event: Event, orders: list):
+    """
+    Generates all missing ticket files of the given orders, such that they are already available once the
+    confirmation email is sent or the customer downloads their tickets.
+    """
+    try:
+        for order in event.orders.filter(pk__in=orders).select_related('event'):
+            get_tickets_for_order(order)
+    finally:
+        cache.delete_many([_prerender_lock_key(o) for o in orders])
@@ -36,7 +36,7 @@
 import json
 import operator
 from collections import OrderedDict, UserList
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Any
 
@@ -3513,6 +3513,10 @@ Your {organizer} team"""))  # noqa: W291
         'default': None,
         'type': str
     },
+    'ledger_closed_until': {
+        'default': None,
+        'type': date
+    },
     'banner_message': {
         'default': '',
         'type': LazyI18nString
@@ -4129,6 +4133,42 @@ class SettingsSandbox:
         self._event.settings.set(self._convert_key(key), value)
 
 
+class SettingsSnapshot:
+    """
+    Read-only view of the settings of an event or organizer that resolves and deserializes every setting only on
+    first access and then serves it from a plain dictionary. Use this in code that reads the same settings many
+    times, e.g. once per product in a loop.
+
+    Changes to the settings made after a value has been read are not reflected, so a snapshot should only be kept
+    for a short time, e.g. during one request. Returned values are shared between all reads and must not be modified.
+
+    :param obj: The event or organizer that should be queried
+    """
+
+    def __init__(self, obj: Model):
+        self._settings = obj.settings
+        self._values = {}
+
+    def __getattr__(self, key: str) -> Any:
+        if key.startswith('_'):
+            return super().__getattribute__(key)
+        return self.get(key)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.get(key)
+
+    def get(self, key: str, default: Any = None, as_type: type = None):
+        if default is not None:
+            return self._settings.get(key, default=default, as_type=as_type)
+        try:
+            return self._values[key, as_type]
+        except KeyError:
+            value = self._settings.get(key, as_type=as_type)
+            if not isinstance(value, File):  # opened file handles must not be shared
+                self._values[key, as_type] = value
+            return value
+
+
 def validate_event_settings(event, settings_dict):
     from pretix.base.models import Event
     from pretix.base.signals import validate_event_settings
@@ -32,13 +32,16 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations under the License.
 
+import time
 from datetime import timedelta
 from decimal import Decimal
+from functools import wraps
 from zoneinfo import ZoneInfo
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.humanize.templatetags.humanize import intcomma
+from django.core.cache import cache
 from django.db.models import (
     Count, IntegerField, Max, Min, OuterRef, Prefetch, Q, Subquery, Sum,
 )
@@ -51,15 +54,20 @@ from django.urls import reverse
 from django.utils.formats import date_format
 from django.utils.html import escape
 from django.utils.timezone import now
-from django.utils.translation import gettext_lazy as _, ngettext, pgettext
+from django.utils.translation import (
+    get_language, gettext_lazy as _, ngettext, pgettext,
+)
 
 from pretix.base.decimal import round_decimal
+from pretix.base.i18n import language
 from pretix.base.models import (
     Item, ItemCategory, ItemVariation, Order, OrderPosition, OrderRefund,
     Question, Quota, SubEvent, Voucher, WaitingListEntry,
 )
 from pretix.base.services.quotas import QuotaAvailability
+from pretix.base.services.tasks import EventTask
 from pretix.base.timeline import timeline_for_event
+from pretix.celery_app import app
 from pretix.control.signals import (
     event_dashboard_widgets, user_dashboard_widgets,
 )
@@ -72,8 +80,75 @@ from ..logdisplay import OVERVIEW_BANLIST
 
 NUM_WIDGET = '<div class="numwidget"><span class="num">{num}</span><span class="text">{text}</span></div>'
 
+# Widget contents younger than this are shown without recomputing them
+DASHBOARD_WIDGET_TTL = 30
+# Widgets that took longer than this to compute are served from a stale cache entry (if one is younger than
+# DASHBOARD_WIDGET_STALE_TTL) while they are recomputed in the background
+DASHBOARD_WIDGET_TIME_BUDGET = 0.5
+DASHBOARD_WIDGET_STALE_TTL = 600
+USER_DASHBOARD_TTL = 60
+
+_cached_widgets = {}
+
+
+def _widget_cache_key(func, subevent):
+    return 'dashboard_widget:{}:{}:{}'.format(func.__name__, subevent.pk if subevent else 'all', get_language())
+
+
+def _compute_widget(func, sender, subevent, **kwargs):
+    t0 = time.monotonic()
+    widgets = func(sender, subevent=subevent, lazy=False, **kwargs)
+    sender.cache.set(
+        _widget_cache_key(func, subevent),
+        (time.time(), time.monotonic() - t0, widgets),
+        DASHBOARD_WIDGET_STALE_TTL
+    )
+    return widgets
+
+
+def cached_widget(func):
+    """
+    Caches the content of the widgets returned by an ``event_dashboard_widgets`` receiver for every event, subevent
+    and language. Expired contents of widgets that exceeded ``DASHBOARD_WIDGET_TIME_BUDGET`` are still shown while
+    they are recomputed in the background, so that a single slow widget does not delay the whole dashboard.
+    """
+    _cached_widgets[func.__name__] = func
+
+    @wraps(func)
+    def wrapper(sender, subevent=None, lazy=False, **kwargs):
+        if lazy:
+            return func(sender, subevent=subevent, lazy=True, **kwargs)
+
+        cached = sender.cache.get(_widget_cache_key(func, subevent))
+        if cached:
+            computed, duration, widgets = cached
+            if time.time() - computed < DASHBOARD_WIDGET_TTL:
+                return widgets
+            if duration > DASHBOARD_WIDGET_TIME_BUDGET:
+                lock_key = 'dashboard_widget_refresh:{}:{}'.format(sender.pk, _widget_cache_key(func, subevent))
+                if cache.add(lock_key, True, DASHBOARD_WIDGET_TTL):
+                    refresh_dashboard_widget.apply_async(kwargs={
+                        'event': sender.pk,
+                        'widget': func.__name__,
+                        'subevent': subevent.pk if subevent else None,
+                        'locale': get_language(),
+                    })
+                return widgets
+
+        return _compute_widget(func, sender, subevent, **kwargs)
+
+    return wrapper
+
+
+@app.task(base=EventTask)
+def refresh_dashboard_widget(event, widget: str, subevent: int = None, locale: str = None):
+    subevent = event.subevents.get(pk=subevent) if subevent else None
+    with language(locale):
+        _compute_widget(_cached_widgets[widget], event, subevent)
+
 
 @receiver(signal=event_dashboard_widgets)
+@cached_widget
 def base_widgets(sender, subevent=None, lazy=False, **kwargs):
     if not lazy:
         prodc = Item.objects.filter(
@@ -88,15 +163,15 @@ def base_widgets(sender, subevent=None, lazy=False, **kwargs):
         else:
             opqs = OrderPosition.objects
 
-        tickc = opqs.filter(
+        attendees = opqs.filter(
             order__event=sender, item__admission=True,
             order__status__in=(Order.STATUS_PAID, Order.STATUS_PENDING),
-        ).count()
-
-        paidc = opqs.filter(
-            order__event=sender, item__admission=True,
-            order__status=Order.STATUS_PAID,
-        ).count()
+        ).aggregate(
+            tickc=Count('id'),
+            paidc=Count('id', filter=Q(order__status=Order.STATUS_PAID)),
+        )
+        tickc = attendees['tickc']
+        paidc = attendees['paidc']
 
         if subevent:
             rev = opqs.filter(
@@ -158,6 +233,7 @@ def base_widgets(sender, subevent=None, lazy=False, **kwargs):
 
 
 @receiver(signal=event_dashboard_widgets)
+@cached_widget
 def waitinglist_widgets(sender, subevent=None, lazy=False, **kwargs):
     widgets = []
 
@@ -234,12 +310,13 @@ def waitinglist_widgets(sender, subevent=None, lazy=False, **kwargs):
 
 
 @receiver(signal=event_dashboard_widgets)
+@cached_widget
 def quota_widgets(sender, subevent=None, lazy=False, **kwargs):
     widgets = []
     quotas = sender.quotas.filter(subevent=subevent)
 
     qa = QuotaAvailability()
-    if quotas:
+    if quotas and not lazy:
         qa.queue(*quotas)
         qa.compute(allow_cache=True)
 
@@ -294,6 +371,7 @@ def shop_state_widget(sender, **kwargs):
 
 
 @receiver(signal=event_dashboard_widgets)
+@cached_widget
 def checkin_widget(sender, subevent=None, lazy=False, **kwargs):
     widgets = []
     qs = sender.checkin_lists.filter(subevent=subevent)
@@ -598,6 +676,20 @@ def widgets_for_event_qs(request, qs, user, nmax, lazy=False):
 
 
 def user_index_widgets_lazy(request):
+    cache_key = 'user_dashboard:{}:{}:{}:{}'.format(
+        request.user.pk,
+        request.user.has_active_staff_session(request.session.session_key),
+        get_language(),
+        request.timezone,
+    )
+    widgets = cache.get(cache_key)
+    if widgets is None:
+        widgets = _user_index_widgets(request)
+        cache.set(cache_key, widgets, USER_DASHBOARD_TTL)
+    return JsonResponse({'widgets': widgets})
+
+
+def _user_index_widgets(request):
     widgets = []
     widgets += widgets_for_event_qs(
         request,
@@ -631,7 +723,7 @@ def user_index_widgets_lazy(request):
         request.user,
         8
     )
-    return JsonResponse({'widgets': widgets})
+    return widgets
 
 
 def user_index(request):
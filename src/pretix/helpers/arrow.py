@@ -0,0 +1,235 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+"""
+This module writes the rows generated by list exporters into typed, columnar files in the Apache Parquet or
+Apache Arrow IPC format.
+
+List exporters produce rows of loosely typed Python values, e.g. dates are usually pre-formatted strings and empty
+values are often represented as ``""``. Since columnar files have a fixed schema that needs to be known before the
+first row group is written, rows are first spooled to a temporary file while the type of every column is inferred
+from all of its values. Columns with values of incompatible types are written as text, so no value is ever lost or
+rounded.
+"""
+import datetime
+import pickle
+import re
+import tempfile
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+DATETIME_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2})?$')
+TIME_RE = re.compile(r'^\d{2}:\d{2}:\d{2}$')
+
+DECIMAL_MAX_PRECISION = 38
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _is_empty(val):
+    return val is None or val == ''
+
+
+def _normalize(val):
+    if val is None or isinstance(val, (bool, int, float, Decimal, str, datetime.date, datetime.time)):
+        return val
+    return str(val)
+
+
+def _kind(val):
+    if isinstance(val, bool):
+        return 'bool'
+    if isinstance(val, int):
+        return 'int' if INT64_MIN <= val <= INT64_MAX else 'decimal'
+    if isinstance(val, float):
+        return 'float'
+    if isinstance(val, Decimal):
+        return 'decimal' if val.is_finite() else 'str'
+    if isinstance(val, datetime.datetime):
+        return 'datetime' if val.tzinfo else 'naive_datetime'
+    if isinstance(val, datetime.date):
+        return 'date'
+    if isinstance(val, datetime.time):
+        return 'time'
+    if DATE_RE.match(val):
+        return 'date'
+    if DATETIME_RE.match(val):
+        return 'naive_datetime'
+    if TIME_RE.match(val):
+        return 'time'
+    return 'str'
+
+
+class _ColumnType:
+    """
+    Collects the kinds of values seen in a column and the number of digits needed to store its decimals.
+    """
+
+    def __init__(self):
+        self.kinds = set()
+        self.int_digits = 1
+        self.scale = 2
+
+    def add(self, val):
+        if _is_empty(val):
+            return
+        kind = _kind(val)
+        self.kinds.add(kind)
+        if kind in ('int', 'decimal'):
+            sign, digits, exponent = Decimal(val).as_tuple()
+            self.scale = max(self.scale, -exponent)
+            self.int_digits = max(self.int_digits, len(digits) + exponent)
+
+    @property
+    def arrow_type(self):
+        kinds = self.kinds
+        if not kinds or 'str' in kinds:
+            return pa.string()
+        if kinds == {'bool'}:
+            return pa.bool_()
+        if kinds == {'int'}:
+            return pa.int64()
+        if kinds <= {'int', 'decimal'}:
+            if self.int_digits + self.scale > DECIMAL_MAX_PRECISION:
+                return pa.string()
+            return pa.decimal128(DECIMAL_MAX_PRECISION, self.scale)
+        if kinds <= {'int', 'float'}:
+            return pa.float64()
+        if kinds == {'datetime'}:
+            return pa.timestamp('us', tz='UTC')
+        if kinds == {'naive_datetime'}:
+            return pa.timestamp('us')
+        if kinds == {'date'}:
+            return pa.date32()
+        if kinds == {'time'}:
+            return pa.time64('us')
+        return pa.string()
+
+
+def _convert(val, typ):
+    """
+    Converts a value to the given type. Since the type has been inferred from all values of the column, every
+    non-empty value fits and a failing conversion raises instead of silently dropping the value.
+    """
+    if val is None:
+        return None
+    if pa.types.is_string(typ):
+        if isinstance(val, (datetime.date, datetime.time)):
+            return val.isoformat()
+        return str(val)
+    if _is_empty(val):
+        return None
+    if pa.types.is_decimal(typ):
+        return Decimal(val)
+    if pa.types.is_floating(typ):
+        return float(val)
+    if isinstance(val, str):
+        if pa.types.is_timestamp(typ):
+            return datetime.datetime.fromisoformat(val)
+        if pa.types.is_date(typ):
+            return datetime.date.fromisoformat(val)
+        if pa.types.is_time(typ):
+            return datetime.time.fromisoformat(val)
+    if pa.types.is_timestamp(typ) and typ.tz:
+        return val.astimezone(datetime.timezone.utc)
+    return val
+
+
+def _unique_names(headers):
+    seen = {}
+    names = []
+    for h in headers:
+        name = str(h)
+        if name in seen:
+            seen[name] += 1
+            name = f'{name} ({seen[name]})'
+        else:
+            seen[name] = 1
+        names.append(name)
+    return names
+
+
+class ColumnarWriter:
+    """
+    Writes rows to ``output_file`` in groups of ``row_group_size`` rows. Call ``append`` for every row (the first
+    row is expected to contain the column headers) and ``close`` once all rows have been written. Rows are kept in a
+    temporary file until ``close`` is called, so memory usage does not grow with the size of the export.
+    """
+
+    def __init__(self, output_file, file_format='parquet', row_group_size=50_000):
+        self.output_file = output_file
+        self.file_format = file_format
+        self.row_group_size = row_group_size
+        self.names = None
+        self.columns = None
+        self.spool = tempfile.TemporaryFile()
+        self.row_count = 0
+
+    def append(self, row):
+        if self.names is None:
+            self.names = _unique_names(row)
+            self.columns = [_ColumnType() for n in self.names]
+            return
+        row = [_normalize(v) for v in list(row)[:len(self.names)]]
+        row += [None] * (len(self.names) - len(row))
+        for col, val in zip(self.columns, row):
+            col.add(val)
+        pickle.dump(row, self.spool, protocol=pickle.HIGHEST_PROTOCOL)
+        self.row_count += 1
+
+    def _rows(self):
+        self.spool.seek(0)
+        for i in range(self.row_count):
+            yield pickle.load(self.spool)
+
+    def _write_row_group(self, writer, schema, rows):
+        arrays = [
+            pa.array([_convert(row[i], field.type) for row in rows], type=field.type)
+            for i, field in enumerate(schema)
+        ]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+    def close(self):
+        if self.names is None:
+            self.names = []
+            self.columns = []
+        schema = pa.schema([
+            pa.field(name, col.arrow_type) for name, col in zip(self.names, self.columns)
+        ])
+        if self.file_format == 'parquet':
+            writer = pq.ParquetWriter(self.output_file, schema)
+        else:
+            writer = pa.ipc.new_file(self.output_file, schema)
+
+        try:
+            buffer = []
+            for row in self._rows():
+                buffer.append(row)
+                if len(buffer) >= self.row_group_size:
+                    self._write_row_group(writer, schema, buffer)
+                    buffer = []
+            if buffer or not self.row_count:
+                self._write_row_group(writer, schema, buffer)
+        finally:
+            writer.close()
+            self.spool.close()
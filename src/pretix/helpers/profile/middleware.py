@@ -39,6 +39,8 @@ import time
 
 from django.conf import settings
 
+from pretix.helpers.profile.sampling import StackSampler
+
 
 class CProfileMiddleware(object):
     banlist = (
@@ -70,3 +72,25 @@ class CProfileMiddleware(object):
             return response
         else:
             return self.get_response(request)
+
+
+class SamplingProfilerMiddleware(CProfileMiddleware):
+    """
+    Records stack samples of a random subset of requests, aggregated by URL name. See
+    ``pretix.helpers.profile.sampling``.
+    """
+
+    def __call__(self, request):
+        for b in self.banlist:
+            if b in request.path:
+                return self.get_response(request)
+
+        if settings.PROFILING_RATE > 0 and random.random() < settings.PROFILING_RATE / 100:
+            with StackSampler('unresolved') as sampler:
+                response = self.get_response(request)
+                match = getattr(request, 'resolver_match', None)
+                if match:
+                    sampler.name = match.view_name
+            return response
+        else:
+            return self.get_response(request)
@@ -0,0 +1,120 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+import logging
+import random
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_string_literal = re.compile(r"'(?:[^']|'')*'")
+_number_literal = re.compile(r"(?<![\w\"`.])-?\b\d+(?:\.\d+)?\b")
+_placeholder_list = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_whitespace = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """
+    Normalizes a SQL query such that queries that only differ in their parameters result in the same string, e.g.
+    ``SELECT … WHERE id = 3`` and ``SELECT … WHERE id = 4`` or ``… id IN (1, 2)`` and ``… id IN (5)``.
+    """
+    sql = _string_literal.sub('?', sql)
+    sql = _number_literal.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _placeholder_list.sub('(...)', sql)
+    return _whitespace.sub(' ', sql).strip()
+
+
+class QueryFingerprintCounter:
+    """
+    Counts the queries executed on all database connections while it is active, grouped by their fingerprint.
+    Works without ``DEBUG`` since it is based on database execute wrappers.
+    """
+
+    def __init__(self):
+        self.fingerprints = Counter()
+        self._contexts = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.fingerprints[fingerprint(sql)] += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        for conn in connections.all():
+            ctx = conn.execute_wrapper(self)
+            ctx.__enter__()
+            self._contexts.append(ctx)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        while self._contexts:
+            self._contexts.pop().__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def total(self):
+        return sum(self.fingerprints.values())
+
+    def repeated(self, threshold=1):
+        """
+        Returns a list of ``(fingerprint, count)`` tuples of all queries executed more than ``threshold`` times,
+        most frequent first.
+        """
+        return [(fp, c) for fp, c in self.fingerprints.most_common() if c > threshold]
+
+
+class QuerySamplingMiddleware:
+    """
+    Counts the database queries of a sample of requests and logs a warning for requests that execute the same query
+    more often than ``QUERY_REPEAT_THRESHOLD`` times, which is usually a sign of an N+1 query problem.
+    """
+    banlist = (
+        '/healthcheck/',
+        '/jsi18n/'
+    )
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        for b in self.banlist:
+            if b in request.path:
+                return self.get_response(request)
+
+        if settings.QUERY_SAMPLING_RATE > 0 and random.random() < settings.QUERY_SAMPLING_RATE / 100:
+            with QueryFingerprintCounter() as counter:
+                response = self.get_response(request)
+            repeated = counter.repeated(settings.QUERY_REPEAT_THRESHOLD)
+            if repeated:
+                match = getattr(request, 'resolver_match', None)
+                logger.warning(
+                    'Request to %s (%s) executed %d queries, including repeated queries:\n%s',
+                    request.path,
+                    match.view_name if match else '-',
+                    counter.total,
+                    '\n'.join('%dx %s' % (c, fp) for fp, c in repeated[:5]),
+                )
+            return response
+        else:
+            return self.get_response(request)
@@ -0,0 +1,146 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+"""
+This module implements a statistical profiler with a low overhead. While a request or task is profiled, a background
+thread records the call stack of the profiled thread at a fixed interval. Stacks are aggregated per URL name or task
+name in memory and regularly written to ``PROFILE_DIR`` in the "collapsed stack" format understood by common
+flamegraph tools. Writing happens in a separate thread to keep it out of the profiled requests. The
+``profile_flamegraph`` management command merges all samples found in the directory, so collecting the files of
+multiple nodes in one place allows to look at the whole installation.
+"""
+import atexit
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = 0.005
+FLUSH_INTERVAL = 60
+
+_stacks = defaultdict(Counter)
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+@lru_cache(maxsize=4096)
+def _short_filename(filename):
+    prefixes = sorted((p for p in sys.path if p and filename.startswith(p)), key=len, reverse=True)
+    if prefixes:
+        return filename[len(prefixes[0]):].lstrip(os.sep)
+    return filename
+
+
+def collapse_stack(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append('{} ({}:{})'.format(code.co_name, _short_filename(code.co_filename), code.co_firstlineno))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def storage_name(name):
+    return ''.join(c if c.isalnum() or c in '._-' else '_' for c in name)
+
+
+class StackSampler:
+    """
+    Context manager that samples the call stack of the current thread. The samples are recorded under ``name``,
+    which can be changed while the sampler is active, e.g. once the URL of a request has been resolved.
+    """
+
+    def __init__(self, name, interval=SAMPLE_INTERVAL):
+        self.name = name
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        record(self.name, self.stacks)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+
+def profile_dir(name=None):
+    if name:
+        return os.path.join(settings.PROFILE_DIR, 'sampling', storage_name(name))
+    return os.path.join(settings.PROFILE_DIR, 'sampling')
+
+
+def record(name, stacks):
+    global _last_flush
+    with _lock:
+        _stacks[name].update(stacks)
+        if time.monotonic() - _last_flush <= FLUSH_INTERVAL:
+            return
+        _last_flush = time.monotonic()
+        pending = _take()
+    threading.Thread(target=_write, args=(pending,), daemon=True).start()
+
+
+def flush():
+    with _lock:
+        pending = _take()
+    _write(pending)
+
+
+def _take():
+    pending = {name: stacks for name, stacks in _stacks.items() if stacks}
+    _stacks.clear()
+    return pending
+
+
+def _write(pending):
+    for name, stacks in pending.items():
+        try:
+            directory = profile_dir(name)
+            os.makedirs(directory, exist_ok=True)
+            filename = os.path.join(directory, '{time:.0f}_{host}_{pid}.collapsed'.format(
+                time=time.time(), host=socket.gethostname(), pid=os.getpid(),
+            ))
+            with open(filename, 'a') as f:
+                f.writelines('{} {}\n'.format(stack, count) for stack, count in stacks.items())
+        except OSError:
+            logger.exception('Could not write stack samples of %s', name)
+
+
+atexit.register(flush)
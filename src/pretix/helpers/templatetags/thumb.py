@@ -19,30 +19,42 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
+import hashlib
 import logging
 
 from django import template
+from django.core.cache import cache
 from django.core.files.storage import default_storage
 
-from pretix import settings
-from pretix.helpers.thumb import get_thumbnail
+from pretix.helpers.thumb import lookup_thumbnail
 
 register = template.Library()
 logger = logging.getLogger(__name__)
 
 
+def _source_url(source):
+    # HACK: source.url works for some types of files (e.g. FieldFile), and for all files retrieved from Hierarkey,
+    # default_storage.url works for all files in NanoCDNStorage. For others, this may return an invalid URL.
+    # But for a fallback, this can probably be accepted.
+    return source.url if hasattr(source, 'url') else default_storage.url(str(source))
+
+
 @register.filter
 def thumb(source, arg):
+    from pretix.base.services.thumbnails import create_thumbnails
+
     try:
-        formats = list(set().union(
-            settings.PILLOW_FORMATS_IMAGE,
-            settings.PILLOW_FORMATS_QUESTIONS_FAVICON,
-            settings.PILLOW_FORMATS_QUESTIONS_IMAGE
-        ))
-        return get_thumbnail(source, arg, formats=formats).thumb.url
+        t = lookup_thumbnail(source, arg)
+        if t is None:
+            # Images are never processed while rendering a page. If a worker is available, we show the original
+            # image until the thumbnail has been created in the background.
+            key = 'thumbnail_pending:' + hashlib.sha1(f'{source}|{arg}'.encode()).hexdigest()
+            if cache.add(key, True, 120):
+                create_thumbnails.apply_async(args=(str(source), [arg]))
+                t = lookup_thumbnail(source, arg)
+        if t is None:
+            return _source_url(source)
+        return t.thumb.url
     except:
         logger.exception(f'Failed to create thumbnail of {source}')
-        # HACK: source.url works for some types of files (e.g. FieldFile), and for all files retrieved from Hierarkey,
-        # default_storage.url works for all files in NanoCDNStorage. For others, this may return an invalid URL.
-        # But for a fallback, this can probably be accepted.
-        return source.url if hasattr(source, 'url') else default_storage.url(str(source))
+        return _source_url(source)
@@ -32,6 +32,10 @@ from PIL.Image import Resampling
 
 from pretix.helpers.models import Thumbnail
 
+# Thumbnails already known to exist, mapping (source, size) to Thumbnail instances
+_local_thumbnails = {}
+LOCAL_THUMBNAILS_MAX_SIZE = 10_000
+
 
 class ThumbnailError(Exception):
     pass
@@ -223,10 +227,39 @@ def create_thumbnail(source, size, formats=None):
     return t
 
 
+def thumbnail_formats():
+    return list(set().union(
+        settings.PILLOW_FORMATS_IMAGE,
+        settings.PILLOW_FORMATS_QUESTIONS_FAVICON,
+        settings.PILLOW_FORMATS_QUESTIONS_IMAGE
+    ))
+
+
+def _remember_thumbnail(key, thumbnail):
+    if len(_local_thumbnails) >= LOCAL_THUMBNAILS_MAX_SIZE:
+        _local_thumbnails.clear()
+    _local_thumbnails[key] = thumbnail
+
+
+def lookup_thumbnail(source, size):
+    """
+    Returns the thumbnail of ``source`` in the given ``size`` if it has already been created, or ``None`` otherwise.
+    This never processes any image. Since source files are immutable, we keep found thumbnails in memory for the
+    lifetime of the process.
+    """
+    key = (str(source), size)
+    if key in _local_thumbnails:
+        return _local_thumbnails[key]
+    t = Thumbnail.objects.filter(source=key[0], size=size).first()
+    if t:
+        _remember_thumbnail(key, t)
+    return t
+
+
 def get_thumbnail(source, size, formats=None):
     # Assumes files are immutable
-    try:
-        source_name = str(source)
-        return Thumbnail.objects.get(source=source_name, size=size)
-    except Thumbnail.DoesNotExist:
-        return create_thumbnail(source, size, formats=formats)
+    t = lookup_thumbnail(source, size)
+    if t is None:
+        t = create_thumbnail(source, size, formats=formats)
+        _remember_thumbnail((str(source), size), t)
+    return t
@@ -42,7 +42,6 @@ from django.conf import settings
 from django.contrib.sessions.middleware import (
     SessionMiddleware as BaseSessionMiddleware,
 )
-from django.core.cache import cache
 from django.core.exceptions import DisallowedHost, ImproperlyConfigured
 from django.http.request import split_domain_port
 from django.middleware.csrf import (
@@ -88,46 +87,24 @@ class MultiDomainMiddleware(MiddlewareMixin):
             request.domain_mode = "system"
             request.urlconf = "pretix.multidomain.maindomain_urlconf"
         elif domain:
-            cached = cache.get('pretix_multidomain_instances_{}'.format(domain))
-
-            if cached is None:
-                try:
-                    kd = KnownDomain.objects.select_related('organizer', 'event').get(domainname=domain)  # noqa
-                    orga = kd.organizer
-                    event = kd.event
-                    mode = kd.mode
-                except KnownDomain.DoesNotExist:
-                    orga = False
-                    event = False
-                    mode = "system"
-                cache.set(
-                    'pretix_multidomain_instances_{}'.format(domain),
-                    (orga.pk if orga else None, event.pk if event else None, mode),
-                    3600
-                )
-            else:
-                orga, event, mode = cached
+            orga, event, mode = KnownDomain.resolve(domain)
 
             if mode == KnownDomain.MODE_EVENT_DOMAIN:
                 request.event_domain = True
                 request.domain_mode = KnownDomain.MODE_EVENT_DOMAIN
-                if isinstance(event, Event):
-                    request.organizer = orga
-                    request.event = event
-                else:
-                    with scopes_disabled():
-                        request.event = Event.objects.select_related('organizer').get(pk=event)
-                        request.organizer = request.event.organizer
+                with scopes_disabled():
+                    request.event = Event.objects.select_related('organizer').get(pk=event)
+                    request.organizer = request.event.organizer
                 request.urlconf = "pretix.multidomain.event_domain_urlconf"
             elif mode == KnownDomain.MODE_ORG_ALT_DOMAIN:
                 request.organizer_domain = True
                 request.domain_mode = KnownDomain.MODE_ORG_ALT_DOMAIN
-                request.organizer = orga if isinstance(orga, Organizer) else Organizer.objects.get(pk=orga)
+                request.organizer = Organizer.objects.get(pk=orga)
                 request.urlconf = "pretix.multidomain.organizer_alternative_domain_urlconf"
             elif mode == KnownDomain.MODE_ORG_DOMAIN:
                 request.organizer_domain = True
                 request.domain_mode = KnownDomain.MODE_ORG_DOMAIN
-                request.organizer = orga if isinstance(orga, Organizer) else Organizer.objects.get(pk=orga)
+                request.organizer = Organizer.objects.get(pk=orga)
                 request.urlconf = "pretix.multidomain.organizer_domain_urlconf"
             elif settings.DEBUG or domain in LOCAL_HOST_NAMES:
                 request.domain_mode = "system"
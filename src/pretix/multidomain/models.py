@@ -19,6 +19,8 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
+import time
+
 from django.core.cache import cache
 from django.db import models
 from django.db.models import Q
@@ -27,6 +29,14 @@ from django_scopes import scopes_disabled
 
 from pretix.base.models import Event, Organizer
 
+# Process-local copy of the domain resolution cache, maps domain names to ((organizer pk, event pk, mode), expiry
+# timestamp). This saves a cache round-trip on every request to a custom domain. Changes made in a different process
+# therefore only become visible to this process after up to INSTANCES_LOCAL_TTL seconds. Only known domains are kept,
+# since the host name is chosen by the client and arbitrary host names must not grow the memory of the process.
+_local_instances = {}
+INSTANCES_LOCAL_TTL = 10
+INSTANCES_LOCAL_MAX_SIZE = 1_000
+
 
 class KnownDomain(models.Model):
     MODE_ORG_DOMAIN = "organizer"
@@ -80,6 +90,35 @@ class KnownDomain(models.Model):
     def __str__(self):
         return self.domainname
 
+    @classmethod
+    def resolve(cls, domainname):
+        """
+        Returns a tuple of the primary key of the organizer, the primary key of the event and the mode of the
+        given domain. Unknown domains resolve to ``(None, None, "system")``.
+        """
+        instances, expires = _local_instances.get(domainname, (None, 0))
+        if instances is not None and expires > time.monotonic():
+            return instances
+
+        instances = cache.get('pretix_multidomain_instances_{}'.format(domainname))
+        if instances is None:
+            try:
+                kd = cls.objects.get(domainname=domainname)
+                instances = (kd.organizer_id, kd.event_id, kd.mode)
+            except cls.DoesNotExist:
+                instances = (None, None, "system")
+            cache.set('pretix_multidomain_instances_{}'.format(domainname), instances, 3600)
+        if instances[2] != "system":
+            if len(_local_instances) >= INSTANCES_LOCAL_MAX_SIZE:
+                _local_instances.clear()
+            _local_instances[domainname] = (instances, time.monotonic() + INSTANCES_LOCAL_TTL)
+        return instances
+
+    @staticmethod
+    def clear_resolve_cache(domainname):
+        _local_instances.pop(domainname, None)
+        cache.delete('pretix_multidomain_instances_{}'.format(domainname))
+
     @scopes_disabled()
     def save(self, *args, **kwargs):
         if self.event:
@@ -98,7 +137,7 @@ class KnownDomain(models.Model):
             for event in self.organizer.events.all():
                 event.get_cache().clear()
         cache.delete('pretix_multidomain_organizer_{}'.format(self.domainname))
-        cache.delete('pretix_multidomain_instances_{}'.format(self.domainname))
+        self.clear_resolve_cache(self.domainname)
         cache.delete('pretix_multidomain_event_{}'.format(self.domainname))
 
     @scopes_disabled()
@@ -110,7 +149,7 @@ class KnownDomain(models.Model):
             for event in self.organizer.events.all():
                 event.cache.clear()
         cache.delete('pretix_multidomain_organizer_{}'.format(self.domainname))
-        cache.delete('pretix_multidomain_instances_{}'.format(self.domainname))
+        self.clear_resolve_cache(self.domainname)
         cache.delete('pretix_multidomain_event_{}'.format(self.domainname))
         super().delete(*args, **kwargs)
 
@@ -151,12 +190,12 @@ class AlternativeDomainAssignment(models.Model):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         self.event.cache.clear()
-        cache.delete('pretix_multidomain_instances_{}'.format(self.domain_id))
+        KnownDomain.clear_resolve_cache(self.domain_id)
         cache.delete('pretix_multidomain_event_{}'.format(self.domain_id))
 
     @scopes_disabled()
     def delete(self, *args, **kwargs):
         self.event.cache.clear()
-        cache.delete('pretix_multidomain_instances_{}'.format(self.domain_id))
+        KnownDomain.clear_resolve_cache(self.domain_id)
         cache.delete('pretix_multidomain_event_{}'.format(self.domain_id))
         super().delete(*args, **kwargs)
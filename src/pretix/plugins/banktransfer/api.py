@@ -34,7 +34,7 @@ from pretix.base.models import Device
 from pretix.base.models.organizer import TeamAPIToken
 
 from .models import BankImportJob, BankTransaction
-from .tasks import process_banktransfers
+from .tasks import process_banktransfers, stage_rows
 
 
 class BankTransactionSerializer(serializers.ModelSerializer):
@@ -139,9 +139,10 @@ class BankImportJobViewSet(CreateModelMixin, viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         job = self.perform_create(serializer)
+        cf = stage_rows(job._data)
         process_banktransfers.apply_async(kwargs={
             'job': job.pk,
-            'data': job._data
+            'file': str(cf.id)
         })
         job.refresh_from_db()
         return Response(self.get_serializer(instance=job).data, status=status.HTTP_201_CREATED)
@@ -23,49 +23,73 @@ from django.utils.translation import gettext_lazy as _
 from lxml import etree
 
 
-def parse(file):
+def _localname(element):
+    return etree.QName(element).localname if element is not None else None
+
+
+def _is_statement(element):
+    return _localname(element) == "Stmt" and _localname(element.getparent()) == "BkToCstmrStmt"
+
+
+def _get_text(findall_result):
+    if len(findall_result) == 1:
+        return findall_result[0].text
+    return ""
+
+
+def _parse_entry(ntry):
+    minus = ""
+    otherparty = "Dbtr"
+    if ntry.findall("{*}CdtDbtInd")[0].text == "DBIT":
+        otherparty = "Cdtr"
+        minus = "-"
+    reference_parts = [
+        _get_text(ntry.findall("{*}NtryDtls/{*}TxDtls/{*}RmtInf/{*}Ustrd")),
+        _get_text(ntry.findall("{*}NtryDtls/{*}TxDtls/{*}Refs/{*}EndToEndId")),
+        _get_text(ntry.findall("{*}NtryDtls/{*}TxDtls/{*}Refs/{*}InstructionIdentification")),
+    ]
+    if ntry.findall("{*}NtryDtls/{*}Btch"):
+        # Batch booking, we do not support splitting yet
+        reference_parts.insert(0, _get_text(ntry.findall("{*}NtryDtls/{*}Btch/{*}PmtInfId")))
+    row = {
+        'amount': minus + ntry.findall("{*}Amt")[0].text,
+        'date': _get_text(ntry.findall("{*}BookgDt/{*}Dt")),
+        'reference': "\n".join(filter(lambda a: bool(a) and a != "NOTPROVIDED", reference_parts))
+    }
+    if ext_id := _get_text(ntry.findall("{*}AcctSvcrRef")):
+        row['external_id'] = ext_id
+    if iban := _get_text(ntry.findall(f"{{*}}NtryDtls/{{*}}TxDtls/{{*}}RltdPties/{{*}}{otherparty}Acct/{{*}}Id/{{*}}IBAN")):
+        row['iban'] = iban
+    if bic := _get_text(ntry.findall(f"{{*}}NtryDtls/{{*}}TxDtls/{{*}}RltdAgts/{{*}}{otherparty}Agt/{{*}}FinInstnId/{{*}}BICFI")):
+        row['bic'] = bic
+    if payer := _get_text(ntry.findall(f"{{*}}NtryDtls/{{*}}TxDtls/{{*}}RltdPties/{{*}}{otherparty}/{{*}}Nm")):
+        row['payer'] = payer
+    return row
+
+
+def iter_rows(file):
+    """
+    Yields the transactions of a CAMT.053 file one by one. The file is parsed incrementally and every entry is
+    discarded from the tree once it has been processed, so memory usage does not depend on the size of the statement.
+    """
     # Spec: https://www.ebics.de/de/datenformate
-    data = file.read()
-    root = etree.fromstring(data)
+    found_statement = False
+    for event, element in etree.iterparse(file, events=("end",), tag=("{*}Stmt", "{*}Ntry"),
+                                          resolve_entities=False, no_network=True):
+        if _localname(element) == "Ntry":
+            if not _is_statement(element.getparent()):
+                continue
+            yield _parse_entry(element)
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        elif _is_statement(element):
+            found_statement = True
+            element.clear()
 
-    statements = root.findall("{*}BkToCstmrStmt/{*}Stmt")
-    if not statements:
+    if not found_statement:
         raise ValueError(_("Empty file or unknown format."))
 
-    def get_text(findall_result):
-        if len(findall_result) == 1:
-            return findall_result[0].text
-        return ""
 
-    rows = []
-    for stmt in statements:
-        for ntry in stmt.findall("{*}Ntry"):
-            minus = ""
-            otherparty = "Dbtr"
-            if ntry.findall("{*}CdtDbtInd")[0].text == "DBIT":
-                otherparty = "Cdtr"
-                minus = "-"
-            reference_parts = [
-                get_text(ntry.findall("{*}NtryDtls/{*}TxDtls/{*}RmtInf/{*}Ustrd")),
-                get_text(ntry.findall("{*}NtryDtls/{*}TxDtls/{*}Refs/{*}EndToEndId")),
-                get_text(ntry.findall("{*}NtryDtls/{*}TxDtls/{*}Refs/{*}InstructionIdentification")),
-            ]
-            if ntry.findall("{*}NtryDtls/{*}Btch"):
-                # Batch booking, we do not support splitting yet
-                reference_parts.insert(0, get_text(ntry.findall("{*}NtryDtls/{*}Btch/{*}PmtInfId")))
-            row = {
-                'amount': minus + ntry.findall("{*}Amt")[0].text,
-                'date': get_text(ntry.findall("{*}BookgDt/{*}Dt")),
-                'reference': "\n".join(filter(lambda a: bool(a) and a != "NOTPROVIDED", reference_parts))
-            }
-            if ext_id := get_text(ntry.findall("{*}AcctSvcrRef")):
-                row['external_id'] = ext_id
-            if iban := get_text(ntry.findall(f"{{*}}NtryDtls/{{*}}TxDtls/{{*}}RltdPties/{{*}}{otherparty}Acct/{{*}}Id/{{*}}IBAN")):
-                row['iban'] = iban
-            if bic := get_text(ntry.findall(f"{{*}}NtryDtls/{{*}}TxDtls/{{*}}RltdAgts/{{*}}{otherparty}Agt/{{*}}FinInstnId/{{*}}BICFI")):
-                row['bic'] = bic
-            if payer := get_text(ntry.findall(f"{{*}}NtryDtls/{{*}}TxDtls/{{*}}RltdPties/{{*}}{otherparty}/{{*}}Nm")):
-                row['payer'] = payer
-            rows.append(row)
-
-    return rows
+def parse(file):
+    return list(iter_rows(file))
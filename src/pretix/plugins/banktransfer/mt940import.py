@@ -164,7 +164,11 @@ def join_reference(reference_list, payer):
     return reference, eref
 
 
-def parse(file):
+def iter_rows(file):
+    """
+    Yields the transactions of a MT940 file one by one. The file itself needs to be read completely since the
+    statement format requires context from earlier lines, but no intermediate list of rows is built.
+    """
     data = file.read()
     try:
         import chardet
@@ -174,7 +178,6 @@ def parse(file):
         charset = file.charset
     data = data.decode(charset or 'utf-8')
     mt = mt940.parse(io.StringIO(data.strip()))
-    result = []
     for t in mt:
         td = t.data.get('transaction_details', '')
         if len(td) >= 4 and td[3] == '?':
@@ -192,13 +195,13 @@ def parse(file):
             if not eref:
                 eref = transaction_details.get('eref', '')
 
-            result.append({
+            yield {
                 'amount': str(round_decimal(t.data['amount'].amount)),
                 'reference': reference + (' EREF: {}'.format(eref) if eref else ''),
                 'payer': payer['name'].strip(),
                 'date': t.data['date'].isoformat(),
                 **{k: payer[k].strip() for k in ("iban", "bic") if payer.get(k)}
-            })
+            }
         else:
             payer = {
                 'payer': t.data.get('applicant_name', ''),
@@ -207,12 +210,15 @@ def parse(file):
                 'iban': t.data.get('applicant_iban', ''),
                 'bic': t.data.get('applicant_bin', ''),
             }
-            result.append({
+            yield {
                 'reference': "\n".join([
                     t.data.get(f) for f in ('transaction_details', 'customer_reference', 'bank_reference', 'purpose',
                                             'extra_details', 'non_swift_text') if t.data.get(f, '')]),
                 'amount': str(round_decimal(t.data['amount'].amount)),
                 'date': t.data['date'].isoformat(),
                 **{k: payer[k].strip() for k in ("iban", "bic", "payer") if payer.get(k)}
-            })
-    return result
+            }
+
+
+def parse(file):
+    return list(iter_rows(file))
@@ -34,14 +34,17 @@
 
 import json
 import logging
-import operator
 import re
+import tempfile
+from collections import defaultdict
+from datetime import timedelta
 from decimal import Decimal
-from functools import reduce
 
 import dateutil.parser
 from celery.exceptions import MaxRetriesExceededError
 from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import transaction
 from django.db.models import Max, Min, Q
 from django.db.models.functions import Length
@@ -52,7 +55,8 @@ from django_scopes import scope, scopes_disabled
 from pretix.base.email import get_email_context
 from pretix.base.i18n import language
 from pretix.base.models import (
-    Event, Invoice, Order, OrderPayment, OrderRefund, Organizer, Quota,
+    CachedFile, Event, Invoice, Order, OrderPayment, OrderRefund, Organizer,
+    Quota,
 )
 from pretix.base.payment import PaymentException
 from pretix.base.services.locking import LockTimeoutException
@@ -101,63 +105,105 @@ def cancel_old_payments(order):
             )
 
 
-def _find_order_for_code(base_qs, code):
-    try_codes = [
+def _code_candidates(code):
+    return [
         code,
         Order.normalize_code(code, is_fallback=True),
         code[:settings.ENTROPY['order_code']],
         Order.normalize_code(code[:settings.ENTROPY['order_code']], is_fallback=True)
     ]
-    for c in try_codes:
-        try:
-            return base_qs.get(code=c)
-        except Order.DoesNotExist:
-            pass
 
 
-def _find_order_for_invoice_id(base_qs, prefixes, number):
-    try:
-        # Working with __iregex here is an experiment, if this turns out to be too slow in production
-        # we might need to switch to a different approach.
-        r = [
-            Q(
-                prefix__istartswith=prefix,  # redundant, but hopefully makes it a little faster
-                full_invoice_no__iregex=prefix + r'[\- ]*0*' + number
-            )
-            for prefix in set(prefixes)
-        ]
-        return base_qs.select_related('order').get(
-            reduce(operator.or_, r)
-        ).order
-    except (Invoice.DoesNotExist, Invoice.MultipleObjectsReturned):
-        pass
+def _normalize_invoice_prefix(prefix):
+    return prefix.rstrip(" -").upper()
 
 
-@transaction.atomic
-def _handle_transaction(trans: BankTransaction, matches: tuple, regex_match_to_slug, event: Event = None, organizer: Organizer = None):
-    orders = []
-    if event:
+def _normalize_invoice_number(number):
+    return number.upper().lstrip("0") or "0"
+
+
+def _invoice_no_candidates(number, max_length):
+    # Invoice numbers are usually zero-padded, but references often lack the padding (or contain too much of it).
+    # Instead of running a regular expression against all invoices, we generate all paddings that could possibly
+    # exist in the database and look them up through the index on invoice_no.
+    n = _normalize_invoice_number(number)
+    return {n.rjust(length, "0") for length in range(len(n), max(max_length, len(n)) + 1)}
+
+
+def _build_order_lookup(matches_list, invoice_no_max_length, event: Event = None, organizer: Organizer = None):
+    """
+    Resolves all order codes and invoice numbers found in a batch of transactions at once. Returns a tuple of two
+    dictionaries: The first one maps ``(event slug, order code)`` to an order ID (the event slug is ``None`` for
+    event-level imports), the second one maps normalized invoice numbers to a list of
+    ``(normalized prefix, order ID)`` tuples.
+    """
+    codes = set()
+    invoice_nos = set()
+    for matches in matches_list:
         for slug, code in matches:
-            order = _find_order_for_code(event.orders, code)
-            if order:
-                if order.code not in {o.code for o in orders}:
-                    orders.append(order)
-            else:
-                order = _find_order_for_invoice_id(Invoice.objects.filter(event=event), (slug, regex_match_to_slug.get(slug, slug)), code)
-                if order and order.code not in {o.code for o in orders}:
-                    orders.append(order)
+            codes.update(_code_candidates(code))
+            invoice_nos.update(_invoice_no_candidates(code, invoice_no_max_length))
+
+    orders = {}
+    if event:
+        order_qs = event.orders.all()
+        invoice_qs = Invoice.objects.filter(event=event)
     else:
-        qs = Order.objects.filter(event__organizer=organizer)
-        for slug, code in matches:
-            original_slug = regex_match_to_slug.get(slug, slug)
-            order = _find_order_for_code(qs.filter(Q(event__slug__iexact=slug) | Q(event__slug__iexact=original_slug)), code)
-            if order:
-                if order.code not in {o.code for o in orders}:
-                    orders.append(order)
-            else:
-                order = _find_order_for_invoice_id(Invoice.objects.filter(event__organizer=organizer), (slug, original_slug), code)
-                if order and order.code not in {o.code for o in orders}:
-                    orders.append(order)
+        order_qs = Order.objects.filter(event__organizer=organizer)
+        invoice_qs = Invoice.objects.filter(organizer=organizer)
+
+    codes = list(codes)
+    for i in range(0, len(codes), 1000):
+        batch = codes[i:i + 1000]
+        for pk, code, event_slug in order_qs.filter(code__in=batch).values_list('pk', 'code', 'event__slug'):
+            orders[(None if event else event_slug.upper(), code)] = pk
+
+    invoices = defaultdict(list)
+    invoice_nos = list(invoice_nos)
+    for i in range(0, len(invoice_nos), 1000):
+        batch = invoice_nos[i:i + 1000]
+        for prefix, invoice_no, order_id in invoice_qs.filter(invoice_no__in=batch).values_list('prefix', 'invoice_no', 'order_id'):
+            invoices[_normalize_invoice_number(invoice_no)].append((_normalize_invoice_prefix(prefix), order_id))
+
+    return orders, invoices
+
+
+def _find_order_for_code(orders, slugs, code):
+    for c in _code_candidates(code):
+        for slug in slugs:
+            if (slug, c) in orders:
+                return orders[slug, c]
+
+
+def _find_order_for_invoice_id(invoices, prefixes, number):
+    prefixes = {_normalize_invoice_prefix(p) for p in prefixes}
+    candidates = {
+        order_id for prefix, order_id in invoices.get(_normalize_invoice_number(number), [])
+        if prefix in prefixes
+    }
+    if len(candidates) == 1:
+        return candidates.pop()
+
+
+@transaction.atomic
+def _handle_transaction(trans: BankTransaction, matches: tuple, regex_match_to_slug, lookup, event: Event = None, organizer: Organizer = None):
+    orders_by_code, invoices_by_number = lookup
+    order_ids = []
+    for slug, code in matches:
+        original_slug = regex_match_to_slug.get(slug, slug)
+        if event:
+            order_id = _find_order_for_code(orders_by_code, (None,), code)
+        else:
+            order_id = _find_order_for_code(orders_by_code, (slug.upper(), original_slug.upper()), code)
+        if not order_id:
+            order_id = _find_order_for_invoice_id(invoices_by_number, (slug, original_slug), code)
+        if order_id and order_id not in order_ids:
+            order_ids.append(order_id)
+
+    # The lookup only tells us which orders are affected, we always load them fresh since previous transactions
+    # of the same import might have changed them.
+    orders_by_id = Order.objects.select_related('event').in_bulk(order_ids)
+    orders = [orders_by_id[pk] for pk in order_ids if pk in orders_by_id]
 
     if not orders:
         # No match
@@ -305,7 +351,35 @@ def parse_date(date_str, region=None):
     return None
 
 
-def _get_unknown_transactions(job: BankImportJob, data: list, event: Event = None, organizer: Organizer = None):
+def stage_rows(rows) -> CachedFile:
+    """
+    Writes parsed transaction rows to a :py:class:`CachedFile`, one JSON document per line. Pass the ID of the
+    returned file to :py:func:`process_banktransfers` instead of the rows themselves to keep the task message small
+    regardless of the size of the bank statement.
+    """
+    with tempfile.TemporaryFile() as f:
+        for row in rows:
+            f.write(json.dumps(row, cls=DjangoJSONEncoder).encode() + b"\n")
+        f.seek(0)
+        cf = CachedFile.objects.create(
+            expires=now() + timedelta(days=2),
+            date=now(),
+            filename='banktransfer_import.jsonl',
+            type='application/jsonl',
+            web_download=False,
+        )
+        cf.file.save('banktransfer_import.jsonl', File(f))
+    return cf
+
+
+def _read_staged_rows(cf: CachedFile):
+    with cf.file.open('rb') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _get_unknown_transactions(job: BankImportJob, data, event: Event = None, organizer: Organizer = None):
     amount_pattern = re.compile("[^0-9.-]")
     known_checksums = set(t['checksum'] for t in BankTransaction.objects.filter(
         Q(event=event) if event else Q(organizer=organizer)
@@ -346,14 +420,13 @@ def _get_unknown_transactions(job: BankImportJob, data: list, event: Event = Non
         trans.checksum = trans.calculate_checksum()
         if trans.checksum not in known_checksums and (not trans.external_id or (trans.external_id, trans.date, trans.amount) not in known_by_external_id):
             trans.state = BankTransaction.STATE_UNCHECKED
-            trans.save()
             transactions.append(trans)
 
-    return transactions
+    return BankTransaction.objects.bulk_create(transactions, batch_size=500)
 
 
 @app.task(base=TransactionAwareTask, bind=True, max_retries=5, default_retry_delay=1)
-def process_banktransfers(self, job: int, data: list) -> None:
+def process_banktransfers(self, job: int, data: list = None, file: str = None) -> None:
     with language("en"):  # We'll translate error messages at display time
         with scopes_disabled():
             job = BankImportJob.objects.get(pk=job)
@@ -365,6 +438,12 @@ def process_banktransfers(self, job: int, data: list) -> None:
                 # Delete left-over transactions from a failed run before so they can reimported
                 BankTransaction.objects.filter(state=BankTransaction.STATE_UNCHECKED, **job.owner_kwargs).delete()
 
+                if file:
+                    cf = CachedFile.objects.get(id=file)
+                    data = _read_staged_rows(cf)
+                else:
+                    cf = None
+
                 transactions = _get_unknown_transactions(job, data, **job.owner_kwargs)
 
                 # Match order codes
@@ -411,11 +490,12 @@ def process_banktransfers(self, job: int, data: list) -> None:
                     )
                 )
 
+                matches_list = []
                 for trans in transactions:
                     if trans.amount == Decimal("0.00"):
                         # Ignore all zero-valued transactions
                         trans.state = BankTransaction.STATE_DISCARDED
-                        trans.save()
+                        matches_list.append(None)
                         continue
                     # Whitespace in references is unreliable since linebreaks and spaces can occur almost anywhere, e.g.
                     # DEMOCON-123\n45 should be matched to DEMOCON-12345. However, sometimes whitespace is important,
@@ -425,18 +505,25 @@ def process_banktransfers(self, job: int, data: list) -> None:
                     matches_without_whitespace = pattern.findall(trans.reference.replace(" ", "").replace("\n", "").upper())
 
                     if len(matches_without_whitespace) > len(matches_with_whitespace):
-                        matches = matches_without_whitespace
+                        matches_list.append(matches_without_whitespace)
                     else:
-                        matches = matches_with_whitespace
+                        matches_list.append(matches_with_whitespace)
+
+                # Resolve all candidate order codes and invoice numbers with a few bulk queries instead of
+                # querying for every single transaction
+                lookup = _build_order_lookup(
+                    [m for m in matches_list if m], inr_len_agg['max'] or 5, **job.owner_kwargs
+                )
 
+                unmatched = []
+                for trans, matches in zip(transactions, matches_list):
                     if matches:
-                        if job.event:
-                            _handle_transaction(trans, matches, regex_match_to_slug, event=job.event)
-                        else:
-                            _handle_transaction(trans, matches, regex_match_to_slug, organizer=job.organizer)
+                        _handle_transaction(trans, matches, regex_match_to_slug, lookup, **job.owner_kwargs)
                     else:
-                        trans.state = BankTransaction.STATE_NOMATCH
-                        trans.save()
+                        if matches is not None:
+                            trans.state = BankTransaction.STATE_NOMATCH
+                        unmatched.append(trans)
+                BankTransaction.objects.bulk_update(unmatched, ['state'], batch_size=500)
             except LockTimeoutException:
                 try:
                     self.retry()
@@ -451,3 +538,5 @@ def process_banktransfers(self, job: int, data: list) -> None:
             else:
                 job.state = BankImportJob.STATE_COMPLETED
                 job.save()
+                if cf:
+                    cf.delete()
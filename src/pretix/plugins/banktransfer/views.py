@@ -73,7 +73,7 @@ from pretix.plugins.banktransfer.payment import BankTransfer
 from pretix.plugins.banktransfer.refund_export import (
     build_sepa_xml, get_refund_export_csv,
 )
-from pretix.plugins.banktransfer.tasks import process_banktransfers
+from pretix.plugins.banktransfer.tasks import process_banktransfers, stage_rows
 
 logger = logging.getLogger('pretix.plugins.banktransfer')
 
@@ -431,7 +431,7 @@ class ImportView(ListView):
 
     def process_camt(self):
         try:
-            return self.start_processing(camtimport.parse(self.request.FILES.get('file')))
+            return self.start_processing(camtimport.iter_rows(self.request.FILES.get('file')))
         except:
             logger.exception('Failed to import CAMT file')
             messages.error(self.request, _('We were unable to process your input.'))
@@ -439,7 +439,7 @@ class ImportView(ListView):
 
     def process_mt940(self):
         try:
-            return self.start_processing(mt940import.parse(self.request.FILES.get('file')))
+            return self.start_processing(mt940import.iter_rows(self.request.FILES.get('file')))
         except:
             logger.exception('Failed to import MT940 file')
             messages.error(self.request, _('We were unable to process your input.'))
@@ -559,21 +559,25 @@ class ImportView(ListView):
             messages.error(self.request,
                            _('An import is currently being processed, please try again in a few minutes.'))
             return self.redirect_back()
+        if 'event' not in self.kwargs and len(self.currencies) != 1:
+            currency = self.request.POST.get("currency")
+            if not currency or currency not in self.currencies:
+                messages.error(self.request,
+                               _('No currency has been selected.'))
+                return self.redirect_back()
+        # Parsed rows are written to a file instead of being passed to the task directly, so large statements do
+        # not end up in the message broker.
+        cf = stage_rows(parsed)
         if 'event' in self.kwargs:
             job = BankImportJob.objects.create(event=self.request.event, organizer=self.request.organizer)
         else:
             if len(self.currencies) != 1:
-                currency = self.request.POST.get("currency")
-                if not currency or currency not in self.currencies:
-                    messages.error(self.request,
-                                   _('No currency has been selected.'))
-                    return self.redirect_back()
-                job = BankImportJob.objects.create(organizer=self.request.organizer, currency=currency)
+                job = BankImportJob.objects.create(organizer=self.request.organizer, currency=self.request.POST.get("currency"))
             else:
                 job = BankImportJob.objects.create(organizer=self.request.organizer, currency=self.currencies[0])
         process_banktransfers.apply_async(kwargs={
             'job': job.pk,
-            'data': parsed
+            'file': str(cf.id)
         })
         kwargs = {
             'organizer': self.request.organizer.slug,
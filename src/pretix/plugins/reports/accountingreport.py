@@ -26,7 +26,7 @@ from collections import OrderedDict, defaultdict
 from decimal import Decimal
 
 from django import forms
-from django.db.models import F, Sum
+from django.db.models import F, Q, Sum
 from django.db.models.functions import Coalesce
 from django.utils.formats import date_format, localize
 from django.utils.html import escape
@@ -41,8 +41,10 @@ from reportlab.platypus import (
 
 from pretix.base.exporter import BaseExporter
 from pretix.base.models import (
-    GiftCardTransaction, OrderFee, OrderPayment, OrderRefund, Transaction,
+    GiftCardLedgerDay, GiftCardTransaction, OrderFee, OrderPayment,
+    OrderRefund, Transaction, TransactionLedgerDay,
 )
+from pretix.base.services.ledger import ledger_boundary
 from pretix.base.templatetags.money import money_filter
 from pretix.base.timeframes import (
     DateFrameField,
@@ -229,6 +231,33 @@ class ReportExporter(ReportlabExportMixin, BaseExporter):
             qs = qs.filter(order__testmode=False)
         return qs
 
+    def _transaction_total_before(self, form_data, currency, df_start):
+        qs = self._transaction_qs(form_data, currency, ignore_dates=True).filter(datetime__lt=df_start)
+        total = Decimal("0.00")
+        boundary = ledger_boundary(df_start)
+        if boundary:
+            # Closed days of non-test orders are read from the ledger, only the remainder is aggregated here
+            total += TransactionLedgerDay.objects.filter(
+                event__in=self.events,
+                event__currency=currency,
+                day__lt=boundary.date(),
+            ).aggregate(s=Sum("total"))["s"] or Decimal("0.00")
+            qs = qs.filter(Q(order__testmode=True) | Q(datetime__gte=boundary))
+        return total + (qs.aggregate(s=Sum(F("count") * F("price")))["s"] or Decimal("0.00"))
+
+    def _giftcard_transaction_total_before(self, form_data, currency, df_start):
+        qs = self._giftcard_transaction_qs(form_data, currency, ignore_dates=True).filter(datetime__lt=df_start)
+        total = Decimal("0.00")
+        boundary = ledger_boundary(df_start)
+        if boundary:
+            total += GiftCardLedgerDay.objects.filter(
+                issuer=self.organizer,
+                currency=currency,
+                day__lt=boundary.date(),
+            ).aggregate(s=Sum("total"))["s"] or Decimal("0.00")
+            qs = qs.filter(Q(card__testmode=True) | Q(datetime__gte=boundary))
+        return total + (qs.aggregate(s=Sum("value"))["s"] or Decimal("0.00"))
+
     def _transaction_qs_group(self, qs, form_data):
         subevent_values = {}
         subevent_order_by = {}
@@ -629,9 +658,7 @@ class ReportExporter(ReportlabExportMixin, BaseExporter):
         tdata = []
 
         if df_start:
-            tx_before = self._transaction_qs(form_data, currency, ignore_dates=True).filter(
-                datetime__lt=df_start
-            ).aggregate(s=Sum(F("count") * F("price")))["s"] or Decimal("0.00")
+            tx_before = self._transaction_total_before(form_data, currency, df_start)
             p_before = self._payment_qs(form_data, currency, ignore_dates=True).filter(
                 payment_date__lt=df_start
             ).aggregate(s=Sum("amount"))["s"] or Decimal("0.00")
@@ -745,11 +772,7 @@ class ReportExporter(ReportlabExportMixin, BaseExporter):
         tdata = []
 
         if df_start:
-            tx_before = self._giftcard_transaction_qs(
-                form_data, currency, ignore_dates=True
-            ).filter(datetime__lt=df_start).aggregate(s=Sum("value"))["s"] or Decimal(
-                "0.00"
-            )
+            tx_before = self._giftcard_transaction_total_before(form_data, currency, df_start)
             tdata.append(
                 [
                     Paragraph(
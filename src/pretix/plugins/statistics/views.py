@@ -38,7 +38,10 @@ from decimal import Decimal
 
 import dateutil.parser
 import dateutil.rrule
-from django.db.models import Count, DateTimeField, Max, Min, OuterRef, Subquery
+from django.db.models import (
+    Count, DateTimeField, Max, Min, OuterRef, Subquery, Sum,
+)
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from django.views.generic import TemplateView
 
@@ -98,17 +101,22 @@ class IndexView(EventPermissionRequiredMixin, ChartContainingView, TemplateView)
             if subevent:
                 oqs = oqs.filter(all_positions__subevent_id=subevent, all_positions__canceled=False).distinct()
 
-            ordered_by_day = {}
-            for o in oqs.filter(event=self.request.event).values('datetime'):
-                day = o['datetime'].astimezone(tz).date()
-                ordered_by_day[day] = ordered_by_day.get(day, 0) + 1
-            paid_by_day = {}
-            for o in oqs.filter(
-                event=self.request.event, payment_date__isnull=False,
-                status=Order.STATUS_PAID, all_positions__canceled=False
-            ).distinct().values('payment_date'):
-                day = o['payment_date'].astimezone(tz).date()
-                paid_by_day[day] = paid_by_day.get(day, 0) + 1
+            # Orders are grouped by day in the database, so we only need to process one row per day
+            ordered_by_day = {
+                o['day']: o['cnt']
+                for o in oqs.filter(event=self.request.event).annotate(
+                    day=TruncDate('datetime', tzinfo=tz)
+                ).values('day').annotate(cnt=Count('id', distinct=True)).order_by()
+            }
+            paid_by_day = {
+                o['day']: o['cnt']
+                for o in oqs.filter(
+                    event=self.request.event, payment_date__isnull=False,
+                    status=Order.STATUS_PAID, all_positions__canceled=False
+                ).annotate(
+                    day=TruncDate('payment_date', tzinfo=tz)
+                ).values('day').annotate(cnt=Count('id', distinct=True)).order_by()
+            }
 
             data = []
             for d in dateutil.rrule.rrule(
@@ -138,15 +146,21 @@ class IndexView(EventPermissionRequiredMixin, ChartContainingView, TemplateView)
             if subevent:
                 opqs = opqs.filter(subevent=subevent)
 
-            ordered_by_day = {}
-            for p in opqs.values('order__datetime'):
-                day = p['order__datetime'].astimezone(tz).date()
-                ordered_by_day[day] = ordered_by_day.get(day, 0) + 1
+            ordered_by_day = {
+                p['day']: p['cnt']
+                for p in opqs.annotate(
+                    day=TruncDate('order__datetime', tzinfo=tz)
+                ).values('day').annotate(cnt=Count('id')).order_by()
+            }
 
-            paid_by_day = {}
-            for p in opqs.filter(payment_date__isnull=False, canceled=False, order__status=Order.STATUS_PAID).values('payment_date'):
-                day = p['payment_date'].astimezone(tz).date()
-                paid_by_day[day] = paid_by_day.get(day, 0) + 1
+            paid_by_day = {
+                p['day']: p['cnt']
+                for p in opqs.filter(
+                    payment_date__isnull=False, canceled=False, order__status=Order.STATUS_PAID
+                ).annotate(
+                    day=TruncDate('payment_date', tzinfo=tz)
+                ).values('day').annotate(cnt=Count('id')).order_by()
+            }
 
             day_data = []
             time_data = []
@@ -210,24 +224,27 @@ class IndexView(EventPermissionRequiredMixin, ChartContainingView, TemplateView)
 
         ctx['rev_data'] = cache.get('statistics_rev_data' + ckey)
         if not ctx['rev_data']:
-            rev_by_day = {}
             if subevent:
-                for o in OrderPosition.objects.annotate(
-                        payment_date=Subquery(op_date, output_field=DateTimeField())
+                rqs = OrderPosition.objects.annotate(
+                    payment_date=Subquery(op_date, output_field=DateTimeField())
                 ).filter(order__event=self.request.event,
                          subevent=subevent,
                          order__status=Order.STATUS_PAID,
-                         payment_date__isnull=False).values('payment_date', 'price'):
-                    day = o['payment_date'].astimezone(tz).date()
-                    rev_by_day[day] = rev_by_day.get(day, 0) + o['price']
+                         payment_date__isnull=False)
             else:
-                for o in Order.objects.annotate(
-                        payment_date=Subquery(p_date, output_field=DateTimeField())
+                rqs = Order.objects.annotate(
+                    payment_date=Subquery(p_date, output_field=DateTimeField())
                 ).filter(event=self.request.event,
                          status=Order.STATUS_PAID,
-                         payment_date__isnull=False).values('payment_date', 'total'):
-                    day = o['payment_date'].astimezone(tz).date()
-                    rev_by_day[day] = rev_by_day.get(day, 0) + o['total']
+                         payment_date__isnull=False)
+            rev_by_day = {
+                o['day']: o['revenue']
+                for o in rqs.annotate(
+                    day=TruncDate('payment_date', tzinfo=tz)
+                ).values('day').annotate(
+                    revenue=Sum('price' if subevent else 'total')
+                ).order_by()
+            }
 
             data = []
             total = 0
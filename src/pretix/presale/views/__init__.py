@@ -126,6 +126,11 @@ class CartMixin:
             prefetch = []
             if answers:
                 prefetch.append('item__questions')
+                prefetch.append(Prefetch(
+                    'item__questions',
+                    Question.objects.filter(ask_during_checkin=False, hidden=False),
+                    to_attr='questions_to_ask'
+                ))
                 prefetch.append(Prefetch('answers', queryset=QuestionAnswer.objects.prefetch_related('options')))
 
             cartpos = queryset.order_by(
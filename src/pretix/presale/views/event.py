@@ -74,6 +74,7 @@ from pretix.base.models.items import (
 )
 from pretix.base.services.placeholders import PlaceholderContext
 from pretix.base.services.quotas import QuotaAvailability
+from pretix.base.settings import SettingsSnapshot
 from pretix.base.timemachine import time_machine_now
 from pretix.helpers.compat import date_fromisocalendar
 from pretix.helpers.formats.en.formats import (
@@ -117,6 +118,7 @@ def get_grouped_items(event, *, channel: SalesChannel, subevent=None, voucher=No
                       ignore_hide_sold_out_for_item_ids=None):
     base_qs_set = base_qs is not None
     base_qs = base_qs if base_qs is not None else event.items
+    event_settings = SettingsSnapshot(event)  # settings are read for every item below
 
     requires_seat = Exists(
         SeatCategoryMapping.objects.filter(
@@ -124,7 +126,7 @@ def get_grouped_items(event, *, channel: SalesChannel, subevent=None, voucher=No
             subevent=subevent
         )
     )
-    if not event.settings.seating_choice:
+    if not event_settings.seating_choice:
         requires_seat = Value(0, output_field=IntegerField())
 
     variation_q = (
@@ -293,7 +295,7 @@ def get_grouped_items(event, *, channel: SalesChannel, subevent=None, voucher=No
         if channel.type_instance.unlimited_items_per_order:
             max_per_order = sys.maxsize
         else:
-            max_per_order = item.max_per_order or int(event.settings.max_items_per_order)
+            max_per_order = item.max_per_order or int(event_settings.max_items_per_order)
         if voucher:
             max_per_order = min(max_per_order, voucher.max_usages - voucher.redeemed)
 
@@ -346,7 +348,7 @@ def get_grouped_items(event, *, channel: SalesChannel, subevent=None, voucher=No
 
             if not (
                     ignore_hide_sold_out_for_item_ids and item.pk in ignore_hide_sold_out_for_item_ids
-            ) and event.settings.hide_sold_out and item.cached_availability[0] < Quota.AVAILABILITY_RESERVED:
+            ) and event_settings.hide_sold_out and item.cached_availability[0] < Quota.AVAILABILITY_RESERVED:
                 item._remove = True
                 continue
 
@@ -377,7 +379,7 @@ def get_grouped_items(event, *, channel: SalesChannel, subevent=None, voucher=No
             else:
                 item.original_price = (
                     item.tax(item.original_price, currency=event.currency, include_bundled=True,
-                             base_price_is='net' if event.settings.display_net_prices else 'gross')  # backwards-compat
+                             base_price_is='net' if event_settings.display_net_prices else 'gross')  # backwards-compat
                     if item.original_price else None
                 )
             if not display_add_to_cart:
@@ -436,14 +438,14 @@ def get_grouped_items(event, *, channel: SalesChannel, subevent=None, voucher=No
                     var.original_price = (
                         var.tax(var.original_price or item.original_price, currency=event.currency,
                                 include_bundled=True,
-                                base_price_is='net' if event.settings.display_net_prices else 'gross')  # backwards-compat
+                                base_price_is='net' if event_settings.display_net_prices else 'gross')  # backwards-compat
                     ) if var.original_price or item.original_price else None
 
                 var.current_unavailability_reason = var.unavailability_reason(has_voucher=voucher, subevent=subevent)
 
             item.original_price = (
                 item.tax(item.original_price, currency=event.currency, include_bundled=True,
-                         base_price_is='net' if event.settings.display_net_prices else 'gross')  # backwards-compat
+                         base_price_is='net' if event_settings.display_net_prices else 'gross')  # backwards-compat
                 if item.original_price else None
             )
 
@@ -453,7 +455,7 @@ def get_grouped_items(event, *, channel: SalesChannel, subevent=None, voucher=No
                 ) and not getattr(v, '_remove', False)
             ]
 
-            if not (ignore_hide_sold_out_for_item_ids and item.pk in ignore_hide_sold_out_for_item_ids) and event.settings.hide_sold_out:
+            if not (ignore_hide_sold_out_for_item_ids and item.pk in ignore_hide_sold_out_for_item_ids) and event_settings.hide_sold_out:
                 item.available_variations = [v for v in item.available_variations
                                              if v.cached_availability[0] >= Quota.AVAILABILITY_RESERVED]
 
@@ -462,9 +464,9 @@ def get_grouped_items(event, *, channel: SalesChannel, subevent=None, voucher=No
                                              if v.pk == voucher.variation_id]
 
             if len(item.available_variations) > 0:
-                item.min_price = min([v.display_price.net if event.settings.display_net_prices else
+                item.min_price = min([v.display_price.net if event_settings.display_net_prices else
                                       v.display_price.gross for v in item.available_variations])
-                item.max_price = max([v.display_price.net if event.settings.display_net_prices else
+                item.max_price = max([v.display_price.net if event_settings.display_net_prices else
                                       v.display_price.gross for v in item.available_variations])
                 item.best_variation_availability = max([v.cached_availability[0] for v in item.available_variations])
 
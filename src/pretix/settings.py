@@ -542,10 +542,19 @@ if METRICS_ENABLED:
 
 
 PROFILING_RATE = config.getfloat('django', 'profile', fallback=0)  # Percentage of requests to profile
+PROFILING_MODE = config.get('django', 'profile_mode', fallback='cprofile')  # "cprofile" or "sampling"
 if PROFILING_RATE > 0:
     if not os.path.exists(PROFILE_DIR):
         os.mkdir(PROFILE_DIR)
-    MIDDLEWARE.insert(0, 'pretix.helpers.profile.middleware.CProfileMiddleware')
+    if PROFILING_MODE == 'sampling':
+        MIDDLEWARE.insert(0, 'pretix.helpers.profile.middleware.SamplingProfilerMiddleware')
+    else:
+        MIDDLEWARE.insert(0, 'pretix.helpers.profile.middleware.CProfileMiddleware')
+
+QUERY_SAMPLING_RATE = config.getfloat('django', 'query_sampling', fallback=0)  # Percentage of requests to check
+QUERY_REPEAT_THRESHOLD = config.getint('django', 'query_repeat_threshold', fallback=20)
+if QUERY_SAMPLING_RATE > 0:
+    MIDDLEWARE.insert(0, 'pretix.helpers.profile.queries.QuerySamplingMiddleware')
 
 
 # Security settings
@@ -766,6 +775,7 @@ CELERY_TASK_ROUTES = ([
     ('pretix.base.services.mail.*', {'queue': 'mail'}),
     ('pretix.base.services.update_check.*', {'queue': 'background'}),
     ('pretix.base.services.quotas.*', {'queue': 'background'}),
+    ('pretix.base.services.tickets.prerender_tickets', {'queue': 'background'}),
     ('pretix.base.services.waitinglist.*', {'queue': 'background'}),
     ('pretix.base.services.notifications.*', {'queue': 'notifications'}),
     ('pretix.api.webhooks.*', {'queue': 'notifications'}),
@@ -21,6 +21,9 @@
 #
 from django.db import DEFAULT_DB_ALIAS, connections
 from django.test.utils import CaptureQueriesContext
+from hierarkey.proxy import dirty_cache_keys
+
+from pretix.helpers.profile.queries import QueryFingerprintCounter
 
 
 class _AssertNumQueriesContext(CaptureQueriesContext):
@@ -53,3 +56,49 @@ def assert_num_queries(num, func=None, *args, **kwargs):
 
     with context:
         func(*args, **kwargs)
+
+
+class _AssertQueryBudgetContext(QueryFingerprintCounter):
+    def __init__(self, max_num, max_repeats):
+        self.max_num = max_num
+        self.max_repeats = max_repeats
+        super().__init__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        executed = self.total
+        assert self.max_num is None or executed <= self.max_num, \
+            "%d queries executed, at most %d expected\nCaptured queries were:\n%s" % (
+                executed, self.max_num,
+                '\n'.join('%dx %s' % (c, fp) for fp, c in self.fingerprints.most_common())
+            )
+        repeated = self.repeated(self.max_repeats) if self.max_repeats is not None else []
+        assert not repeated, "Queries executed more than %d times:\n%s" % (
+            self.max_repeats,
+            '\n'.join('%dx %s' % (c, fp) for fp, c in repeated)
+        )
+
+
+def assert_query_budget(max_num=None, max_repeats=1, func=None, *args, **kwargs):
+    """
+    Asserts that at most ``max_num`` queries are executed and that no query, ignoring its parameters, is executed
+    more than ``max_repeats`` times. The latter catches N+1 query problems independent of the size of the test data.
+    """
+    context = _AssertQueryBudgetContext(max_num, max_repeats)
+    if func is None:
+        return context
+
+    with context:
+        func(*args, **kwargs)
+
+
+def forget_uncommitted_settings():
+    """
+    Settings written within a test are marked as uncommitted until the surrounding transaction is committed, which
+    never happens in tests wrapped in a transaction. While marked, every access reads them from the database again
+    instead of once per object. Call this after setting up the test data to count the queries of a request like in
+    production.
+    """
+    dirty_cache_keys.set(set())
@@ -37,6 +37,9 @@ from pretix.api.serializers.item import QuestionSerializer
 from pretix.base.models import (
     Checkin, CheckinList, InvoiceAddress, Order, OrderPosition,
 )
+from pretix.testutils.queries import (
+    assert_query_budget, forget_uncommitted_settings,
+)
 
 
 @pytest.fixture
@@ -554,6 +557,28 @@ def test_list_all_items_positions(token_client, organizer, event, clist, clist_a
     assert [p2, p1, p3] == resp.data['results']
 
 
+@pytest.mark.django_db
+def test_list_all_items_positions_query_budget(token_client, organizer, event, clist_all, item, order):
+    with scopes_disabled():
+        for i in range(10):
+            OrderPosition.objects.create(
+                order=order,
+                positionid=10 + i,
+                item=item,
+                variation=None,
+                price=Decimal("23"),
+                attendee_name_parts={'full_name': "Attendee %d" % i},
+            )
+    forget_uncommitted_settings()
+
+    with assert_query_budget(max_num=24, max_repeats=3):
+        resp = token_client.get('/api/v1/organizers/{}/events/{}/checkinlists/{}/positions/'.format(
+            organizer.slug, event.slug, clist_all.pk
+        ))
+    assert resp.status_code == 200
+    assert resp.data['count'] == 13
+
+
 @pytest.mark.django_db
 def test_list_all_items_positions_by_subevent(token_client, organizer, event, clist, clist_all, item, other_item, order, subevent):
     with scopes_disabled():
@@ -32,6 +32,7 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations under the License.
 
+import base64
 import copy
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
@@ -49,6 +50,7 @@ from pretix.base.models import (
     Event, InvoiceAddress, Order, OrderPosition, Organizer, SeatingPlan,
 )
 from pretix.base.models.orders import OrderFee
+from pretix.base.services.seating import SeatProtected, generate_seats
 from pretix.testutils.queries import assert_num_queries
 
 
@@ -1290,6 +1292,28 @@ def test_remove_seating_forbidden(token_client, organizer, event, item, seatingp
                                     'present in the new plan and is already sold."]}'
 
 
+@pytest.mark.django_db
+def test_generate_seats_diff(organizer, event, item, seatingplan):
+    with scope(organizer=organizer):
+        generate_seats(event, None, seatingplan, {"Stalls": item})
+        assert event.seats.count() == 3
+        assert set(event.seats.values_list('product_id', flat=True)) == {item.pk}
+
+        s1 = event.seats.first()
+        event.seats.create(seat_guid=s1.seat_guid)
+        event.seats.create(seat_guid='removed', seat_number='X')
+        generate_seats(event, None, seatingplan, {})
+        assert event.seats.count() == 3
+        assert len(set(event.seats.values_list('seat_guid', flat=True))) == 3
+        assert not event.seats.filter(seat_guid='removed').exists()
+        assert set(event.seats.values_list('product_id', flat=True)) == {None}
+
+        removed = event.seats.create(seat_guid='removed', seat_number='X')
+        event.vouchers.create(item=item, seat=removed)
+        with pytest.raises(SeatProtected):
+            generate_seats(event, None, seatingplan, {})
+
+
 @pytest.mark.django_db
 def test_remove_seating_canceled_seat(token_client, organizer, event, item, seatingplan, order_position):
     resp = token_client.patch(
@@ -1826,6 +1850,42 @@ def test_event_block_unblock_seat_bulk(token_client, organizer, event, seatingpl
     assert not s2.blocked
 
 
+@pytest.mark.django_db
+def test_event_seat_states(token_client, organizer, event, seatingplan, item):
+    resp = token_client.patch(
+        '/api/v1/organizers/{}/events/{}/'.format(organizer.slug, event.slug),
+        {
+            "seating_plan": seatingplan.pk,
+            "seat_category_mapping": {
+                "Stalls": item.pk
+            }
+        },
+        format='json'
+    )
+    assert resp.status_code == 200
+    event.refresh_from_db()
+
+    resp = token_client.get('/api/v1/organizers/{}/events/{}/seats/states/'.format(organizer.slug, event.slug))
+    assert resp.status_code == 200
+    states = base64.b64decode(resp.data['states'])
+    assert len(states) == event.seats.count()
+    assert set(states) == {0}
+
+    s1 = event.seats.first()
+    resp = token_client.post(
+        '/api/v1/organizers/{}/events/{}/seats/bulk_block/'.format(organizer.slug, event.slug),
+        {
+            "ids": [s1.pk],
+        },
+        format='json'
+    )
+    assert resp.status_code == 200
+    resp = token_client.get('/api/v1/organizers/{}/events/{}/seats/states/'.format(organizer.slug, event.slug))
+    states = base64.b64decode(resp.data['states'])
+    assert states[0] == 4
+    assert set(states[1:]) == {0}
+
+
 @pytest.mark.django_db
 def test_event_expand_seat_filter_and_querycount(token_client, organizer, event, seatingplan, item):
     event.settings.seating_minimal_distance = 2
@@ -57,12 +57,18 @@ SAMPLE_EXPORTER_CONFIG = {
                 "orders:default",
                 "orders:excel",
                 "orders:semicolon",
+                "orders:parquet",
+                "orders:arrow",
                 "positions:default",
                 "positions:excel",
                 "positions:semicolon",
+                "positions:parquet",
+                "positions:arrow",
                 "fees:default",
                 "fees:excel",
-                "fees:semicolon"
+                "fees:semicolon",
+                "fees:parquet",
+                "fees:arrow"
             ]
         },
         {
@@ -548,6 +548,34 @@ def test_order_list(token_client, organizer, event, order, item, taxrule, questi
     assert len(resp.data['results'][0]['fees']) == 2
 
 
+@pytest.mark.django_db
+def test_order_list_cursor_pagination(token_client, organizer, event, order):
+    with scopes_disabled():
+        for code in ('BAR', 'BAZ'):
+            Order.objects.create(
+                code=code, event=event, email='dummy@dummy.test', status=Order.STATUS_PAID,
+                datetime=now(), expires=now(), total=0,
+                sales_channel=event.organizer.sales_channels.get(identifier="web"),
+            )
+        order.touch()
+
+    for ordering, expected in (('', ['FOO', 'BAR', 'BAZ']), ('&ordering=last_modified', ['BAR', 'BAZ', 'FOO'])):
+        codes = []
+        url = '/api/v1/organizers/{}/events/{}/orders/?pagination=cursor&page_size=2{}'.format(
+            organizer.slug, event.slug, ordering
+        )
+        while url:
+            resp = token_client.get(url)
+            assert resp.status_code == 200
+            assert 'count' not in resp.data
+            codes += [o['code'] for o in resp.data['results']]
+            url = resp.data['next']
+        assert codes == expected
+
+    resp = token_client.get('/api/v1/organizers/{}/events/{}/orders/?cursor=foo'.format(organizer.slug, event.slug))
+    assert resp.status_code == 404
+
+
 @pytest.mark.django_db
 def test_order_detail(token_client, organizer, event, order, item, taxrule, question):
     res = dict(TEST_ORDER_RES)
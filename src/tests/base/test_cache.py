@@ -20,11 +20,14 @@
 # <https://www.gnu.org/licenses/>.
 #
 import random
+from unittest import mock
 
 from django.core.cache import cache as django_cache
+from django.core.signals import request_started
 from django.test import TestCase, override_settings
 from django.utils.timezone import now
 
+from pretix.base.cache import ObjectRelatedCache
 from pretix.base.models import Event, Organizer
 
 
@@ -64,6 +67,23 @@ class CacheTest(TestCase):
         self.cache.clear()
         self.assertIsNone(self.cache.get(self.testkey))
 
+    def test_invalidation_by_other_process(self):
+        self.cache.clear()
+        self.cache.set(self.testkey, "foo")
+        # clear() in a different process only changes the prefix in the shared cache
+        django_cache.incr(self.cache.prefixkey)
+        self.assertEqual(ObjectRelatedCache(self.event).get(self.testkey), "foo")
+        with mock.patch('pretix.base.cache._local_prefixes', {}):
+            self.assertIsNone(ObjectRelatedCache(self.event).get(self.testkey))
+
+    def test_invalidation_by_other_process_visible_to_next_request(self):
+        self.cache.clear()
+        self.cache.set(self.testkey, "foo")
+        django_cache.incr(self.cache.prefixkey)
+        self.assertEqual(ObjectRelatedCache(self.event).get(self.testkey), "foo")
+        request_started.send(sender=self.__class__)
+        self.assertIsNone(ObjectRelatedCache(self.event).get(self.testkey))
+
     def test_many(self):
         inp = {
             'a': 'foo',
@@ -19,8 +19,13 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
-from datetime import datetime, time, timedelta, timezone
+import csv
+import io
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from django.core import mail as djmail
 from django.utils.timezone import now
@@ -28,9 +33,14 @@ from django_scopes import scope
 from freezegun import freeze_time
 
 from pretix.base.models import (
-    Event, Organizer, ScheduledEventExport, ScheduledOrganizerExport, User,
+    CachedFile, Event, Item, Order, OrderPosition, Organizer,
+    ScheduledEventExport, ScheduledOrganizerExport, User,
 )
-from pretix.base.services.export import run_scheduled_exports
+from pretix.base.services import export as export_service
+from pretix.base.services.export import (
+    export, multiexport, run_scheduled_exports,
+)
+from pretix.helpers.arrow import ColumnarWriter
 
 
 @pytest.fixture(scope='function')
@@ -362,3 +372,123 @@ def test_organizer_ok(event, user, team):
     assert len(djmail.outbox[0].attachments) == 1
     assert djmail.outbox[0].attachments[0][0] == "dummy_events.csv"
     assert len(djmail.outbox[0].attachments[0][1].splitlines()) == 3
+
+
+@pytest.mark.django_db
+def test_export_streamed_to_file(event, user):
+    cf = CachedFile.objects.create(date=now(), expires=now() + timedelta(hours=1))
+    export.apply(kwargs={
+        'event': event.pk,
+        'user': user.pk,
+        'device': None,
+        'token': None,
+        'fileid': str(cf.id),
+        'provider': 'orderlist',
+        'form_data': {'_format': 'positions:default', 'paid_only': False, 'group_multiple_choice': False},
+    })
+    cf.refresh_from_db()
+    assert cf.filename == 'dummy_orders.csv'
+    assert cf.type == 'text/csv'
+    with cf.file.open('rb') as f:
+        assert f.read().decode().startswith('"Event slug","Event name","Order code"')
+
+
+@pytest.mark.django_db
+def test_export_parquet(event, user):
+    o = Order.objects.create(
+        code='FOO', event=event, email='dummy@dummy.test', status=Order.STATUS_PAID,
+        datetime=datetime(2023, 1, 10, 12, 0, 0, tzinfo=timezone.utc), expires=now(), total=Decimal('23.00'),
+        sales_channel=event.organizer.sales_channels.get(identifier="web"),
+    )
+    ticket = Item.objects.create(event=event, name='Ticket', default_price=23)
+    OrderPosition.objects.create(order=o, item=ticket, price=Decimal('23.00'), positionid=1)
+
+    cf = CachedFile.objects.create(date=now(), expires=now() + timedelta(hours=1))
+    export.apply(kwargs={
+        'event': event.pk,
+        'user': user.pk,
+        'device': None,
+        'token': None,
+        'fileid': str(cf.id),
+        'provider': 'orderlist',
+        'form_data': {'_format': 'positions:parquet', 'paid_only': False, 'group_multiple_choice': False},
+    })
+    cf.refresh_from_db()
+    assert cf.filename == 'dummy_orders.parquet'
+    with cf.file.open('rb') as f:
+        table = pq.read_table(f)
+    assert table.schema.field('Order date').type == pa.date32()
+    assert table.schema.field('Price').type == pa.decimal128(38, 2)
+    row = table.to_pylist()[0]
+    assert row['Order code'] == 'FOO'
+    assert row['Order date'] == date(2023, 1, 10)
+    assert row['Price'] == Decimal('23.00')
+
+
+@pytest.mark.django_db
+def test_multiexport_partitioned(event, user, monkeypatch):
+    monkeypatch.setattr(export_service, 'MULTIEXPORT_PARTITION_SIZE', 1)
+    events = [event] + [
+        Event.objects.create(
+            organizer=event.organizer, name=f'Dummy {i}', slug=f'dummy{i}',
+            date_from=datetime(2023, 1, 19, 2, 30, 0, tzinfo=timezone.utc),
+        )
+        for i in range(2)
+    ]
+    for i, e in enumerate(events):
+        o = Order.objects.create(
+            code=f'FOO{i}', event=e, email='dummy@dummy.test', status=Order.STATUS_PAID,
+            datetime=now(), expires=now(), total=Decimal('23.00'),
+            sales_channel=event.organizer.sales_channels.get(identifier="web"),
+        )
+        for day in range(3):
+            # Transactions of different events alternate, so the rows of the partitions need to be interleaved
+            o.transactions.create(
+                datetime=datetime(2023, 1, 10 + day, 10, i, 0, tzinfo=timezone.utc), count=1,
+                price=Decimal('23.00'), tax_rate=Decimal('0.00'), tax_value=Decimal('0.00'), fee_type='other',
+            )
+
+    cf = CachedFile.objects.create(date=now(), expires=now() + timedelta(hours=1))
+    multiexport.apply(kwargs={
+        'organizer': event.organizer.pk,
+        'user': user.pk,
+        'device': None,
+        'token': None,
+        'fileid': str(cf.id),
+        'provider': 'transactions',
+        'form_data': {
+            '_format': 'semicolon',
+            'all_events': True,
+        },
+    })
+    cf.refresh_from_db()
+    assert cf.filename == 'dummy_transactions.csv'
+    with cf.file.open('rb') as f:
+        rows = list(csv.reader(io.StringIO(f.read().decode()), delimiter=';'))
+    assert rows[0][:3] == ['Event', 'Event slug', 'Currency']
+    assert [(r[1], r[6]) for r in rows[1:]] == [
+        (slug, f'2023-01-{10 + day}')
+        for day in range(3)
+        for slug in ('dummy', 'dummy0', 'dummy1')
+    ]
+    assert CachedFile.objects.count() == 1
+
+
+def test_columnar_writer_widens_types_of_later_row_groups():
+    output = io.BytesIO()
+    writer = ColumnarWriter(output, 'parquet', row_group_size=2)
+    writer.append(['Amount', 'Value', 'Date'])
+    writer.append([Decimal('1.00'), 1, '2023-01-10'])
+    writer.append([Decimal('2.50'), 2, ''])
+    writer.append([Decimal('0.125'), 'n/a', date(2023, 1, 12)])
+    writer.close()
+
+    table = pq.read_table(io.BytesIO(output.getvalue()))
+    assert table.schema.field('Amount').type == pa.decimal128(38, 3)
+    assert table.schema.field('Value').type == pa.string()
+    assert table.schema.field('Date').type == pa.date32()
+    assert table.to_pylist() == [
+        {'Amount': Decimal('1.000'), 'Value': '1', 'Date': date(2023, 1, 10)},
+        {'Amount': Decimal('2.500'), 'Value': '2', 'Date': None},
+        {'Amount': Decimal('0.125'), 'Value': 'n/a', 'Date': date(2023, 1, 12)},
+    ]
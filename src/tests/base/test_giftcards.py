@@ -0,0 +1,78 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django_scopes import scope
+
+from pretix.base.models import GiftCard, Organizer
+
+
+@pytest.fixture
+def organizer():
+    o = Organizer.objects.create(name='Dummy', slug='dummy')
+    with scope(organizer=o):
+        yield o
+
+
+@pytest.fixture
+def giftcard(organizer):
+    return organizer.issued_gift_cards.create(currency='EUR')
+
+
+@pytest.mark.django_db
+def test_balance_follows_transactions(organizer, giftcard):
+    stale = GiftCard.objects.get(pk=giftcard.pk)
+    giftcard.transactions.create(value=Decimal('23.00'), acceptor=organizer)
+    assert giftcard.value == Decimal('23.00')
+    giftcard.transactions.create(value=Decimal('-5.50'), acceptor=organizer)
+    assert giftcard.value == Decimal('17.50')
+
+    giftcard.refresh_from_db()
+    assert giftcard.balance == Decimal('17.50')
+
+    # Saving an instance loaded before the transactions must not reset the balance
+    stale.conditions = 'Foo'
+    stale.save()
+    giftcard.refresh_from_db()
+    assert giftcard.conditions == 'Foo'
+    assert giftcard.balance == Decimal('17.50')
+
+
+@pytest.mark.django_db
+def test_check_giftcard_balances(organizer, giftcard):
+    giftcard.transactions.create(value=Decimal('23.00'), acceptor=organizer)
+    out = StringIO()
+    call_command('check_giftcard_balances', stdout=out, stderr=StringIO())
+    assert out.getvalue() == ''
+
+    GiftCard.objects.filter(pk=giftcard.pk).update(balance=Decimal('42.00'))
+    call_command('check_giftcard_balances', stdout=out, stderr=StringIO())
+    assert giftcard.secret in out.getvalue()
+    giftcard.refresh_from_db()
+    assert giftcard.balance == Decimal('42.00')
+
+    call_command('check_giftcard_balances', '--fix', stdout=StringIO(), stderr=StringIO())
+    giftcard.refresh_from_db()
+    assert giftcard.balance == Decimal('23.00')
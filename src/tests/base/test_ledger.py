@@ -0,0 +1,116 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.timezone import now
+from django_scopes import scopes_disabled
+from freezegun import freeze_time
+
+from pretix.base.models import (
+    Event, GiftCardLedgerDay, Item, Order, Organizer, Transaction,
+    TransactionLedgerDay,
+)
+from pretix.base.services import ledger
+from pretix.base.services.ledger import (
+    ledger_closed_until, reset_ledger, update_ledger,
+)
+from pretix.plugins.reports.accountingreport import ReportExporter
+
+
+@pytest.fixture
+@scopes_disabled()
+def env():
+    o = Organizer.objects.create(name='Dummy', slug='dummy')
+    event = Event.objects.create(organizer=o, name='Dummy', slug='dummy', date_from=now(), currency='EUR')
+    item = Item.objects.create(event=event, name='Ticket', default_price=Decimal('23.00'))
+    orders = {}
+    for testmode in (False, True):
+        orders[testmode] = Order.objects.create(
+            code='TEST' if testmode else 'LIVE', event=event, email='dummy@dummy.test', testmode=testmode,
+            status=Order.STATUS_PAID, datetime=now(), expires=now() + timedelta(days=10),
+            total=Decimal('23.00'), sales_channel=o.sales_channels.get(identifier="web"),
+        )
+    gc = o.issued_gift_cards.create(currency='EUR')
+    gc_test = o.issued_gift_cards.create(currency='EUR', testmode=True)
+
+    for day, hour in ((1, 10), (1, 23), (2, 0), (3, 12), (5, 8), (5, 20), (9, 12)):
+        dt = datetime(2024, 1, day, hour, 0, tzinfo=timezone.utc)
+        for testmode, order in orders.items():
+            Transaction.objects.create(
+                order=order, datetime=dt, item=item, count=1, price=Decimal(day), tax_rate=Decimal('0.00'),
+                tax_value=Decimal('0.00'),
+            )
+        with freeze_time(dt):
+            gc.transactions.create(value=Decimal(day), acceptor=o)
+            gc_test.transactions.create(value=Decimal(hour), acceptor=o)
+    return event
+
+
+def _totals(event, df_start, no_testmode):
+    exporter = ReportExporter(event, event.organizer)
+    form_data = {'date_range': None, 'no_testmode': no_testmode}
+    return (
+        exporter._transaction_total_before(form_data, 'EUR', df_start),
+        exporter._giftcard_transaction_total_before(form_data, 'EUR', df_start),
+    )
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_update_ledger(env, monkeypatch):
+    monkeypatch.setattr(ledger, 'now', lambda: datetime(2024, 1, 6, 0, 30, tzinfo=timezone.utc))
+    update_ledger(sender=None)
+    assert ledger_closed_until() == date(2024, 1, 5)
+    assert {(r.day.day, r.total) for r in TransactionLedgerDay.objects.all()} == {
+        (1, Decimal('2.00')), (2, Decimal('2.00')), (3, Decimal('3.00')),
+    }
+    assert {(r.day.day, r.total) for r in GiftCardLedgerDay.objects.all()} == {
+        (1, Decimal('2.00')), (2, Decimal('2.00')), (3, Decimal('3.00')),
+    }
+
+    monkeypatch.setattr(ledger, 'now', lambda: datetime(2024, 1, 20, 0, 0, tzinfo=timezone.utc))
+    update_ledger(sender=None)
+    assert ledger_closed_until() == date(2024, 1, 19)
+    assert TransactionLedgerDay.objects.filter(day__gte=date(2024, 1, 5)).count() == 2
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+@pytest.mark.parametrize('no_testmode', [True, False])
+@pytest.mark.parametrize('df_start', [
+    datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc),
+    datetime(2024, 1, 3, 0, 0, tzinfo=timezone.utc),
+    datetime(2024, 1, 5, 9, 0, tzinfo=timezone.utc),
+    datetime(2024, 1, 12, 0, 0, tzinfo=timezone.utc),
+])
+def test_report_totals_use_ledger(env, df_start, no_testmode, monkeypatch):
+    expected = _totals(env, df_start, no_testmode)
+    monkeypatch.setattr(ledger, 'now', lambda: datetime(2024, 1, 6, 0, 30, tzinfo=timezone.utc))
+    update_ledger(sender=None)
+    assert _totals(env, df_start, no_testmode) == expected
+
+    reset_ledger()
+    assert ledger_closed_until() is None
+    assert not TransactionLedgerDay.objects.exists()
+    assert _totals(env, df_start, no_testmode) == expected
@@ -44,6 +44,7 @@ from unittest import mock
 import pytest
 from django.conf import settings
 from django.core import mail as djmail
+from django.core.cache import cache
 from django.test import override_settings
 from django.utils.html import escape
 from django.utils.timezone import now
@@ -265,6 +266,36 @@ def test_queue_state_retry_failure(env, monkeypatch):
     assert m.retry_after > now()
 
 
+@pytest.mark.django_db
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+def test_queue_state_retry_while_tickets_prerender(env, order, monkeypatch):
+    def retry(*args, **kwargs):
+        raise Exception()
+
+    monkeypatch.setattr('celery.app.task.Task.retry', retry, raising=True)
+    m = OutgoingMail.objects.create(
+        to=['recipient@example.com'],
+        subject='Test',
+        body_plain='Test',
+        sender='sender@example.com',
+        event=env[0],
+        order=order,
+        should_attach_tickets=True,
+    )
+    cache.set('pretix_prerender_tickets_{}'.format(order.pk), True)
+    try:
+        with pytest.raises(Exception):
+            mail_send_task.apply(kwargs={
+                'outgoing_mail': m.pk,
+            }, max_retries=0, throw=True)
+    finally:
+        cache.clear()
+    m.refresh_from_db()
+    assert m.status == OutgoingMail.STATUS_AWAITING_RETRY
+    assert m.error == "Tickets not ready"
+    assert len(djmail.outbox) == 0
+
+
 @pytest.mark.django_db
 def test_queue_state_foreign_key_handling():
     o = Organizer.objects.create(name='Dummy', slug='dummy')
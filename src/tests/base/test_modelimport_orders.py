@@ -26,7 +26,9 @@ from io import StringIO
 
 import pytest
 from django.conf import settings as django_settings
+from django.core.cache import cache
 from django.core.files.base import ContentFile
+from django.test import override_settings
 from django.utils.timezone import now
 from django_scopes import scopes_disabled
 from i18nfield.strings import LazyI18nString
@@ -36,6 +38,7 @@ from pretix.base.models import (
     Question, QuestionAnswer, User,
 )
 from pretix.base.services.modelimport import DataImportError, import_orders
+from pretix.testutils.mock import mocker_context
 
 
 @pytest.fixture
@@ -160,6 +163,28 @@ def test_import_simple(event, item, user):
     assert OrderPosition.objects.count() == 3
 
 
+@pytest.mark.django_db
+@scopes_disabled()
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+def test_import_prerenders_tickets_in_one_task(event, item, user, django_capture_on_commit_callbacks):
+    event.plugins += ',tests.testdummy'
+    event.save()
+    event.settings.ticket_download = True
+    event.settings.ticketoutput_testdummy__enabled = True
+    settings = dict(DEFAULT_SETTINGS)
+    settings['item'] = 'static:{}'.format(item.pk)
+    with mocker_context() as mocker:
+        mocked = mocker.patch('pretix.base.services.tickets.prerender_tickets.apply_async')
+        with django_capture_on_commit_callbacks(execute=True):
+            import_orders.apply(
+                args=(event.pk, inputfile_factory().id, settings, 'en', user.pk)
+            )
+        assert mocked.call_count == 1
+        assert sorted(mocked.call_args.kwargs['kwargs']['orders']) == sorted(event.orders.values_list('pk', flat=True))
+    # The mocked task did not release its locks
+    cache.clear()
+
+
 @pytest.mark.django_db
 @scopes_disabled()
 def test_import_as_one_order(user, event, item):
@@ -64,6 +64,9 @@ from pretix.base.models.items import (
 from pretix.base.reldate import RelativeDate, RelativeDateWrapper
 from pretix.base.services.orders import OrderError, cancel_order, perform_order
 from pretix.base.services.quotas import QuotaAvailability
+from pretix.base.services.seating import (
+    SEAT_STATE_DISTANCE, SEAT_STATE_FREE, SEAT_STATE_SOLD, get_seat_states,
+)
 from pretix.helpers import repeatable_reads_transaction
 from pretix.testutils.scope import classscope
 
@@ -2826,6 +2829,37 @@ class SeatingTestCase(TestCase):
         assert not self.seat_a1.is_available()
         assert self.seat_a2.is_available()
 
+    @classscope(attr='organizer')
+    def test_blocked_in_proximity_only_within_radius(self):
+        o = Order.objects.create(
+            code='FOO', event=self.event, email='dummy@dummy.test', total=Decimal("30"),
+            sales_channel=self.event.organizer.sales_channels.get(identifier="web"),
+            locale='en', status=Order.STATUS_PENDING, datetime=now(),
+            expires=now() + timedelta(days=10),
+        )
+        OrderPosition.objects.create(
+            order=o, item=self.ticket, variation=None, price=Decimal("12"),
+            seat=self.seat_a1
+        )
+        seat_b1 = self.event.seats.create(seat_number="B1", product=self.ticket, blocked=False, x=-1.2, y=0)
+        seat_b2 = self.event.seats.create(seat_number="B2", product=self.ticket, blocked=False, x=0, y=-1.6)
+        seat_b3 = self.event.seats.create(seat_number="B3", product=self.ticket, blocked=False, x=-1.1, y=-1.1)
+
+        self.event.settings.seating_minimal_distance = 1.5
+        assert set(self.event.free_seats()) == {seat_b2, seat_b3}
+        assert not seat_b1.is_available()
+        assert seat_b2.is_available()
+        assert seat_b3.is_available()
+
+        states = dict(zip(self.event.seats.all(), get_seat_states(self.event)))
+        assert states == {
+            self.seat_a1: SEAT_STATE_SOLD,
+            self.seat_a2: SEAT_STATE_DISTANCE,
+            seat_b1: SEAT_STATE_DISTANCE,
+            seat_b2: SEAT_STATE_FREE,
+            seat_b3: SEAT_STATE_FREE,
+        }
+
     @classscope(attr='organizer')
     def test_order_pending(self):
         o = Order.objects.create(
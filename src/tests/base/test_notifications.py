@@ -24,12 +24,14 @@ from decimal import Decimal
 
 import pytest
 from django.core import mail as djmail
+from django.db import transaction
 from django.utils.timezone import now
 from django_scopes import scope
 
 from pretix.base.models import (
-    Event, Item, Order, OrderPosition, Organizer, User,
+    Event, Item, LogEntry, Order, OrderPosition, Organizer, User,
 )
+from pretix.base.models.base import buffered_logging
 
 
 @pytest.fixture
@@ -147,3 +149,50 @@ def test_notification_ignore_insufficient_permissions(event, order, user, team,
     assert len(djmail.outbox) == 0
 
 # TODO: Test email content
+
+
+@pytest.mark.django_db
+def test_buffered_logging(event, order, user, django_capture_on_commit_callbacks):
+    djmail.outbox = []
+    user.notification_settings.create(
+        method='mail', event=event, action_type='pretix.event.order.paid', enabled=True
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic(), buffered_logging():
+            le1 = order.log_action('pretix.event.order.comment', {})
+            with transaction.atomic():
+                le2 = order.log_action('pretix.event.order.comment', {})
+            le3 = order.log_action('pretix.event.order.paid', {})
+            assert le1.pk is None
+            assert le2.pk is None
+            assert le3.pk is None
+            assert LogEntry.objects.filter(action_type='pretix.event.order.paid').count() == 0
+        assert le1.pk < le2.pk < le3.pk
+        assert LogEntry.objects.filter(action_type='pretix.event.order.paid').count() == 1
+    assert len(djmail.outbox) == 1
+
+
+@pytest.mark.django_db
+def test_buffered_logging_nested_rollback(event, order):
+    with transaction.atomic(), buffered_logging():
+        order.log_action('pretix.event.order.comment', {'n': 1})
+        try:
+            with transaction.atomic():
+                order.log_action('pretix.event.order.comment', {'n': 2})
+                raise ValueError()
+        except ValueError:
+            pass
+        with transaction.atomic():
+            order.log_action('pretix.event.order.comment', {'n': 3})
+    assert [
+        le.parsed_data['n'] for le in LogEntry.objects.filter(action_type='pretix.event.order.comment').order_by('pk')
+    ] == [1, 3]
+
+
+@pytest.mark.django_db
+def test_buffered_logging_discarded_on_error(event, order):
+    with pytest.raises(ValueError):
+        with transaction.atomic(), buffered_logging():
+            order.log_action('pretix.event.order.comment', {})
+            raise ValueError()
+    assert not LogEntry.objects.filter(action_type='pretix.event.order.comment').exists()
@@ -28,6 +28,7 @@ from zoneinfo import ZoneInfo
 import pytest
 from django.conf import settings
 from django.core import mail as djmail
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import F, Sum
 from django.test import TestCase, TransactionTestCase, override_settings
@@ -40,8 +41,8 @@ from tests.testdummy.signals import FoobazSalesChannel
 
 from pretix.base.decimal import round_decimal
 from pretix.base.models import (
-    CartPosition, Event, GiftCard, Invoice, InvoiceAddress, Item, Order,
-    OrderPosition, Organizer, SeatingPlan,
+    CachedTicket, CartPosition, Event, GiftCard, Invoice, InvoiceAddress, Item,
+    Order, OrderPosition, Organizer, SeatingPlan,
 )
 from pretix.base.models.items import SubEventItem
 from pretix.base.models.orders import OrderFee, OrderPayment, OrderRefund
@@ -54,10 +55,12 @@ from pretix.base.services.invoices import (
     generate_cancellation, generate_invoice,
 )
 from pretix.base.services.orders import (
-    OrderChangeManager, OrderError, _create_order, approve_order, cancel_order,
-    deny_order, expire_orders, reactivate_order, send_download_reminders,
-    send_expiry_warnings,
+    OrderChangeManager, OrderError, _create_order, _perform_order,
+    approve_order, cancel_order, deny_order, expire_orders, reactivate_order,
+    send_download_reminders, send_expiry_warnings,
 )
+from pretix.base.services.tickets import schedule_prerender
+from pretix.base.signals import order_paid, order_placed
 from pretix.plugins.banktransfer.payment import BankTransfer
 from pretix.testutils.mock import mocker_context
 from pretix.testutils.scope import classscope
@@ -729,6 +732,92 @@ def test_approve_free_after_last_payment_date(event):
     assert 'confirmed' in djmail.outbox[0].subject
 
 
+@pytest.mark.django_db
+def test_tickets_prerendered_when_paid(event, django_capture_on_commit_callbacks):
+    event.plugins += ',tests.testdummy'
+    event.save()
+    event.settings.ticket_download = True
+    event.settings.ticketoutput_testdummy__enabled = True
+    o1 = Order.objects.create(
+        code='FOO', event=event, email='dummy@dummy.test',
+        status=Order.STATUS_PENDING,
+        datetime=now(), expires=now() + timedelta(days=10),
+        total=Decimal('23.00'), locale='en',
+        sales_channel=event.organizer.sales_channels.get(identifier="web"),
+    )
+    ticket = Item.objects.create(event=event, name='Early-bird ticket',
+                                 default_price=Decimal('23.00'), admission=True)
+    op = OrderPosition.objects.create(
+        order=o1, item=ticket, variation=None,
+        price=Decimal("23.00"), attendee_name_parts={'full_name': "Peter"}, positionid=1
+    )
+    p = o1.payments.create(provider='manual', amount=o1.total)
+    with django_capture_on_commit_callbacks(execute=True):
+        p.confirm()
+    ct = CachedTicket.objects.get(order_position=op, provider='testdummy')
+    assert ct.file.read() == str(o1.pk).encode()
+
+    with mocker_context() as mocker:
+        mocked = mocker.patch('pretix.base.services.tickets.prerender_tickets.apply_async')
+        schedule_prerender(event, [o1.pk])
+        assert not mocked.called
+
+
+@pytest.mark.django_db
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+def test_tickets_prerendered_once_per_order(event, django_capture_on_commit_callbacks):
+    event.plugins += ',tests.testdummy'
+    event.save()
+    event.settings.ticket_download = True
+    event.settings.ticketoutput_testdummy__enabled = True
+    o1 = Order.objects.create(
+        code='FOO', event=event, email='dummy@dummy.test',
+        status=Order.STATUS_PAID,
+        datetime=now(), expires=now() + timedelta(days=10),
+        total=Decimal('0.00'), locale='en',
+        sales_channel=event.organizer.sales_channels.get(identifier="web"),
+    )
+    ticket = Item.objects.create(event=event, name='Free ticket', default_price=Decimal('0.00'), admission=True)
+    OrderPosition.objects.create(
+        order=o1, item=ticket, variation=None,
+        price=Decimal("0.00"), attendee_name_parts={'full_name': "Peter"}, positionid=1
+    )
+    with mocker_context() as mocker:
+        mocked = mocker.patch('pretix.base.services.tickets.prerender_tickets.apply_async')
+        with django_capture_on_commit_callbacks(execute=True):
+            order_placed.send(event, order=o1, bulk=False)
+            order_paid.send(event, order=o1)
+        assert mocked.call_count == 1
+        assert mocked.call_args.kwargs['kwargs'] == {'event': event.pk, 'orders': [o1.pk]}
+    # The mocked task did not release its lock
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_free_order_log_order(event):
+    ticket = Item.objects.create(event=event, name='Free ticket', default_price=Decimal('0.00'), admission=True)
+    event.quotas.create(size=None, name='Tickets').items.add(ticket)
+    cp = CartPosition.objects.create(
+        item=ticket, price=Decimal('0.00'), expires=now() + timedelta(days=1), event=event, cart_id='123',
+    )
+    result = _perform_order(event, email='dummy@example.org', position_ids=[cp.pk], payment_requests=[{
+        "id": "test0",
+        "provider": "free",
+        "max_value": None,
+        "min_value": None,
+        "multi_use_supported": False,
+        "info_data": {},
+    }], address=None, locale='en')
+    order = Order.objects.get(pk=result['order_id'])
+    assert order.status == Order.STATUS_PAID
+    actions = list(order.all_logentries().order_by('pk').values_list('action_type', flat=True))
+    assert actions[:3] == [
+        'pretix.event.order.placed',
+        'pretix.event.order.payment.confirmed',
+        'pretix.event.order.paid',
+    ]
+
+
 @pytest.mark.django_db
 def test_deny(event):
     djmail.outbox = []
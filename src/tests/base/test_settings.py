@@ -39,7 +39,7 @@ from i18nfield.strings import LazyI18nString
 
 from pretix.base import settings
 from pretix.base.models import Event, Organizer
-from pretix.base.settings import SettingsSandbox
+from pretix.base.settings import SettingsSandbox, SettingsSnapshot
 from pretix.control.forms.global_settings import GlobalSettingsObject
 
 
@@ -89,3 +89,14 @@ class SettingsTestCase(TestCase):
 
         self.assertIsNone(sandbox.bar)
         self.assertIsNone(sandbox['baz'])
+
+    def test_snapshot(self):
+        self.organizer.settings.set('max_items_per_order', 5)
+        snapshot = SettingsSnapshot(self.event)
+        self.assertEqual(snapshot.max_items_per_order, 5)
+        self.assertEqual(snapshot['locale'], 'en')
+        self.assertEqual(snapshot.get('test', default='foo'), 'foo')
+
+        self.event.settings.set('max_items_per_order', 3)
+        self.assertEqual(snapshot.max_items_per_order, 5)
+        self.assertEqual(SettingsSnapshot(self.event).max_items_per_order, 3)
@@ -0,0 +1,104 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.test import override_settings
+from django.utils.timezone import now
+from django_scopes import scope
+
+from pretix.base.models import Event, Order, Organizer
+from pretix.base.services.stats import order_overview
+from pretix.testutils.queries import assert_query_budget
+
+
+@pytest.mark.django_db
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+def test_order_overview_cached_until_order_changes(django_capture_on_commit_callbacks):
+    o = Organizer.objects.create(name='Dummy', slug='dummy')
+    with scope(organizer=o):
+        event = Event.objects.create(organizer=o, name='Dummy', slug='dummy', date_from=now())
+        item = event.items.create(name='Ticket', default_price=23)
+        with django_capture_on_commit_callbacks(execute=True):
+            order = Order.objects.create(
+                code='FOO', event=event, email='dummy@dummy.test', status=Order.STATUS_PENDING,
+                datetime=now(), expires=now() + timedelta(days=10), total=Decimal('23.00'),
+                sales_channel=o.sales_channels.get(identifier='web'),
+            )
+            order.positions.create(item=item, price=Decimal('23.00'))
+
+        items_by_category, total = order_overview(event)
+        assert total['num']['pending'] == (1, Decimal('23.00'), Decimal('23.00'))
+
+        event = Event.objects.get(pk=event.pk)
+        with assert_query_budget(max_repeats=None) as ctx:
+            items_by_category, total = order_overview(event)
+        assert total['num']['pending'] == (1, Decimal('23.00'), Decimal('23.00'))
+        assert not any('pretixbase_orderposition' in fp for fp in ctx.fingerprints)
+
+        order.status = Order.STATUS_PAID
+        with django_capture_on_commit_callbacks(execute=True):
+            order.save()
+        items_by_category, total = order_overview(event)
+        assert total['num']['pending'] == (0, 0, 0)
+        assert total['num']['paid'] == (1, Decimal('23.00'), Decimal('23.00'))
+
+        items_by_category, total = order_overview(event, date_filter='order_date', date_from=now() + timedelta(days=1))
+        assert total['num']['paid'] == (0, 0, 0)
+
+
+@pytest.mark.django_db
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+def test_order_overview_invalidated_by_change_committed_out_of_order(django_capture_on_commit_callbacks):
+    o = Organizer.objects.create(name='Dummy', slug='dummy')
+    with scope(organizer=o):
+        event = Event.objects.create(organizer=o, name='Dummy', slug='dummy', date_from=now())
+        item = event.items.create(name='Ticket', default_price=23)
+
+        def create_order(code):
+            order = Order.objects.create(
+                code=code, event=event, email='dummy@dummy.test', status=Order.STATUS_PENDING,
+                datetime=now(), expires=now() + timedelta(days=10), total=Decimal('23.00'),
+                sales_channel=o.sales_channels.get(identifier='web'),
+            )
+            order.positions.create(item=item, price=Decimal('23.00'))
+            return order
+
+        with django_capture_on_commit_callbacks(execute=True):
+            order_a = create_order('AAA')
+        order_overview(event)
+
+        # Order A is changed first, but its transaction only commits after order B has been committed and the
+        # overview has been cached again
+        order_a.status = Order.STATUS_PAID
+        with django_capture_on_commit_callbacks() as commit_a:
+            order_a.save()
+        with django_capture_on_commit_callbacks(execute=True):
+            create_order('BBB')
+        order_overview(event)
+        for callback in commit_a:
+            callback()
+
+        with assert_query_budget(max_repeats=None) as ctx:
+            order_overview(event)
+        assert any('pretixbase_orderposition' in fp for fp in ctx.fingerprints)
@@ -22,13 +22,17 @@
 import json
 from datetime import timedelta
 from decimal import Decimal
+from unittest import mock
 
 import pytest
 import responses
 from django.utils.timezone import now
 from django_scopes import scopes_disabled
 
-from pretix.base.models import Event, Item, Order, OrderPosition, Organizer
+from pretix.api import webhooks
+from pretix.base.models import (
+    Event, Item, LogEntry, Order, OrderPosition, Organizer,
+)
 
 
 @pytest.fixture
@@ -217,3 +221,70 @@ def test_webhook_disable_gone(event, order, webhook, django_capture_on_commit_ca
     assert len(responses.calls) == 1
     webhook.refresh_from_db()
     assert not webhook.enabled
+
+
+@pytest.mark.django_db
+@responses.activate
+def test_webhook_batch(event, order, webhook, django_capture_on_commit_callbacks):
+    responses.add(responses.POST, 'https://google.com', status=500)
+    responses.add(responses.POST, 'https://google.com', status=200)
+    with django_capture_on_commit_callbacks(execute=True):
+        LogEntry.bulk_create_and_postprocess([
+            order.log_action('pretix.event.order.placed', {}, save=False),
+            order.log_action('pretix.event.order.paid', {}, save=False),
+        ])
+    # Both entries are delivered by the same task in order, the failed one is retried afterwards
+    assert [json.loads(force_str(c.request.body))['action'] for c in responses.calls] == [
+        'pretix.event.order.placed', 'pretix.event.order.paid', 'pretix.event.order.placed',
+    ]
+    with scopes_disabled():
+        assert [(c.action_type, c.return_code) for c in webhook.calls.order_by('pk')] == [
+            ('pretix.event.order.placed', 500),
+            ('pretix.event.order.paid', 200),
+            ('pretix.event.order.placed', 200),
+        ]
+
+
+@pytest.mark.django_db
+@responses.activate
+def test_webhook_batch_time_budget(event, order, webhook, monkeypatch, django_capture_on_commit_callbacks):
+    monkeypatch.setattr(webhooks, 'WEBHOOK_BATCH_TIME_BUDGET', -1)
+    send_webhooks = mock.Mock(wraps=webhooks.send_webhooks.apply_async)
+    monkeypatch.setattr(webhooks.send_webhooks, 'apply_async', send_webhooks)
+    responses.add(responses.POST, 'https://google.com', status=200)
+    with django_capture_on_commit_callbacks(execute=True):
+        LogEntry.bulk_create_and_postprocess([
+            order.log_action('pretix.event.order.placed', {}, save=False),
+            order.log_action('pretix.event.order.paid', {}, save=False),
+        ])
+    # Every task runs out of time after the first delivery and hands the rest over to a new task
+    assert send_webhooks.call_count == 2
+    assert [json.loads(force_str(c.request.body))['action'] for c in responses.calls] == [
+        'pretix.event.order.placed', 'pretix.event.order.paid',
+    ]
+
+
+@pytest.mark.django_db
+@responses.activate
+def test_webhook_batch_payload_error(event, order, webhook, monkeypatch, django_capture_on_commit_callbacks):
+    event_type = webhooks.get_all_webhook_events()['pretix.event.order.placed']
+    build_payload = event_type.build_payload
+    failed = []
+
+    def build_payload_fail_once(logentry):
+        if not failed:
+            failed.append(logentry)
+            raise ValueError()
+        return build_payload(logentry)
+
+    monkeypatch.setattr(event_type, 'build_payload', build_payload_fail_once)
+    responses.add(responses.POST, 'https://google.com', status=200)
+    with django_capture_on_commit_callbacks(execute=True):
+        LogEntry.bulk_create_and_postprocess([
+            order.log_action('pretix.event.order.placed', {}, save=False),
+            order.log_action('pretix.event.order.paid', {}, save=False),
+        ])
+    # The broken entry does not keep the rest of the batch from being delivered and is retried afterwards
+    assert [json.loads(force_str(c.request.body))['action'] for c in responses.calls] == [
+        'pretix.event.order.paid', 'pretix.event.order.placed',
+    ]
@@ -30,6 +30,8 @@ from django_scopes import scopes_disabled
 from fakeredis import FakeRedisConnection
 from xdist.dsession import DSession
 
+from pretix.helpers.thumb import _local_thumbnails
+from pretix.multidomain.models import _local_instances
 from pretix.testutils.mock import get_redis_connection
 
 CRASHED_ITEMS = set()
@@ -82,6 +84,17 @@ def reset_locale():
     translation.activate("en")
 
 
+@pytest.fixture(autouse=True)
+def reset_local_domain_cache():
+    # Database changes are rolled back between tests without KnownDomain.delete() being called
+    _local_instances.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_local_thumbnail_cache():
+    _local_thumbnails.clear()
+
+
 @pytest.fixture
 def fakeredis_client(monkeypatch):
     worker_id = os.environ.get("PYTEST_XDIST_WORKER")
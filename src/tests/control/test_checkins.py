@@ -36,6 +36,8 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 import pytest
+from django.core.cache import cache
+from django.test import override_settings
 from django.utils.timezone import now
 from django_scopes import scopes_disabled
 from freezegun import freeze_time
@@ -44,6 +46,7 @@ from pretix.base.models import (
     Checkin, Event, Item, ItemAddOn, ItemCategory, LogEntry, Order,
     OrderPosition, Organizer, Team, User,
 )
+from pretix.control.views import dashboards
 from pretix.control.views.dashboards import checkin_widget
 
 from ..base import SoupTest, extract_form_fields
@@ -134,6 +137,44 @@ def test_dashboard_with_checkin(dashboard_env):
     assert '1/2' in c[0]['content']
 
 
+@pytest.mark.django_db
+@scopes_disabled()
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+def test_dashboard_cached(dashboard_env):
+    cache.clear()
+    # Re-fetch the event to not use a cache object created before the settings were overridden
+    event = Event.objects.get(pk=dashboard_env[0].pk)
+    op = OrderPosition.objects.get(order=dashboard_env[3], item=dashboard_env[4])
+    with freeze_time("2024-01-01 10:00:00"):
+        c = checkin_widget(event)
+        assert '0/2' in c[0]['content']
+        Checkin.objects.create(position=op, list=dashboard_env[6])
+        c = checkin_widget(event)
+        assert '0/2' in c[0]['content']
+    with freeze_time("2024-01-01 10:01:00"):
+        c = checkin_widget(event)
+        assert '1/2' in c[0]['content']
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+def test_dashboard_slow_widget_served_stale(dashboard_env, monkeypatch):
+    cache.clear()
+    event = Event.objects.get(pk=dashboard_env[0].pk)
+    monkeypatch.setattr(dashboards, 'DASHBOARD_WIDGET_TIME_BUDGET', -1)
+    op = OrderPosition.objects.get(order=dashboard_env[3], item=dashboard_env[4])
+    with freeze_time("2024-01-01 10:00:00"):
+        checkin_widget(event)
+        Checkin.objects.create(position=op, list=dashboard_env[6])
+    with freeze_time("2024-01-01 10:01:00"):
+        # The expired content is shown while the widget is refreshed in the background
+        c = checkin_widget(event)
+        assert '0/2' in c[0]['content']
+        c = checkin_widget(event)
+        assert '1/2' in c[0]['content']
+
+
 @pytest.fixture
 def checkin_list_env():
     # permission
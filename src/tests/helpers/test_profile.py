@@ -0,0 +1,106 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+import os
+import time
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import modify_settings, override_settings
+
+from pretix.base.services.tasks import ProfiledTask
+from pretix.celery_app import app
+from pretix.helpers.profile import sampling
+from pretix.helpers.profile.sampling import (
+    StackSampler, _stacks, flush, profile_dir, record,
+)
+
+
+def _busy_loop():
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < 0.05:
+        pass
+
+
+@app.task(base=ProfiledTask)
+def _profiled_task():
+    _busy_loop()
+    return 42
+
+
+def test_sampling_profiler(tmpdir):
+    with override_settings(PROFILE_DIR=str(tmpdir)):
+        with StackSampler('presale:event.index', interval=0.001) as sampler:
+            _busy_loop()
+        assert any('_busy_loop' in stack for stack in sampler.stacks)
+        flush()
+
+        out = StringIO()
+        call_command('profile_flamegraph', stdout=out)
+        assert out.getvalue().startswith('presale_event.index\t')
+
+        out = StringIO()
+        call_command('profile_flamegraph', 'presale:event.index', stdout=out)
+        lines = out.getvalue().splitlines()
+        assert any('test_profile.py' in line and '_busy_loop' in line for line in lines)
+        assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == sum(sampler.stacks.values())
+
+
+@pytest.mark.django_db
+@override_settings(PROFILING_RATE=100)
+@modify_settings(MIDDLEWARE={'prepend': 'pretix.helpers.profile.middleware.SamplingProfilerMiddleware'})
+def test_sampling_middleware(client, monkeypatch):
+    # Prevent a periodic flush from clearing the recorded samples in long-running test processes
+    monkeypatch.setattr(sampling, 'FLUSH_INTERVAL', 3600)
+    _stacks.clear()
+    client.get('/control/login')
+    assert set(_stacks.keys()) == {'control:auth.login'}
+    _stacks.clear()
+
+
+def test_sampling_flush_in_background(tmpdir, monkeypatch):
+    monkeypatch.setattr(sampling, 'FLUSH_INTERVAL', -1)
+    with override_settings(PROFILE_DIR=str(tmpdir)):
+        record('presale:event.index', {'main (foo.py:1)': 3})
+        assert not _stacks
+
+        directory = profile_dir('presale:event.index')
+        for i in range(50):
+            files = os.listdir(directory) if os.path.exists(directory) else []
+            if files:
+                break
+            time.sleep(0.1)
+        assert len(files) == 1
+        with open(os.path.join(directory, files[0])) as f:
+            assert f.read() == 'main (foo.py:1) 3\n'
+
+
+@pytest.mark.parametrize('mode', ['sampling', 'cprofile'])
+def test_profiled_task(tmpdir, monkeypatch, mode):
+    monkeypatch.setattr(sampling, 'FLUSH_INTERVAL', 3600)
+    with override_settings(PROFILING_RATE=100, PROFILING_MODE=mode, PROFILE_DIR=str(tmpdir)):
+        assert _profiled_task.apply().get() == 42
+        if mode == 'sampling':
+            assert 'celery.' + _profiled_task.name in _stacks
+        else:
+            assert any(f.endswith('.pstat') for f in os.listdir(str(tmpdir)))
+    _stacks.clear()
@@ -0,0 +1,68 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+import logging
+
+import pytest
+from django.test import modify_settings, override_settings
+from django.utils.timezone import now
+
+from pretix.base.models import Event, Organizer
+from pretix.helpers.profile.queries import fingerprint
+from pretix.testutils.queries import assert_query_budget
+
+
+def test_fingerprint():
+    assert fingerprint('SELECT * FROM "a" WHERE "a"."id" = 3 AND "a"."name" = \'foo\'') == \
+        fingerprint('SELECT *\n  FROM "a" WHERE "a"."id" = 42 AND "a"."name" = \'it\'\'s\'')
+    assert fingerprint('SELECT * FROM "a" WHERE "a"."id" IN (1, 2, 3)') == \
+        fingerprint('SELECT * FROM "a" WHERE "a"."id" IN (%s)')
+    assert fingerprint('SELECT * FROM "a" T3 WHERE "a"."id" = 3') != \
+        fingerprint('SELECT * FROM "a" T4 WHERE "a"."id" = 3')
+
+
+@pytest.mark.django_db
+def test_query_budget():
+    orgs = [Organizer.objects.create(name='MRMCD', slug=f'mrmcd{i}') for i in range(3)]
+
+    with assert_query_budget(max_num=1):
+        list(Organizer.objects.filter(pk__in=[o.pk for o in orgs]))
+
+    with pytest.raises(AssertionError, match='at most 2 expected'):
+        with assert_query_budget(max_num=2, max_repeats=None):
+            for o in orgs:
+                Organizer.objects.get(pk=o.pk)
+
+    with pytest.raises(AssertionError, match='3x SELECT'):
+        with assert_query_budget():
+            for o in orgs:
+                Organizer.objects.get(pk=o.pk)
+
+
+@pytest.mark.django_db
+@override_settings(QUERY_SAMPLING_RATE=100, QUERY_REPEAT_THRESHOLD=1)
+@modify_settings(MIDDLEWARE={'prepend': 'pretix.helpers.profile.queries.QuerySamplingMiddleware'})
+def test_sampling_middleware(client, caplog):
+    o = Organizer.objects.create(name='MRMCD', slug='mrmcd')
+    Event.objects.create(organizer=o, name='MRMCD2015', slug='2015', date_from=now(), live=True)
+    with caplog.at_level(logging.WARNING, logger='pretix.helpers.profile.queries'):
+        client.get('/mrmcd/2015/')
+    assert 'Request to /mrmcd/2015/ (presale:event.index) executed' in caplog.text
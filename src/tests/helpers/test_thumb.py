@@ -19,9 +19,19 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.timezone import now
+from django_scopes import scopes_disabled
 from PIL import Image
 
-from pretix.helpers.thumb import resize_image
+from pretix.base.models import Event, Item, Organizer
+from pretix.helpers.models import Thumbnail
+from pretix.helpers.templatetags.thumb import thumb
+from pretix.helpers.thumb import get_thumbnail, lookup_thumbnail, resize_image
 
 
 def test_no_resize():
@@ -108,3 +118,56 @@ def test_exactsize():
     width, height = img.size
     assert width == 100
     assert height == 100
+
+
+@pytest.fixture
+def source_image():
+    buffer = BytesIO()
+    Image.new('RGB', (400, 200)).save(buffer, format='PNG')
+    name = default_storage.save('pub/test/picture.png', ContentFile(buffer.getvalue()))
+    yield name
+    default_storage.delete(name)
+
+
+@pytest.mark.django_db
+def test_lookup_cached_in_process(source_image, django_assert_num_queries):
+    assert lookup_thumbnail(source_image, '60x60^') is None
+    t = get_thumbnail(source_image, '60x60^')
+    with django_assert_num_queries(0):
+        assert lookup_thumbnail(source_image, '60x60^') == t
+
+
+@pytest.mark.django_db
+def test_filter_creates_missing_thumbnail(source_image):
+    url = thumb(source_image, '60x60^')
+    t = Thumbnail.objects.get(source=source_image, size='60x60^')
+    assert url == t.thumb.url
+    assert Image.open(t.thumb).size == (60, 60)
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_product_picture_thumbnails_created_on_save(source_image, django_capture_on_commit_callbacks):
+    o = Organizer.objects.create(name='Dummy', slug='dummy')
+    event = Event.objects.create(organizer=o, name='Dummy', slug='dummy', date_from=now())
+    with django_capture_on_commit_callbacks(execute=True):
+        event.items.create(name='Ticket', default_price=23, picture=source_image)
+    assert Thumbnail.objects.filter(source=source_image, size='60x60^').exists()
+
+
+@pytest.mark.django_db
+@scopes_disabled()
+def test_product_thumbnails_only_scheduled_when_picture_changes(source_image, django_capture_on_commit_callbacks):
+    o = Organizer.objects.create(name='Dummy', slug='dummy')
+    event = Event.objects.create(organizer=o, name='Dummy', slug='dummy', date_from=now())
+    with django_capture_on_commit_callbacks() as callbacks:
+        item = event.items.create(name='Ticket', default_price=23, picture=source_image)
+    assert len(callbacks) == 1
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        item.name = 'Other ticket'
+        item.save()
+        item = Item.objects.get(pk=item.pk)
+        item.default_price = 42
+        item.save()
+    assert not callbacks
@@ -24,6 +24,7 @@ from django.test.utils import override_settings
 from django.utils.timezone import now
 
 from pretix.base.models import Event, Organizer
+from pretix.multidomain import models as multidomain_models
 from pretix.multidomain.models import KnownDomain
 
 
@@ -291,3 +292,30 @@ def test_cookie_samesite_none_only_on_compatible_browsers(env, client, agent):
     client.post('/mrmcd/2015/cart/add', HTTP_HOST='example.com', HTTP_USER_AGENT=agent, secure=True)
     r = client.get('/mrmcd/2015/', HTTP_HOST='example.com', HTTP_USER_AGENT=agent, secure=True)
     assert not r.client.cookies['__Host-pretix_csrftoken'].get('samesite')
+
+
+@pytest.mark.django_db
+def test_domain_resolution_cached_in_process(env, client, django_assert_max_num_queries):
+    KnownDomain.objects.create(domainname='foobar', organizer=env[0], event=env[1])
+    assert KnownDomain.resolve('foobar') == (env[0].pk, env[1].pk, KnownDomain.MODE_EVENT_DOMAIN)
+    with django_assert_max_num_queries(0):
+        assert KnownDomain.resolve('foobar') == (env[0].pk, env[1].pk, KnownDomain.MODE_EVENT_DOMAIN)
+
+    KnownDomain.objects.get(domainname='foobar').delete()
+    assert KnownDomain.resolve('foobar') == (None, None, 'system')
+    r = client.get('/control/login', HTTP_HOST='foobar')
+    assert r.status_code == 400
+
+
+@pytest.mark.django_db
+def test_unknown_domain_not_cached_in_process(monkeypatch):
+    monkeypatch.setattr(multidomain_models, 'INSTANCES_LOCAL_MAX_SIZE', 2)
+    assert KnownDomain.resolve('unknown.example.org') == (None, None, 'system')
+    assert 'unknown.example.org' not in multidomain_models._local_instances
+
+    for i in range(3):
+        KnownDomain.objects.create(domainname=f'foo{i}.example.org', organizer=Organizer.objects.create(
+            name=f'Foo {i}', slug=f'foo{i}',
+        ))
+        KnownDomain.resolve(f'foo{i}.example.org')
+        assert len(multidomain_models._local_instances) <= 2
@@ -43,12 +43,12 @@ from django.utils.timezone import now
 from django_scopes import scopes_disabled
 
 from pretix.base.models import (
-    Event, Item, Order, OrderFee, OrderPayment, OrderPosition, OrderRefund,
-    Organizer, Quota, Team, User,
+    CachedFile, Event, Item, Order, OrderFee, OrderPayment, OrderPosition,
+    OrderRefund, Organizer, Quota, Team, User,
 )
 from pretix.base.services.invoices import generate_invoice
 from pretix.plugins.banktransfer.models import BankImportJob, BankTransaction
-from pretix.plugins.banktransfer.tasks import process_banktransfers
+from pretix.plugins.banktransfer.tasks import process_banktransfers, stage_rows
 
 
 @pytest.fixture
@@ -164,6 +164,20 @@ def test_mark_paid(env, job):
     assert djmail.outbox[0].subject == 'Payment received for your order: 1Z3AS'
 
 
+@pytest.mark.django_db
+def test_mark_paid_from_staged_file(env, job):
+    cf = stage_rows(iter([{
+        'payer': 'Karla Kundin',
+        'reference': 'Bestellung DUMMY1234S',
+        'date': '2016-01-26',
+        'amount': '23.00'
+    }]))
+    process_banktransfers(job, file=str(cf.id))
+    env[2].refresh_from_db()
+    assert env[2].status == Order.STATUS_PAID
+    assert not CachedFile.objects.filter(id=cf.id).exists()
+
+
 @pytest.mark.django_db
 def test_underpaid(env, job):
     djmail.outbox = []
@@ -334,6 +348,45 @@ def test_huge_amount(env, job):
     assert env[2].status == Order.STATUS_PAID
 
 
+@pytest.mark.django_db
+def test_multiple_transactions_in_one_import(env, job):
+    process_banktransfers(job, [
+        {
+            'payer': 'Karla Kundin',
+            'reference': 'Bestellung DUMMY1234S',
+            'date': '2016-01-26',
+            'amount': '23.00'
+        },
+        {
+            'payer': 'Karla Kundin',
+            'reference': 'Bestellung INV-001',
+            'date': '2016-01-27',
+            'amount': '23.00'
+        },
+        {
+            'payer': 'Karl Kunde',
+            'reference': 'Bestellung DUMMYFGHIJ',
+            'date': '2016-01-27',
+            'amount': '23.00'
+        },
+        {
+            'payer': 'Karl Kunde',
+            'reference': 'Something else',
+            'date': '2016-01-27',
+            'amount': '0.00'
+        },
+    ])
+    env[2].refresh_from_db()
+    assert env[2].status == Order.STATUS_PAID
+    with scopes_disabled():
+        assert list(BankTransaction.objects.order_by('pk').values_list('state', flat=True)) == [
+            BankTransaction.STATE_VALID,
+            BankTransaction.STATE_DUPLICATE,
+            BankTransaction.STATE_NOMATCH,
+            BankTransaction.STATE_DISCARDED,
+        ]
+
+
 @pytest.mark.django_db
 def test_mark_paid_organizer(env, orga_job):
     process_banktransfers(orga_job, [{
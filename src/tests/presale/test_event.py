@@ -57,6 +57,9 @@ from pretix.base.models import (
 )
 from pretix.base.models.items import SubEventItem, SubEventItemVariation
 from pretix.base.reldate import RelativeDate, RelativeDateWrapper
+from pretix.testutils.queries import (
+    assert_query_budget, forget_uncommitted_settings,
+)
 from pretix.testutils.sessions import get_cart_session_key
 
 
@@ -295,6 +298,21 @@ class ItemDisplayTest(EventTestMixin, SoupTest):
         self.assertIn("Entry tickets", doc.select("section:nth-of-type(1) h3")[0].text)
         self.assertIn("Early-bird", doc.select("section:nth-of-type(1) div:nth-of-type(1)")[0].text)
 
+    def test_query_budget(self):
+        with scopes_disabled():
+            c = ItemCategory.objects.create(event=self.event, name="Entry tickets", position=0)
+            q = Quota.objects.create(event=self.event, name='Quota', size=20)
+            for i in range(10):
+                item = Item.objects.create(event=self.event, name='Ticket %d' % i, category=c, default_price=12)
+                q.items.add(item)
+                for color in ('Red', 'Blue'):
+                    q.variations.add(ItemVariation.objects.create(item=item, value=color))
+        forget_uncommitted_settings()
+
+        with assert_query_budget(max_num=32, max_repeats=3):
+            response = self.client.get('/%s/%s/' % (self.orga.slug, self.event.slug))
+        assert response.status_code == 200
+
     def test_simple_without_quota(self):
         with scopes_disabled():
             c = ItemCategory.objects.create(event=self.event, name="Entry tickets", position=0)
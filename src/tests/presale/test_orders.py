@@ -49,6 +49,9 @@ from pretix.base.models import (
 from pretix.base.models.orders import OrderFee, OrderPayment
 from pretix.base.reldate import RelativeDate, RelativeDateWrapper
 from pretix.base.services.invoices import generate_invoice
+from pretix.testutils.queries import (
+    assert_query_budget, forget_uncommitted_settings,
+)
 
 
 class BaseOrdersTest(TestCase):
@@ -238,6 +241,32 @@ class OrdersTest(BaseOrdersTest):
         assert "Peter" in response.content.decode()
         assert "Lukas" not in response.content.decode()
 
+    def test_orders_detail_query_budget(self):
+        self._assert_orders_detail_query_budget()
+
+    def test_orders_detail_query_budget_without_attendee_data(self):
+        self.event.settings.set('attendee_names_asked', False)
+        self._assert_orders_detail_query_budget()
+
+    def _assert_orders_detail_query_budget(self):
+        url = '/%s/%s/order/%s/%s/' % (self.orga.slug, self.event.slug, self.order.code, self.order.secret)
+        with scopes_disabled():
+            for i in range(10):
+                OrderPosition.objects.create(
+                    order=self.order,
+                    item=self.ticket,
+                    variation=None,
+                    price=Decimal("23"),
+                    attendee_name_parts={'full_name': "Attendee %d" % i}
+                )
+        # The first request stores defaults of the payment providers
+        self.client.get(url)
+        forget_uncommitted_settings()
+
+        with assert_query_budget(max_num=55, max_repeats=4):
+            response = self.client.get(url)
+        assert response.status_code == 200
+
     def test_ticket_detail(self):
         response = self.client.get(
             '/%s/%s/ticket/%s/%s/%s/' % (self.orga.slug, self.event.slug, self.order.code,